@@ -0,0 +1,47 @@
+"""add task listing indexes
+
+Revision ID: 5c1e7a9d2f34
+Revises: b73d31ee068b
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2f34'
+down_revision: Union[str, Sequence[str], None] = 'b73d31ee068b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'])
+    op.create_index('ix_tasks_project_id_id', 'tasks', ['project_id', 'id'])
+    op.create_index(
+        'ix_tasks_project_id_updated_at_id',
+        'tasks',
+        ['project_id', 'updated_at', 'id'],
+    )
+    op.create_index(
+        'ix_tasks_project_id_status_updated_at_id',
+        'tasks',
+        ['project_id', 'status', 'updated_at', 'id'],
+    )
+    op.create_index(
+        'ix_tasks_assignee_id_updated_at_id',
+        'tasks',
+        ['assignee_id', 'updated_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
@@ -0,0 +1,100 @@
+"""add hot path indexes
+
+Revision ID: 8d3b6f2a9c71
+Revises: 5c1e7a9d2f34
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b6f2a9c71'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9d2f34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# unique indexlar uchun dublikatlar: (tavsif, idlar)
+DUPLICATE_QUERIES = {
+    "projects.key": """
+        SELECT 'key=' || key, array_agg(id ORDER BY id)
+        FROM projects WHERE key IS NOT NULL
+        GROUP BY key HAVING count(*) > 1
+    """,
+    "tasks.key": """
+        SELECT 'key=' || key, array_agg(id ORDER BY id)
+        FROM tasks WHERE key IS NOT NULL
+        GROUP BY key HAVING count(*) > 1
+    """,
+    "project_members": """
+        SELECT 'project_id=' || project_id || ' user_id=' || user_id,
+               array_agg(id ORDER BY id)
+        FROM project_members
+        GROUP BY project_id, user_id HAVING count(*) > 1
+    """,
+}
+
+
+def _find_duplicates() -> list[str]:
+    bind = op.get_bind()
+    duplicates = []
+    for table, query in DUPLICATE_QUERIES.items():
+        for value, ids in bind.execute(sa.text(query)):
+            duplicates.append(f"{table} {value}: ids {', '.join(map(str, ids))}")
+    return duplicates
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # dublikatlar avtomatik o'zgartirilmaydi: key URL va tashqi linklarda
+    # ishlatiladi, qaysi qator qolishini faqat odam hal qila oladi
+    duplicates = _find_duplicates()
+    if duplicates:
+        raise RuntimeError(
+            "Cannot create the unique indexes, duplicate rows found:\n  "
+            + "\n  ".join(duplicates)
+            + "\nRename or delete the duplicates by hand and run the upgrade again."
+        )
+
+    op.alter_column('projects', 'key',
+               existing_type=sa.String(length=10),
+               type_=sa.String(length=20),
+               existing_nullable=True)
+
+    op.create_index('ix_projects_key', 'projects', ['key'], unique=True)
+    op.create_index('ix_tasks_key', 'tasks', ['key'], unique=True)
+    op.create_index(
+        'ix_project_members_project_id_user_id',
+        'project_members',
+        ['project_id', 'user_id'],
+        unique=True,
+    )
+    op.create_index('ix_project_members_user_id', 'project_members', ['user_id'])
+    op.create_index(
+        'ix_notifications_recipient_id_is_read',
+        'notifications',
+        ['recipient_id', 'is_read'],
+    )
+    op.create_index(
+        'ix_notifications_recipient_id_unread',
+        'notifications',
+        ['recipient_id', 'id'],
+        postgresql_where=sa.text('is_read = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_recipient_id_unread', table_name='notifications')
+    op.drop_index('ix_notifications_recipient_id_is_read', table_name='notifications')
+    op.drop_index('ix_project_members_user_id', table_name='project_members')
+    op.drop_index(
+        'ix_project_members_project_id_user_id', table_name='project_members'
+    )
+    op.drop_index('ix_tasks_key', table_name='tasks')
+    op.drop_index('ix_projects_key', table_name='projects')
+    # projects.key String(20) qoldiriladi: uzunroq keylar 10 ga sig'maydi
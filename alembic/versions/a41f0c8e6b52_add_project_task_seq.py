@@ -0,0 +1,44 @@
+"""add project task_seq
+
+Revision ID: a41f0c8e6b52
+Revises: 8d3b6f2a9c71
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0c8e6b52'
+down_revision: Union[str, Sequence[str], None] = '8d3b6f2a9c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'projects',
+        sa.Column('task_seq', sa.Integer(), server_default='0', nullable=False),
+    )
+    # mavjud keylardagi eng katta raqamdan davom ettirish
+    op.execute(
+        r"""
+        UPDATE projects p SET task_seq = COALESCE(
+            (
+                SELECT max(substring(t.key from '-(\d+)$')::int)
+                FROM tasks t
+                WHERE t.project_id = p.id
+            ),
+            0
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'task_seq')
@@ -0,0 +1,43 @@
+"""add project key counters
+
+Revision ID: c7e2d94b1a08
+Revises: a41f0c8e6b52
+Create Date: 2026-10-18 10:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2d94b1a08'
+down_revision: Union[str, Sequence[str], None] = 'a41f0c8e6b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_key_counters',
+        sa.Column('prefix', sa.String(length=10), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('prefix'),
+    )
+    # har bir prefix uchun nechta project borligidan davom ettirish,
+    # band bo'lgan keylarni generate_project_key o'zi o'tkazib yuboradi
+    op.execute(
+        """
+        INSERT INTO project_key_counters (prefix, last_value)
+        SELECT upper(left(name, 3)), count(*)
+        FROM projects
+        GROUP BY upper(left(name, 3))
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_key_counters')
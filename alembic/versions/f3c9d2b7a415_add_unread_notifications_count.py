@@ -0,0 +1,55 @@
+"""add unread notifications count
+
+Revision ID: f3c9d2b7a415
+Revises: e5b8a3f1c690
+Create Date: 2026-10-18 13:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d2b7a415'
+down_revision: Union[str, Sequence[str], None] = 'e5b8a3f1c690'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column(
+            'unread_notifications_count',
+            sa.Integer(),
+            server_default='0',
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE users SET unread_notifications_count = unread.count
+        FROM (
+            SELECT recipient_id, count(*) AS count
+            FROM notifications
+            WHERE is_read = false
+            GROUP BY recipient_id
+        ) AS unread
+        WHERE users.id = unread.recipient_id
+        """
+    )
+    op.create_index(
+        'ix_notifications_recipient_id_id',
+        'notifications',
+        ['recipient_id', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_recipient_id_id', table_name='notifications')
+    op.drop_column('users', 'unread_notifications_count')
@@ -9,11 +9,12 @@ from starlette_admin.exceptions import LoginFailed
 
 from app.enums import Role
 from app.models import User
-from app.dependencies import get_db
-from app.utils import verify_password
+from app.database import SessionLocal
+from app.dependencies import ADMIN_SCOPE, cache_principal, get_db, principal_cache
+from app.utils import verify_and_update_password
 from app.settings import (
     ADMIN_REMEMBER_ME_EXPIRE_MINUTES,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ADMIN_SESSION_EXPIRE_MINUTES,
     SECRET_KEY,
     ALGORITHM,
 )
@@ -37,13 +38,20 @@ class StarletteAuthProvider(AuthProvider):
         if user and user.role != Role.admin.value:
             raise LoginFailed("User is not admin.")
 
-        if not verify_password(password, user.hashed_password):
+        is_valid, new_hash = await verify_and_update_password(
+            password, user.hashed_password
+        )
+        if not is_valid:
             raise LoginFailed("Invalid password.")
 
+        if new_hash:
+            user.hashed_password = new_hash
+            db.commit()
+
         if remember_me:
             access_token_expires = timedelta(minutes=ADMIN_REMEMBER_ME_EXPIRE_MINUTES)
         else:
-            access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            access_token_expires = timedelta(minutes=ADMIN_SESSION_EXPIRE_MINUTES)
 
         token_data = {
             "sub": user.email,
@@ -55,7 +63,7 @@ class StarletteAuthProvider(AuthProvider):
         response.set_cookie(
             key="access_token",
             value=access_token,
-            max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            max_age=ADMIN_SESSION_EXPIRE_MINUTES * 60,
             secure=True,
             httponly=True,
             samesite="lax",
@@ -69,6 +77,11 @@ class StarletteAuthProvider(AuthProvider):
         if not token:
             return None
 
+        # har bir admin sahifa va static fayl uchun bazaga bormaslik
+        principal = principal_cache.get((ADMIN_SCOPE, token))
+        if principal is not None:
+            return principal if principal.role == Role.admin.value else None
+
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
             email: str = payload.get("sub")
@@ -76,12 +89,12 @@ class StarletteAuthProvider(AuthProvider):
             if not email:
                 return None
 
-            db: Session = next(get_db())
-            user = db.query(User).filter(User.email == email).first()
+            with SessionLocal() as db:
+                user = db.query(User).filter(User.email == email).first()
 
-            if user is None or user.role != Role.admin.value:
-                return None
-            return user
+                if user is None or user.role != Role.admin.value:
+                    return None
+                return cache_principal(ADMIN_SCOPE, token, user, payload)
         except JWTError:
             return None
 
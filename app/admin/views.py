@@ -3,7 +3,7 @@ from typing import List, ClassVar
 from starlette_admin.contrib.sqla import ModelView
 from starlette_admin.fields import EnumField, PasswordField
 
-from app.utils import hashed_password
+from app.utils import hash_password_async
 from app.enums import Role, Status, Priority
 
 
@@ -34,7 +34,7 @@ class UserAdminView(ModelView):
 
     async def create(self, request, data):
         if "hashed_password" in data:
-            data["hashed_password"] = hashed_password(data["hashed_password"])
+            data["hashed_password"] = await hash_password_async(data["hashed_password"])
 
         # print("Create is working!")
         # print("=================", "avatar" in data, data['avatar'])
@@ -0,0 +1,92 @@
+import time
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Size-bounded in-process LRU cache whose entries expire after `ttl`
+    seconds (or earlier, at their own `expires_at`). Entries can be tagged,
+    e.g. with a user id, and dropped together with `invalidate_tag`.
+    Hit/miss/eviction counters are kept for /monitoring.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (expires_at, tag, value)
+        self._entries: OrderedDict[Hashable, tuple[float, Hashable, Any]] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = defaultdict(set)
+        # admin (sync) sessiyalari threadpoolda ishlaydi
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tag: Hashable = None,
+        expires_at: float | None = None,
+    ):
+        """`expires_at` is a time.monotonic() deadline that can only shorten the TTL."""
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (deadline, tag, value)
+            if tag is not None:
+                self._tags[tag].add(key)
+
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_tag(self, tag: Hashable):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: Hashable):
+        _, tag, _ = self._entries.pop(key)
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -2,7 +2,10 @@ import smtplib
 from email.mime.text import MIMEText
 
 from celery import Celery
+from celery.schedules import crontab
 
+from app.database import SessionLocal
+from app.services import archive_expired_rows
 from app.settings import (
     CELERY_BROKER_URL,
     CELERY_RESULT_BACKEND,
@@ -14,6 +17,14 @@ from app.settings import (
 
 clry = Celery(__name__, broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
 
+# celery -A app.celery.clry beat
+clry.conf.beat_schedule = {
+    "archive-expired-rows": {
+        "task": "app.celery.archive_expired_rows_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
+
 
 @clry.task
 def send_email(to_email: str, subject: str, body: str):
@@ -27,3 +38,9 @@ def send_email(to_email: str, subject: str, body: str):
         server.starttls()
         server.login(SMTP_SENDER, SMTP_PASSWORD)
         server.send_message(msg)
+
+
+@clry.task
+def archive_expired_rows_task():
+    with SessionLocal() as db:
+        return archive_expired_rows(db)
@@ -1,9 +1,23 @@
 import os
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.settings import (
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT,
+)
 
 load_dotenv(dotenv_path=Path(__name__).resolve().parent / ".env")
 
@@ -15,11 +29,113 @@ DB_USER = os.getenv("DB_USER")
 
 
 DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DB_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+
+class PoolTelemetry:
+    """
+    Counters for one connection pool: how many checkouts happened, how long
+    callers waited for a connection and how many gave up on pool timeout.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+class InstrumentedPoolMixin:
+    telemetry: PoolTelemetry
+
+    def _do_get(self):
+        if not hasattr(self, "telemetry"):
+            self.telemetry = PoolTelemetry()
+
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.telemetry.timeouts += 1
+            raise
+        finally:
+            self.telemetry.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool): ...
+
 
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool): ...
 
-engine = create_engine(url=DB_URL, echo=True)
+
+def create_db_engine(url: str, is_async: bool = False) -> Engine | AsyncEngine:
+    """
+    Builds an engine with pool settings from app.settings. Every session gets
+    statement_timeout so a runaway query can't hold a pooled connection forever.
+    """
+    if is_async:
+        connect_args = {
+            "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT)}
+        }
+    else:
+        connect_args = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT}"}
+
+    options = dict(
+        url=url,
+        echo=DB_ECHO,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+    if is_async:
+        return create_async_engine(poolclass=InstrumentedAsyncQueuePool, **options)
+    return create_engine(poolclass=InstrumentedQueuePool, **options)
+
+
+def get_pool_stats(engine: Engine | AsyncEngine) -> dict:
+    pool = engine.pool
+    telemetry: PoolTelemetry = getattr(pool, "telemetry", PoolTelemetry())
+
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": getattr(pool, "_max_overflow", 0),
+        "checkouts": telemetry.checkouts,
+        "timeouts": telemetry.timeouts,
+        "wait_avg_ms": (
+            telemetry.wait_total / telemetry.checkouts * 1000
+            if telemetry.checkouts
+            else 0.0
+        ),
+        "wait_max_ms": telemetry.wait_max * 1000,
+    }
+
+
+# sync engine: alembic, starlette-admin, celery va scripts uchun
+engine = create_db_engine(DB_URL)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False)
 
 
+# async engine: FastAPI routerlari uchun, event loop bloklanmaydi
+async_engine = create_db_engine(ASYNC_DB_URL, is_async=True)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autocommit=False, expire_on_commit=False
+)
+
+
 class Base(DeclarativeBase): ...
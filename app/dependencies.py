@@ -1,14 +1,28 @@
+import secrets
+import time
+from dataclasses import dataclass
 from typing import Annotated
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
-from app.database import SessionLocal
-from app.enums import Role
+from app.cache import TTLCache
+from app.database import AsyncSessionLocal, SessionLocal
+from app.enums import Role, TokenType
 from app.models import User
-from app.settings import ALGORITHM, SECRET_KEY
+from app.settings import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    METRICS_TOKEN,
+    PRINCIPAL_CACHE_SIZE,
+    PRINCIPAL_CACHE_TTL,
+    SECRET_KEY,
+)
+from app.utils import is_access_token
 
 
 def get_db():
@@ -22,6 +36,14 @@ def get_db():
 db_dep = Annotated[Session, Depends(get_db)]
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async_db_dep = Annotated[AsyncSession, Depends(get_async_db)]
+
+
 """#######Authentication dependencies#############"""
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="auth/login/")
@@ -30,7 +52,101 @@ oauth2_schema_dep = Annotated[str, Depends(oauth2_schema)]
 oauth2_form_dep = Annotated[OAuth2PasswordRequestForm, Depends()]
 
 
-async def get_current_user(db: db_dep, token: oauth2_schema_dep):
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user's fields routers need, safe to share between requests."""
+
+    id: int
+    email: str
+    fullname: str | None
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            fullname=user.fullname,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        return cls(
+            id=payload["user_id"],
+            email=payload.get("email"),
+            fullname=payload.get("fullname"),
+            role=payload.get("role"),
+            is_active=payload.get("is_active", False),
+        )
+
+
+# (scope, token) -> Principal; token o'zi kalit, shuning uchun cache hitda JWT
+# decode ham yo'q. Scope admin cookie va API tokenlarini ajratadi: admin
+# cookiedagi JWT Bearer sifatida cache orqali o'tib ketmasligi kerak.
+ACCESS_SCOPE = "access"
+ADMIN_SCOPE = "admin"
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+# user_id -> o'zgargan vaqti (time.time()); bundan oldin berilgan access token
+# claimlari eskirgan, ular bazadan tekshiriladi. Access token muddatidan keyin
+# yozuv kerak emas.
+claims_changed_at = TTLCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+def _cache(scope: str, token: str, principal: Principal, payload: dict) -> Principal:
+    expires_at = None
+    if payload.get("exp"):
+        # token muddati tugagach cache ham uni qaytarmaydi
+        expires_at = time.monotonic() + payload["exp"] - time.time()
+    principal_cache.set(
+        (scope, token), principal, tag=principal.id, expires_at=expires_at
+    )
+    return principal
+
+
+def cache_principal(scope: str, token: str, user: User, payload: dict) -> Principal:
+    return _cache(scope, token, Principal.from_user(user), payload)
+
+
+def _claims_are_fresh(payload: dict) -> bool:
+    if payload.get("type") != TokenType.access.value or "is_active" not in payload:
+        # eski formatdagi tokenlarda claimlar yo'q
+        return False
+    changed_at = claims_changed_at.get(payload["user_id"])
+    return changed_at is None or payload.get("iat", 0) > changed_at
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _remember_changed_user(mapper, connection, target: User):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_users", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session):
+    # boshqa workerlardagi cache PRINCIPAL_CACHE_TTL ichida eskiradi
+    for user_id in session.info.pop("changed_users", ()):
+        principal_cache.invalidate_tag(user_id)
+        claims_changed_at.set(user_id, time.time())
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session):
+    session.info.pop("changed_users", None)
+
+
+async def get_current_user(db: async_db_dep, token: oauth2_schema_dep) -> Principal:
+    principal = principal_cache.get((ACCESS_SCOPE, token))
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(
             token=token,
@@ -38,28 +154,39 @@ async def get_current_user(db: db_dep, token: oauth2_schema_dep):
             algorithms=[ALGORITHM],
             options={"verify_exp": True},
         )
+    except jwt.ExpiredSignatureError as err:
+        raise HTTPException(401, "Access token has expired") from err
+    except JWTError as err:
+        raise HTTPException(401, "Invalid access token") from err
+
+    id = payload.get("user_id")
 
-        id = payload.get("user_id")
+    if id is None or not is_access_token(payload):
+        raise HTTPException(401, "Invalid access token")
 
-        if id is None:
-            raise HTTPException(401, "Invalid access token")
+    # oddiy holat: token claimlari yetarli, bazaga so'rov yo'q
+    if _claims_are_fresh(payload):
+        principal = Principal.from_claims(payload)
+        if not principal.is_active:
+            raise HTTPException(400, "Inactive user")
+        return _cache(ACCESS_SCOPE, token, principal, payload)
 
-        user = db.query(User).filter(User.id == id).first()
+    user = await db.scalar(select(User).where(User.id == id))
 
-        if not user:
-            raise HTTPException(404, "User Not Found.")
+    if not user:
+        raise HTTPException(404, "User Not Found.")
 
-        if not user.is_active:
-            raise HTTPException(400, "Inactive user")
+    if not user.is_active:
+        raise HTTPException(400, "Inactive user")
 
-        return user
-    except JWTError as err:
-        raise HTTPException(401, "Invalid access token") from err
-    except jwt.ExpiredSignatureError as err:
-        raise HTTPException(401, "Access token has expired") from err
+    if payload.get("type") != TokenType.access.value:
+        # type claimisiz eski tokenlar (LEGACY_ACCESS_TOKEN_DEADLINE gacha)
+        # cachelanmaydi, har safar bazadan tekshiriladi
+        return Principal.from_user(user)
+    return cache_principal(ACCESS_SCOPE, token, user, payload)
 
 
-current_user_dep = Annotated[User, Depends(get_current_user)]
+current_user_dep = Annotated[Principal, Depends(get_current_user)]
 
 
 async def get_project_owner(current_user: current_user_dep):
@@ -80,5 +207,21 @@ async def get_project_manager(current_user: current_user_dep):
     return current_user
 
 
-project_owner_dep = Annotated[User, Depends(get_project_owner)]
-project_manager_dep = Annotated[User, Depends(get_project_manager)]
+async def get_monitoring_user(
+    db: async_db_dep, token: oauth2_schema_dep
+) -> Principal | None:
+    """
+    Guards /metrics and /monitoring/*: either the METRICS_TOKEN shared secret
+    (the Prometheus scraper has no user) or an admin's access token.
+    """
+    if METRICS_TOKEN and secrets.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return None
+
+    current_user = await get_current_user(db, token)
+    if current_user.role != Role.admin:
+        raise HTTPException(403, "Only admins can read monitoring data.")
+    return current_user
+
+
+project_owner_dep = Annotated[Principal, Depends(get_project_owner)]
+project_manager_dep = Annotated[Principal, Depends(get_project_manager)]
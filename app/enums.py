@@ -30,6 +30,27 @@ class WSEventTypes(str, Enum):
     task_rejected = "task_rejected"
     task_created_high = "task_created_high"
     task_all = "task_all"
+    member_added = "member_added"
+    member_removed = "member_removed"
+    comment_created = "comment_created"
+    tasks_bulk_changed = "tasks_bulk_changed"
+    tasks_imported = "tasks_imported"
+    # faqat workerlar orasida: board cache'ni tashlash, clientga yuborilmaydi
+    board_changed = "board_changed"
 
 
+class TokenType(str, Enum):
+    access = "access"
+    refresh = "refresh"
 
+
+class WSOverflowPolicy(str, Enum):
+    drop_oldest = "drop_oldest"
+    disconnect = "disconnect"
+
+
+class AuditEventType(str, Enum):
+    task_created = "task_created"
+    task_updated = "task_updated"
+    developer_assigned = "developer_assigned"
+    status_changed = "status_changed"
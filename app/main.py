@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,18 +8,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.websocket import ws_router
 from app.admin.settings import admin
 from app.websocket.manager import WSManager
+from app.websocket.utils import close_redis, consume_events
+from app.services import audit_writer, run_outbox_dispatcher
 from app.routers import (
     auth_router, 
     project_router, 
     task_router, 
     user_router,
-    notif_router
-)
-from app.middleware import (
-    SimplePrintLoggerMiddleware,
-    ProcessTimeLoggerMiddleware,
-    origins,
+    notif_router,
+    monitoring_router,
+    metrics_router,
 )
+from app.middleware import MetricsMiddleware, origins
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,22 +31,30 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     # before
-#     ws_manager = WSManager()
-#     app.state.ws_manager = ws_manager
-#     task = asyncio.create_task(consume_events(app.state.ws_manager))
-#     logger.info(f"Asyncio task <{task.get_name()}> is created to consume events.")
-#     try:
-#         yield
-#     finally:
-#         task.cancel()
-#         logger.info(f"Asyncio task <{task.get_name()}> is cancelled.")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # before
+    ws_manager = WSManager()
+    app.state.ws_manager = ws_manager
+    tasks = [
+        asyncio.create_task(consume_events(app.state.ws_manager)),
+        asyncio.create_task(run_outbox_dispatcher()),
+        asyncio.create_task(audit_writer.run()),
+    ]
+    for task in tasks:
+        logger.info(f"Asyncio task <{task.get_name()}> is created.")
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            logger.info(f"Asyncio task <{task.get_name()}> is cancelled.")
+        await close_redis()
 
 
-app = FastAPI()
-app.state.ws_manager = WSManager()
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -58,9 +68,10 @@ app.include_router(user_router)
 app.include_router(task_router)
 app.include_router(ws_router)
 app.include_router(notif_router)
+app.include_router(monitoring_router)
+app.include_router(metrics_router)
 
-app.add_middleware(SimplePrintLoggerMiddleware)
-app.add_middleware(ProcessTimeLoggerMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -1,24 +1,126 @@
 import time
+from bisect import bisect_left
+from collections import defaultdict
 
-from fastapi.requests import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SimplePrintLoggerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        print("Before requests")
-        response = await call_next(request)
-        print("After requests")
-        return response
+# sekundlarda, Prometheus client default bucketlari
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 
-class ProcessTimeLoggerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class RequestMetrics:
+    """
+    In-process request counters: a latency histogram per (method, route),
+    response counts per (method, route, status) and in-flight requests.
+    Routes are labelled by their template ("/tasks/{key}/"), so the number
+    of series stays bounded. Everything runs on the event loop, no locks.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        # (method, route) -> [bucket counts..., +Inf count]
+        self.histograms: dict[tuple[str, str], list[int]] = defaultdict(
+            lambda: [0] * (len(self.buckets) + 1)
+        )
+        self.durations: dict[tuple[str, str], float] = defaultdict(float)
+        self.responses: dict[tuple[str, str, int], int] = defaultdict(int)
+
+    def observe(self, method: str, route: str, status: int, duration: float):
+        key = (method, route)
+        # faqat tushgan bucket oshiriladi, kumulyativ qiymat renderda hisoblanadi
+        self.histograms[key][bisect_left(self.buckets, duration)] += 1
+        self.durations[key] += duration
+        self.responses[(method, route, status)] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), counts in sorted(self.histograms.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            total = 0
+            for bound, count in zip(self.buckets, counts):
+                total += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {total}'
+                )
+            total += counts[-1]
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}'
+            )
+            lines.append(
+                f"http_request_duration_seconds_sum{{{labels}}} "
+                f"{self.durations[(method, route)]:.6f}"
+            )
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {total}")
+
+        lines += [
+            "# HELP http_responses_total Responses by route and status code.",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(
+                f'http_responses_total{{method="{method}",route="{_escape(route)}",'
+                f'status="{status}"}} {count}'
+            )
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: unlike BaseHTTPMiddleware it does not wrap the
+    response in a stream or spawn a task per request, it only wraps `send`.
+    Also sets the Process-time header the old middleware used to add.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
         start = time.perf_counter()
-        response = await call_next(request)
-        process_time = time.perf_counter() - start
-        response.headers["Process-time"] = str(process_time)
-        return response
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"process-time", str(time.perf_counter() - start).encode()),
+                ]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            # route'ni router scope'ga yozadi (mount ichida root_path bilan);
+            # topilmagan pathlar bitta labelda
+            route = getattr(scope.get("route"), "path", None)
+            route = scope.get("root_path", "") + route if route else "<unmatched>"
+            metrics.observe(
+                scope["method"], route, status, time.perf_counter() - start
+            )
 
 
 origins = ["http://127.0.0.1:3000"]
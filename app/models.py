@@ -1,11 +1,28 @@
 from typing import List
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    func,
+    text,
+)
 
 from app.database import Base
 
 
+# full-text search: o'zbekcha/inglizcha aralash matn uchun stemmingsiz "simple"
+SEARCH_CONFIG = "simple"
+
+
 class TimestampMixin:
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), default=func.now()
@@ -28,6 +45,10 @@ class User(Base, TimestampMixin):
     is_deleted: Mapped[bool] = mapped_column(
         Boolean, nullable=False, server_default="false"
     )
+    # notifications servisi yozadi/o'qiydi, inbox uchun COUNT(*) qilinmaydi
+    unread_notifications_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
 
     owned_projects: Mapped[List["Project"]] = relationship(
         "Project", back_populates="owner"
@@ -67,14 +88,17 @@ class User(Base, TimestampMixin):
 
 class Project(Base, TimestampMixin):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_key", "key", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
-    key: Mapped[str] = mapped_column(String(10), nullable=True)
+    key: Mapped[str] = mapped_column(String(20), nullable=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_private: Mapped[bool] = mapped_column(Boolean, default=False)
+    # oxirgi berilgan task key raqami: KEY-<task_seq>
+    task_seq: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     owner: Mapped["User"] = relationship("User", back_populates="owned_projects")
 
@@ -92,8 +116,27 @@ class Project(Base, TimestampMixin):
         return f"Project(key={self.key})"
 
 
+class ProjectKeyCounter(Base):
+    __tablename__ = "project_key_counters"
+
+    prefix: Mapped[str] = mapped_column(String(10), primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __str__(self):
+        return f"ProjectKeyCounter(prefix={self.prefix}, last_value={self.last_value})"
+
+
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = (
+        Index(
+            "ix_project_members_project_id_user_id",
+            "project_id",
+            "user_id",
+            unique=True,
+        ),
+        Index("ix_project_members_user_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
@@ -114,6 +157,23 @@ class ProjectMember(Base):
 
 class Task(Base, TimestampMixin):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_key", "key", unique=True),
+        # keyset pagination: /tasks/ va /project/{key}/tasks/page/
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_project_id_updated_at_id", "project_id", "updated_at", "id"),
+        Index(
+            "ix_tasks_project_id_status_updated_at_id",
+            "project_id",
+            "status",
+            "updated_at",
+            "id",
+        ),
+        Index("ix_tasks_assignee_id_updated_at_id", "assignee_id", "updated_at", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     project_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("projects.id", ondelete="CASCADE")
@@ -130,6 +190,16 @@ class Task(Base, TimestampMixin):
         Integer, ForeignKey("users.id", ondelete="CASCADE")
     )
     due_date: Mapped[DateTime] = mapped_column(DateTime(timezone=True))
+    # summary (A) description (B)dan muhimroq; Postgres o'zi yozishda hisoblaydi
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     project: Mapped["Project"] = relationship("Project", back_populates="tasks")
     assignee: Mapped["User"] = relationship(
@@ -138,12 +208,20 @@ class Task(Base, TimestampMixin):
     reporter: Mapped["User"] = relationship(
         "User", back_populates="reported_tasks", foreign_keys="Task.reporter_id"
     )
-    comments: Mapped[List["Comment"]] = relationship("Comment", back_populates="task")
+    # comments qo'shilganda/o'chirilganda shu UPDATE bilan yangilanadi
+    comments_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # FK ON DELETE CASCADE: task o'chirilganda commentlar, notificationlar va
+    # audit loglarni baza o'zi o'chiradi (ORM task_id'ni NULL qilmaydi)
+    comments: Mapped[List["Comment"]] = relationship(
+        "Comment", back_populates="task", passive_deletes=True
+    )
     notifications: Mapped[List["Notification"]] = relationship(
-        "Notification", back_populates="task"
+        "Notification", back_populates="task", passive_deletes=True
     )
     audit_logs: Mapped[List["AuditLog"]] = relationship(
-        "AuditLog", back_populates="task"
+        "AuditLog", back_populates="task", passive_deletes=True
     )
 
     def __str__(self):
@@ -152,6 +230,11 @@ class Task(Base, TimestampMixin):
 
 class Comment(Base, TimestampMixin):
     __tablename__ = "comments"
+    __table_args__ = (
+        # task ichidagi thread keyset bilan (task_id, id) bo'yicha o'qiladi
+        Index("ix_comments_task_id_id", "task_id", "id"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     task_id: Mapped[int] = mapped_column(
@@ -161,6 +244,13 @@ class Comment(Base, TimestampMixin):
         Integer, ForeignKey("users.id", ondelete="CASCADE")
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', content), 'C')", persisted=True
+        ),
+        deferred=True,
+    )
 
     task: Mapped["Task"] = relationship("Task", back_populates="comments")
     user: Mapped["User"] = relationship("User", back_populates="comments")
@@ -171,6 +261,21 @@ class Comment(Base, TimestampMixin):
 
 class Notification(Base, TimestampMixin):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_recipient_id_is_read", "recipient_id", "is_read"),
+        Index("ix_notifications_recipient_id_id", "recipient_id", "id"),
+        # faqat o'qilmaganlar: unread inbox kichik indexdan o'qiladi
+        Index(
+            "ix_notifications_recipient_id_unread",
+            "recipient_id",
+            "id",
+            postgresql_where=text("is_read = false"),
+        ),
+        # retention job eski qatorlarni vaqt bo'yicha topadi, BRIN juda kichik
+        Index("ix_notifications_created_at", "created_at", postgresql_using="brin"),
+        # task o'chirilganda notificationlar (va FK CASCADE) shu indexdan topiladi
+        Index("ix_notifications_task_id", "task_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     message: Mapped[str] = mapped_column(Text, nullable=False)
@@ -207,9 +312,19 @@ class Notification(Base, TimestampMixin):
 
 class AuditLog(Base):
     __tablename__ = "auditlogs"
+    __table_args__ = (
+        Index("ix_auditlogs_timestamp", "timestamp", postgresql_using="brin"),
+        # task va project tarixlari (timeline) shu indexlardan o'qiladi
+        Index("ix_auditlogs_task_id_id", "task_id", "id"),
+        Index("ix_auditlogs_project_id_id", "project_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     action: Mapped[str] = mapped_column(String(250), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=True)
+    from_status: Mapped[str] = mapped_column(String(30), nullable=True)
+    to_status: Mapped[str] = mapped_column(String(30), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=True)
     timestamp: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), default=func.now()
     )
@@ -219,9 +334,72 @@ class AuditLog(Base):
     task_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("tasks.id", ondelete="CASCADE")
     )
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="audit_logs")
     task: Mapped["Task"] = relationship("Task", back_populates="audit_logs")
 
     def __str__(self):
         return f"AuditLog(user_id={self.user_id})"
+
+
+class NotificationArchive(Base):
+    """
+    Cold copy of read notifications past retention, moved out by the Celery
+    retention job. No foreign keys and one index, so it stays cheap to append.
+    """
+    __tablename__ = "notifications_archive"
+    __table_args__ = (
+        Index("ix_notifications_archive_recipient_id_id", "recipient_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    recipient_id: Mapped[int] = mapped_column(Integer)
+    sender_id: Mapped[int] = mapped_column(Integer)
+    task_id: Mapped[int] = mapped_column(Integer)
+    project_id: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class AuditLogArchive(Base):
+    __tablename__ = "auditlogs_archive"
+    __table_args__ = (Index("ix_auditlogs_archive_task_id", "task_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    action: Mapped[str] = mapped_column(String(250), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=True)
+    from_status: Mapped[str] = mapped_column(String(30), nullable=True)
+    to_status: Mapped[str] = mapped_column(String(30), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=True)
+    timestamp: Mapped[DateTime] = mapped_column(DateTime(timezone=True))
+    user_id: Mapped[int] = mapped_column(Integer)
+    task_id: Mapped[int] = mapped_column(Integer)
+    project_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    archived_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class OutboxEvent(Base):
+    """
+    WebSocket event written in the same transaction as the change it
+    describes. The outbox dispatcher publishes committed rows and deletes them.
+    """
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    project_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), default=func.now()
+    )
+
+    def __str__(self):
+        return f"OutboxEvent(event_type={self.event_type})"
@@ -2,4 +2,6 @@ from .projects import router as project_router  # noqa
 from .auth import router as auth_router  # noqa
 from .users import router as user_router  # noqa
 from .tasks import router as task_router  # noqa
-from .notifications import router as notif_router # noqa
\ No newline at end of file
+from .notifications import router as notif_router # noqa
+from .monitoring import router as monitoring_router # noqa
+from .monitoring import metrics_router # noqa
\ No newline at end of file
@@ -1,5 +1,6 @@
 
 from fastapi import APIRouter, HTTPException
+from sqlalchemy import select
 from fastapi.background import BackgroundTasks
 
 from app.enums import Role
@@ -7,17 +8,17 @@ from app.models import User
 from app.celery import send_email
 from app.utils import get_object_or_404
 from app.task import write_notification
-from app.dependencies import db_dep, oauth2_form_dep
-from app.schemas.auth import TokenResponse, UserRegisterRequest
-from app.settings import (
-    ACCESS_TOKEN_EXPIRE_MINUTES,
-    REFRESH_TOKEN_EXPIRE_MINUTES,
-    FRONTEND_URL,
+from app.dependencies import async_db_dep, oauth2_form_dep
+from app.schemas.auth import RefreshTokenRequest, TokenResponse, UserRegisterRequest
+from app.services.tokens import (
+    issue_login_tokens,
+    refresh_login_tokens,
+    revoke_refresh_token,
 )
+from app.settings import FRONTEND_URL
 from app.utils import (
-    create_jwt_token,
-    hashed_password,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password,
     generate_activation_token,
     decode_user_from_jwt,
 )
@@ -26,35 +27,35 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register/")
-async def register(db: db_dep, request_data: UserRegisterRequest):
-    is_user_exists = db.query(User).filter(User.email == request_data.email).first()
+async def register(db: async_db_dep, request_data: UserRegisterRequest):
+    is_user_exists = await db.scalar(
+        select(User).where(User.email == request_data.email)
+    )
 
     if is_user_exists:
         raise HTTPException(400, "User already exists.")
 
-    is_first_user = db.query(User).count() == 0
+    is_first_user = await db.scalar(select(User.id).limit(1)) is None
 
     if is_first_user:
         user = User(
             email=request_data.email,
-            hashed_password=hashed_password(request_data.password),
+            hashed_password=await hash_password_async(request_data.password),
             role=Role.admin,
             is_active=True,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
         return {"detal": f"Admin user created with email: {user.email}"}
     user = User(
         email=request_data.email,
-        hashed_password=hashed_password(request_data.password),
+        hashed_password=await hash_password_async(request_data.password),
         role=request_data.role,
         is_active=False,
         is_deleted=False,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     token = generate_activation_token(user_id=user.id)
 
@@ -69,36 +70,44 @@ async def register(db: db_dep, request_data: UserRegisterRequest):
     }
 
 
-@router.post("/login/")
-async def login(form_data: oauth2_form_dep, db: db_dep):
+@router.post("/login/", response_model=TokenResponse)
+async def login(form_data: oauth2_form_dep, db: async_db_dep):
 
-    user = get_object_or_404(db, User, email=form_data.username)
+    user = await get_object_or_404(db, User, email=form_data.username)
 
-    if not verify_password(form_data.password, user.hashed_password):
+    is_valid, new_hash = await verify_and_update_password(
+        form_data.password, user.hashed_password
+    )
+    if not is_valid:
         raise HTTPException(400, "Incorrect password")
 
-    access_token = create_jwt_token(
-        {"user_id": user.id, "role": user.role}, expires_delta=ACCESS_TOKEN_EXPIRE_MINUTES
-    )
+    # CryptContext parametrlari o'zgargan bo'lsa hash yangilanadi
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
 
-    refresh_token = create_jwt_token(
-        {"user_id": user.id, "role": user.role}, expires_delta=REFRESH_TOKEN_EXPIRE_MINUTES
-    )
+    return await issue_login_tokens(user)
 
-    return TokenResponse(
-        access_token=access_token, refresh_token=refresh_token, token_type="Bearer"
-    )
+
+@router.post("/refresh/", response_model=TokenResponse)
+async def refresh(db: async_db_dep, request_data: RefreshTokenRequest):
+    return await refresh_login_tokens(db, request_data.refresh_token)
+
+
+@router.post("/logout/")
+async def logout(request_data: RefreshTokenRequest):
+    await revoke_refresh_token(request_data.refresh_token)
+    return {"detail": "Logged out."}
 
 
 @router.get("/confirm/{token}/")
-async def confirm_email(db: db_dep, token: str):
+async def confirm_email(db: async_db_dep, token: str):
     
     user_id = decode_user_from_jwt(token=token).get("user_id")
-    user = get_object_or_404(db, User, id=user_id)
+    user = await get_object_or_404(db, User, id=user_id)
 
     user.is_active = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     return {"detail": "Email confirmed."}
 
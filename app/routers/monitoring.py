@@ -0,0 +1,72 @@
+import resource
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+
+from app.database import async_engine, engine, get_pool_stats
+from app.dependencies import get_monitoring_user, principal_cache
+from app.middleware import request_metrics
+from app.services import audit_writer, board_cache
+
+
+# ichki holat (pool, cache, ws) tashqariga ochiq bo'lmasligi kerak
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Monitoring"],
+    dependencies=[Depends(get_monitoring_user)],
+)
+
+# Prometheus odatda /metrics ni so'raydi, prefixsiz; scrape config'da
+# authorization: credentials: <METRICS_TOKEN>
+metrics_router = APIRouter(
+    tags=["Monitoring"], dependencies=[Depends(get_monitoring_user)]
+)
+
+
+@router.get("/db-pool/")
+async def get_db_pool_stats():
+    return {
+        "async": get_pool_stats(async_engine),
+        "sync": get_pool_stats(engine),
+    }
+
+
+@router.get("/ws/")
+async def get_ws_stats(request: Request):
+    return {
+        **request.app.state.ws_manager.stats(),
+        # linuxda kilobaytlarda, process hayoti davomidagi eng katta qiymat
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+@router.get("/cache/")
+async def get_cache_stats():
+    return {"principal": principal_cache.stats(), "board": board_cache.stats()}
+
+
+def _gauges(name: str, values: dict, labels: str = "") -> list[str]:
+    # faqat sonli qiymatlar; labels masalan 'engine="async"'
+    suffix = f"{{{labels}}}" if labels else ""
+    return [
+        f"{name}_{key}{suffix} {value}"
+        for key, value in values.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(request: Request):
+    lines = request_metrics.render()
+    lines += _gauges("db_pool", get_pool_stats(async_engine), 'engine="async"')
+    lines += _gauges("db_pool", get_pool_stats(engine), 'engine="sync"')
+    lines += _gauges("principal_cache", principal_cache.stats())
+    lines += _gauges("board_cache", board_cache.stats())
+    lines += _gauges("ws", request.app.state.ws_manager.stats())
+    lines += _gauges("audit_writer", audit_writer.stats())
+    lines.append(
+        f"process_max_rss_kb {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}"
+    )
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
@@ -1,10 +1,23 @@
-from sqlalchemy import false
-from fastapi import APIRouter
+from typing import Annotated
 
-from app.models import Notification
+from sqlalchemy import select
+from fastapi import APIRouter, Query, Response
+
+from app.models import Notification, User
 from app.utils import get_object_or_404
-from app.schemas import NotificationListReponse
-from app.dependencies import db_dep, current_user_dep
+from app.schemas import (
+    NotificationFilterParams,
+    NotificationListReponse,
+    NotificationPageResponse,
+    NotificationReadRequest,
+)
+from app.services import (
+    mark_notifications_read,
+    notification_inbox_query,
+    paginate_notifications,
+)
+from app.dependencies import async_db_dep, current_user_dep
+from app.settings import LEGACY_LIST_LIMIT
 
 
 router = APIRouter(
@@ -13,21 +26,69 @@ router = APIRouter(
 )
 
 
-@router.get("/unread", response_model=list[NotificationListReponse])
-async def get_unread_notification(db: db_dep, current_user: current_user_dep):
-    notifications = db.query(Notification).filter(
-        Notification.recipient_id==current_user.id,
-        Notification.is_read==false()
-    ).all()
+@router.get("/", response_model=NotificationPageResponse)
+async def get_notifications(
+    db: async_db_dep,
+    current_user: current_user_dep,
+    params: Annotated[NotificationFilterParams, Query()],
+):
+    query = notification_inbox_query(current_user.id, params.unread_only)
+    return await paginate_notifications(db, query, params)
+
+
+@router.get("/unread", response_model=list[NotificationListReponse], deprecated=True)
+async def get_unread_notification(
+    db: async_db_dep, current_user: current_user_dep, response: Response
+):
+    """
+    Deprecated, use the keyset-paginated `GET /notifications/?unread_only=true`.
+    Keeps the original list response for old clients, but returns at most
+    LEGACY_LIST_LIMIT of the newest unread notifications.
+    """
+    response.headers["Deprecation"] = "true"
+    response.headers["Link"] = (
+        '</notifications/?unread_only=true>; rel="successor-version"'
+    )
+    notifications = await db.scalars(
+        notification_inbox_query(current_user.id, unread_only=True)
+        .order_by(Notification.id.desc())
+        .limit(LEGACY_LIST_LIMIT)
+    )
+    return notifications.all()
+
+
+@router.get("/unread/count")
+async def get_unread_notification_count(
+    db: async_db_dep, current_user: current_user_dep
+):
+    count = await db.scalar(
+        select(User.unread_notifications_count).where(User.id == current_user.id)
+    )
+
+    return {"count": count}
+
+
+@router.patch("/read/")
+async def read_notifications(
+    db: async_db_dep, current_user: current_user_dep, data: NotificationReadRequest
+):
+    changed = await mark_notifications_read(
+        db, current_user.id, up_to_id=data.up_to_id
+    )
+    await db.commit()
 
-    return notifications
+    return {"detail": "Notifications are read successfully.", "count": changed}
 
 
 @router.patch("/{notif_id:int}/read")
-async def edit_notification(notif_id: int, db: db_dep, current_user: current_user_dep):
-    notif = get_object_or_404(db, Notification, id=notif_id)
+async def edit_notification(
+    notif_id: int, db: async_db_dep, current_user: current_user_dep
+):
+    notif = await get_object_or_404(
+        db, Notification, id=notif_id, recipient_id=current_user.id
+    )
 
-    notif.is_read = True
-    db.commit()
+    await mark_notifications_read(db, current_user.id, notification_id=notif.id)
+    await db.commit()
 
     return {"detail": "Notification is read successfully."}
@@ -1,21 +1,41 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from sqlalchemy import select
 
+from app.enums import WSEventTypes
 from app.schemas.auth import Role
 from app.utils import get_object_or_404
-from app.models import Project, ProjectMember, User
-from app.services.projects import generate_project_key
-from app.dependencies import current_user_dep, db_dep, project_owner_dep
+from app.models import Project, ProjectMember, Task, User
+from app.services import (
+    audit_history_query,
+    enqueue_ws_event,
+    generate_project_key,
+    load_board,
+    project_list_query,
+    project_member_list_query,
+    task_list_query,
+    paginate_audit_logs,
+    paginate_tasks,
+    PROJECT_OPTIONS,
+)
+from app.dependencies import current_user_dep, async_db_dep, project_owner_dep
 from app.schemas import (
+    AuditLogFilterParams,
+    AuditLogPageResponse,
+    BoardParams,
+    BoardResponse,
     ProjectCreateRequest,
     ProjectInviteRequest,
     ProjectKickRequest,
     ProjectMemmberResponse,
     ProjectResponse,
     ProjectUpdateRequest,
+    TaskFilterParams,
     TaskListResponse,
+    TaskPageResponse,
 )
+from app.settings import LEGACY_LIST_LIMIT
 
 router = APIRouter(
     prefix="/project", 
@@ -25,9 +45,9 @@ router = APIRouter(
 
 @router.post("/create/")
 async def project_create(
-    db: db_dep, data: ProjectCreateRequest, user: project_owner_dep
+    db: async_db_dep, data: ProjectCreateRequest, user: project_owner_dep
 ):
-    generated_key = generate_project_key(db=db, name=data.name)
+    generated_key = await generate_project_key(db=db, name=data.name)
 
     # project owner yangi project yaratishi
     new_project = Project(
@@ -39,22 +59,20 @@ async def project_create(
     )
 
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    await db.flush()
 
     # project yaralganda ownerni ProjectMemmberga qo'shish
     new_project_memmber = ProjectMember(project_id=new_project.id, user_id=user.id)
 
     db.add(new_project_memmber)
-    db.commit()
-    db.refresh(new_project_memmber)
+    await db.commit()
 
     return {"detail": "Create project successfully!"}
 
 
 @router.get("/all/", response_model=List[ProjectResponse])
-async def get_all_project(db: db_dep):
-    projects = db.query(Project).all()
+async def get_all_project(db: async_db_dep):
+    projects = (await db.scalars(project_list_query())).all()
 
     if not projects:
         raise HTTPException(404, "Projects Not Found.")
@@ -63,58 +81,58 @@ async def get_all_project(db: db_dep):
 
 
 @router.get("/{project_key:str}/", response_model=ProjectResponse)
-async def get_project_by_key(db: db_dep, project_key: str):
+async def get_project_by_key(db: async_db_dep, project_key: str):
 
-    project = get_object_or_404(db, Project, key=project_key)
+    project = await get_object_or_404(db, Project, *PROJECT_OPTIONS, key=project_key)
     return project
 
 
 @router.put("/{project_key:str}/update", response_model=ProjectUpdateRequest)
 async def project_update(
-    db: db_dep,
+    db: async_db_dep,
     project_key: str,
     user: project_owner_dep,
     new_project: ProjectUpdateRequest,
 ):
     
-    project = get_object_or_404(db, Project, key=project_key)
+    project = await get_object_or_404(db, Project, key=project_key)
 
     if project.owner_id != user.id:
         raise HTTPException(400, "Faqat o'zingiz yaratgan loyihani edit qila olasiz.")
 
     update_project = new_project.model_dump(exclude_unset=True)
 
+    # key o'zgarmaydi: task keylari va linklar unga bog'langan
     for key, value in update_project.items():
         setattr(project, key, value)
 
-    if "name" in new_project:
-        project.key = generate_project_key(db=db, name=project.name)
-
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
 
     return project
 
 
 @router.get("/{project_key}/members/", response_model=List[ProjectMemmberResponse])
-async def get_project_member(db: db_dep, user: current_user_dep, project_key: str):
+async def get_project_member(
+    db: async_db_dep, user: current_user_dep, project_key: str
+):
 
-    project = get_object_or_404(db, Project, key=project_key)
+    project = await get_object_or_404(db, Project, key=project_key)
 
-    members = project.members
+    members = (await db.scalars(project_member_list_query(project.id))).all()
 
     return members
 
 
 @router.post("/{project_key:str}/members/invite/")
 async def project_add_member(
-    db: db_dep,
+    db: async_db_dep,
     project_key: str,
     user: project_owner_dep,
     invite_data: ProjectInviteRequest,
 ):
     
-    project = get_object_or_404(db, Project, key=project_key)
+    project = await get_object_or_404(db, Project, key=project_key)
 
     # User qo'shayotgan odam shu loyihani yaratganini tekshirish
     if project.owner_id != user.id:
@@ -122,55 +140,142 @@ async def project_add_member(
             403, "Siz faqat o'zingiz yaratgan projectga a'zo qo'sha olasiz."
         )
 
-    user = get_object_or_404(db, User, id=invite_data.user_id)
+    user = await get_object_or_404(db, User, id=invite_data.user_id)
 
     if user.role == Role.owner.value:
         raise HTTPException(403, "Loyihada bitta Project Owner bo'ladi.")
 
     # user project ga biriktirilmaganini tekshirish
-    if user in project.members:
+    is_member = await db.scalar(
+        select(ProjectMember).where(
+            ProjectMember.user_id == user.id,
+            ProjectMember.project_id == project.id,
+        )
+    )
+    if is_member:
         raise HTTPException(400, "User is already in the project.")
 
     new_member = ProjectMember(user_id=user.id, project_id=project.id)
 
     db.add(new_member)
-    db.commit()
-    db.refresh(new_member)
+
+    # userning ochiq websocketlari shu project eventlarini ola boshlaydi
+    enqueue_ws_event(
+        db,
+        event_type=WSEventTypes.member_added,
+        project_id=project.id,
+        payload={
+            "type": WSEventTypes.member_added,
+            "project_id": project.id,
+            "project_key": project.key,
+            "user_id": user.id,
+            "role": user.role,
+        },
+    )
+    await db.commit()
 
     return {"detail": "User loyihaga muvaffaqiyatli biriktirildi."}
 
 
 @router.delete("/{project_key}/members/kick/")
 async def kick_project_member(
-    db: db_dep, user: project_owner_dep, project_key: str, kick_data: ProjectKickRequest
+    db: async_db_dep,
+    user: project_owner_dep,
+    project_key: str,
+    kick_data: ProjectKickRequest,
 ):
     
-    project = get_object_or_404(db, Project, key=project_key)
+    project = await get_object_or_404(db, Project, key=project_key)
 
-    if project.owner.id != user.id:
+    if project.owner_id != user.id:
         raise HTTPException(403, "Siz bu loyihani yaratmagansiz. Uni o'chira olmaysiz.")
 
-    member = (
-        db.query(ProjectMember)
-        .filter(
+    member = await db.scalar(
+        select(ProjectMember).where(
             ProjectMember.user_id == kick_data.user_id,
             ProjectMember.project_id == project.id,
         )
-        .first()
     )
 
     if not member:
         raise HTTPException(404, "Project da bunday azo yo'q.")
 
-    db.delete(member)
-    db.commit()
+    await db.delete(member)
+
+    enqueue_ws_event(
+        db,
+        event_type=WSEventTypes.member_removed,
+        project_id=project.id,
+        payload={
+            "type": WSEventTypes.member_removed,
+            "project_id": project.id,
+            "project_key": project.key,
+            "user_id": kick_data.user_id,
+        },
+    )
+    await db.commit()
 
     return {"detail": "Xodim loyihadan muvaffaqiyatli chiqarildi."}
 
 
-@router.get("/{project_key:str}/tasks/", response_model=List[TaskListResponse])
-async def get_project_task(db: db_dep, user: current_user_dep, project_key: str):
+@router.get("/{project_key:str}/tasks/page/", response_model=TaskPageResponse)
+async def get_project_task_page(
+    db: async_db_dep,
+    user: current_user_dep,
+    project_key: str,
+    params: Annotated[TaskFilterParams, Query()],
+):
+    project = await get_object_or_404(db, Project, key=project_key)
+    query = task_list_query().where(Task.project_id == project.id)
+    return await paginate_tasks(db, query, params)
+
+
+@router.get(
+    "/{project_key:str}/tasks/",
+    response_model=List[TaskListResponse],
+    deprecated=True,
+)
+async def get_project_task(
+    db: async_db_dep, user: current_user_dep, project_key: str, response: Response
+):
+    """
+    Deprecated, use the keyset-paginated `GET /project/{project_key}/tasks/page/`.
+    Keeps the original list response for old clients, but returns at most
+    LEGACY_LIST_LIMIT of the project's most recently updated tasks.
+    """
+    project = await get_object_or_404(db, Project, key=project_key)
+    response.headers["Deprecation"] = "true"
+    response.headers["Link"] = (
+        f'</project/{project.key}/tasks/page/>; rel="successor-version"'
+    )
+    tasks = await db.scalars(
+        task_list_query()
+        .where(Task.project_id == project.id)
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(LEGACY_LIST_LIMIT)
+    )
+    return tasks.all()
+
+
+@router.get("/{project_key:str}/board/", response_model=BoardResponse)
+async def get_project_board(
+    db: async_db_dep,
+    user: current_user_dep,
+    project_key: str,
+    params: Annotated[BoardParams, Query()],
+):
+    # tasklar statuslar bo'yicha guruhlangan, har ustunda `limit` tagacha
+    return await load_board(db, project_key, params.limit)
+
+
+@router.get("/{project_key:str}/history/", response_model=AuditLogPageResponse)
+async def get_project_history(
+    db: async_db_dep,
+    user: current_user_dep,
+    project_key: str,
+    params: Annotated[AuditLogFilterParams, Query()],
+):
 
-    project = get_object_or_404(db, Project, key=project_key)
-    tasks = project.tasks
-    return tasks
+    project = await get_object_or_404(db, Project, key=project_key)
+    query = audit_history_query(project_id=project.id)
+    return await paginate_audit_logs(db, query, params)
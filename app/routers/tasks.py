@@ -1,27 +1,61 @@
-from typing import List
+import io
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Response, Request
+from fastapi import APIRouter, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
 
-from app.enums import Role, Status
+from app.enums import AuditEventType, Role, Status
 from app.utils import get_object_or_404
-from app.websocket.manager import WSManager
-from app.services import generated_task_key
+from app.services import (
+    audit_history_query,
+    audit_writer,
+    create_comment,
+    create_notifications,
+    delete_comment,
+    delete_task_notifications,
+    enqueue_ws_event,
+    generated_task_key,
+    import_format,
+    import_tasks,
+    project_member_ids,
+    task_list_query,
+    paginate_audit_logs,
+    paginate_comments,
+    paginate_tasks,
+    run_bulk_operations,
+    search_tasks,
+    COMMENT_OPTIONS,
+)
 from app.enums import WSEventTypes, Priority
-from app.websocket.manager import dispatch_ws_event
 from app.services.tasks import TaskTransitionValidator
-from app.dependencies import current_user_dep, db_dep, project_manager_dep
+from app.dependencies import current_user_dep, async_db_dep, project_manager_dep
 from app.models import (
+    Comment,
     Project, 
     ProjectMember, 
     Task, 
     User, 
-    Notification, 
-    AuditLog
+)
+from app.schemas.audit import AuditLogFilterParams, AuditLogPageResponse
+from app.settings import LEGACY_LIST_LIMIT
+from app.schemas.comments import (
+    CommentCreateRequest,
+    CommentFilterParams,
+    CommentPageResponse,
+    CommentResponse,
+    CommentUpdateRequest,
 )
 from app.schemas.tasks import (
+    TaskBulkRequest,
+    TaskBulkResponse,
     TaskCreateRequest,
     TaskDetailResponse,
+    TaskFilterParams,
+    TaskImportResponse,
     TaskListResponse,
+    TaskPageResponse,
+    TaskSearchPageResponse,
+    TaskSearchParams,
     TaskMoveRequest,
     TaskUpdateRequest,
     TaskAddDeveloperRequest
@@ -30,28 +64,101 @@ from app.schemas.tasks import (
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.get("/all/", response_model=List[TaskListResponse])
-async def get_tasks(db: db_dep):
-    tasks = db.query(Task).all()
-    return tasks
+@router.get("/", response_model=TaskPageResponse)
+async def get_tasks(db: async_db_dep, params: Annotated[TaskFilterParams, Query()]):
+    return await paginate_tasks(db, task_list_query(), params)
+
+
+@router.get("/all/", response_model=list[TaskListResponse], deprecated=True)
+async def get_all_tasks(db: async_db_dep, response: Response):
+    """
+    Deprecated, use the keyset-paginated `GET /tasks/`. Keeps the original
+    list response for old clients, but returns at most LEGACY_LIST_LIMIT of
+    the most recently updated tasks.
+    """
+    response.headers["Deprecation"] = "true"
+    response.headers["Link"] = '</tasks/>; rel="successor-version"'
+    tasks = await db.scalars(
+        task_list_query()
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(LEGACY_LIST_LIMIT)
+    )
+    return tasks.all()
+
+
+# "/{task_key}/" dan oldin bo'lishi kerak
+@router.get("/search/", response_model=TaskSearchPageResponse)
+async def search(
+    db: async_db_dep,
+    user: current_user_dep,
+    params: Annotated[TaskSearchParams, Query()],
+):
+    project_id = None
+    if params.project_key:
+        project = await get_object_or_404(db, Project, key=params.project_key)
+        project_id = project.id
+    return await search_tasks(db, params, project_id)
+
+
+@router.post("/bulk/", response_model=TaskBulkResponse)
+async def bulk_tasks(
+    db: async_db_dep,
+    user: current_user_dep,
+    data: TaskBulkRequest,
+):
+    # hammasi yoki hech narsa: bitta operatsiya xato bo'lsa 400 va hech narsa yozilmaydi
+    result = await run_bulk_operations(db, user, data.operations)
+    await db.commit()
+
+    # AuditLog yozish (commitdan keyin, batch bilan)
+    for audit_event in result.audit_events:
+        await audit_writer.record(**audit_event)
+
+    return result
+
+
+@router.post("/import/{project_key:str}/", response_model=TaskImportResponse)
+async def import_project_tasks(
+    db: async_db_dep,
+    user: project_manager_dep,
+    project_key: str,
+    file: UploadFile,
+):
+    project = await get_object_or_404(db, Project, key=project_key)
+
+    manager = await db.scalar(
+        select(ProjectMember).where(
+            ProjectMember.project_id == project.id, ProjectMember.user_id == user.id
+        )
+    )
+    if not manager:
+        raise HTTPException(403, "Task yaratayptgan manager project ga biriktirlmagan.")
+
+    file_format = import_format(file.filename)
+    if file_format is None:
+        raise HTTPException(400, "Invalid file type")
+
+    # UploadFile katta fayllarni diskka yozadi, qatorlar shu yerdan o'qiladi
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await import_tasks(db, project, user.id, stream, file_format)
+    finally:
+        stream.detach()
 
 
 @router.post("/create/", response_model=TaskDetailResponse)
 async def task_create(
-    db: db_dep, 
+    db: async_db_dep, 
     user: project_manager_dep, 
     task_data: TaskCreateRequest,
-    request: Request
 ):
     
-    project = get_object_or_404(db, Project, key=task_data.project_key)
+    project = await get_object_or_404(db, Project, key=task_data.project_key)
 
-    manager = (
-        db.query(ProjectMember)
-        .filter(
+    manager = await db.scalar(
+        select(ProjectMember).where(
             ProjectMember.project_id == project.id, ProjectMember.user_id == user.id
         )
-        .first()
     )
 
     # taskni yaratayotgan manager project ga qo'shilganini tekshirish
@@ -60,7 +167,7 @@ async def task_create(
 
     # create new task
     new_task = Task(
-        key=generated_task_key(db, project),
+        key=await generated_task_key(db, project),
         summary=task_data.summary,
         description=task_data.description,
         priority=task_data.priority,
@@ -71,40 +178,26 @@ async def task_create(
     )
 
     db.add(new_task)
-    db.flush()
+    await db.flush()
 
     # Notification yozish
-    notification = Notification(
+    await create_notifications(
+        db,
+        [project.owner_id],
         message=f"Yangi task yaratildi: {new_task.summary}",
-        recipient_id=project.owner_id,
         sender_id=user.id,
         task_id=new_task.id,
-        project_id=project.id
-    )
-
-    db.add(notification)
-
-    # AuditLog yozish
-    audit_log = AuditLog(
-        action=f"Task {new_task.summary} created",
-        user_id=user.id,
-        task_id=new_task.id
+        project_id=project.id,
     )
-    db.add(audit_log)
 
-    db.commit()
-    db.refresh(new_task)
-
-
-    ws_manager: WSManager = request.app.state.ws_manager
     event_type = (
         WSEventTypes.task_created_high
         if task_data.priority == Priority.HIGH
         else WSEventTypes.task_created
     )
 
-    await dispatch_ws_event(
-        ws_manager=ws_manager,
+    enqueue_ws_event(
+        db,
         event_type=event_type,
         project_id=new_task.project_id,
         payload={
@@ -117,20 +210,32 @@ async def task_create(
         }
     )
 
+    await db.commit()
+    await db.refresh(new_task, attribute_names=["project", "assignee", "reporter"])
+
+    # AuditLog yozish (commitdan keyin, batch bilan)
+    await audit_writer.record(
+        event_type=AuditEventType.task_created,
+        user_id=user.id,
+        task_id=new_task.id,
+        project_id=project.id,
+        action=f"Task {new_task.summary} created",
+        to_status=Status.BACKLOG.value,
+    )
+
     return new_task
 
 
 @router.post("/{task_key:str}/add/developer")
 async def task_add_developer(
-    db: db_dep, 
+    db: async_db_dep, 
     task_key: str, 
     current_user: project_manager_dep,
     user_data: TaskAddDeveloperRequest,
-    request: Request
 ):
     
-    task = get_object_or_404(db, Task, key=task_key)
-    user = get_object_or_404(db, User, id=user_data.user_id)
+    task = await get_object_or_404(db, Task, key=task_key)
+    user = await get_object_or_404(db, User, id=user_data.user_id)
     
     # Permission check (faqat owner/manager yoki reporter qo‘shishi mumkin)
     if (current_user.role not in [Role.manager, Role.admin, Role.owner] 
@@ -140,12 +245,11 @@ async def task_add_developer(
     project_id = task.project_id
 
     # Developer shu project ichidami?
-    is_member = (
-        db.query(ProjectMember).
-        filter(ProjectMember.project_id==project_id,
-               ProjectMember.user_id==user.id
-               )
-               .first()
+    is_member = await db.scalar(
+        select(ProjectMember).where(
+            ProjectMember.project_id==project_id,
+            ProjectMember.user_id==user.id
+        )
     )
 
     if not is_member:
@@ -156,32 +260,23 @@ async def task_add_developer(
         raise HTTPException(400, "Task already has a developer assigned.")
     
     # Assign developer
+    old_status = task.status
     task.assignee_id = user.id
     task.status = Status.TODO
 
-    # AuditLog yozish
-    audit_log = AuditLog(
-        action=f"Developer {user.fullname} assigneed to task {task.key}",
-        user_id=current_user.id,
-        task_id=task.id
-    )
-
-    db.add(audit_log)
-
-    notif_developer = Notification(
+    await create_notifications(
+        db,
+        [user.id],
         message=f"Siz {task.key} taskiga biriktirildingiz!",
-        recipient_id=user.id,
         sender_id=current_user.id,
         task_id=task.id,
-        project_id=project_id
+        project_id=project_id,
     )
-    db.add(notif_developer)
 
-    ws_manager: WSManager = request.app.state.ws_manager
     event_type = WSEventTypes.task_status_change
 
-    await dispatch_ws_event(
-        ws_manager=ws_manager,
+    enqueue_ws_event(
+        db,
         event_type=event_type,
         project_id=project_id,
         payload={
@@ -195,8 +290,19 @@ async def task_add_developer(
     )
 
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+
+    # AuditLog yozish
+    await audit_writer.record(
+        event_type=AuditEventType.developer_assigned,
+        user_id=current_user.id,
+        task_id=task.id,
+        project_id=project_id,
+        action=f"Developer {user.fullname} assigneed to task {task.key}",
+        from_status=old_status,
+        to_status=Status.TODO.value,
+        payload={"developer_id": user.id},
+    )
 
     return {
         "detail": "Developer successfully assigned.",
@@ -207,65 +313,81 @@ async def task_add_developer(
 
 
 @router.get("/{task_key:str}/")
-async def get_task_by_key(db: db_dep, current_user: current_user_dep, task_key: str):
+async def get_task_by_key(
+    db: async_db_dep, current_user: current_user_dep, task_key: str
+):
 
-    task = get_object_or_404(db, Task, key=task_key)
+    task = await get_object_or_404(db, Task, key=task_key)
     return task
 
 
 @router.put("/{task_key:str}/edit/")
 async def update_task(
-    db: db_dep, user: project_manager_dep, task_key: str, data: TaskUpdateRequest
+    db: async_db_dep, user: project_manager_dep, task_key: str, data: TaskUpdateRequest
 ):
-    task = get_object_or_404(db, Task, key=task_key)
+    task = await get_object_or_404(db, Task, key=task_key)
 
     if task.reporter_id != user.id:
         raise HTTPException(400, "Siz task ni yaratmagansiz. Uni o'zgartira olmaysiz.")
 
     edit_task = data.model_dump(exclude_unset=True)
+    old_status = task.status
 
     for key, value in edit_task.items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
+
+    await audit_writer.record(
+        event_type=AuditEventType.task_updated,
+        user_id=user.id,
+        task_id=task.id,
+        project_id=task.project_id,
+        action=f"Task {task.key} updated",
+        from_status=old_status,
+        to_status=task.status,
+        payload=data.model_dump(mode="json", exclude_unset=True),
+    )
 
     return task
 
 
 @router.delete("/{task_key:str}/delete/")
-async def delete_task(db: db_dep, user: project_manager_dep, task_key: str):
-    task = get_object_or_404(db, Task, key=task_key)
+async def delete_task(db: async_db_dep, user: project_manager_dep, task_key: str):
+    task = await get_object_or_404(db, Task, key=task_key)
 
     if task.reporter_id != user.id:
         raise HTTPException(400, "Bu taskni siz yaratmagansiz. Uni o'chiraolmaysiz.")
 
-    db.delete(task)
-    db.commit()
+    await delete_task_notifications(db, [task.id])
+    await db.delete(task)
+    await db.commit()
 
     return Response(status_code=204)
 
 
 @router.patch("/{task_key:str}/move/")
 async def move_task(
-    db: db_dep, 
+    db: async_db_dep, 
     user: current_user_dep, 
     task_key: str, 
     data: TaskMoveRequest,
-    request: Request
 ):  
     
-    task: Task = get_object_or_404(db, Task, key=task_key)
+    task: Task = await get_object_or_404(db, Task, key=task_key)
     old_status = task.status
 
     if user.role == Role.developer and task.assignee_id != user.id:
         raise HTTPException(403, "Siz bu taskga biriktirilgan developer emassiz!")
     
     if user.role == Role.tester:
-        is_member = db.query(ProjectMember).filter(
-            ProjectMember.user_id==user.id,
-            ProjectMember.project_id==task.project_id
-        ).first()
+        is_member = await db.scalar(
+            select(ProjectMember).where(
+                ProjectMember.user_id==user.id,
+                ProjectMember.project_id==task.project_id
+            )
+        )
 
         if not is_member:
             raise HTTPException(403, "Siz bu projectga a'zo emassiz!")
@@ -275,44 +397,30 @@ async def move_task(
     
     task.status = data.status
 
-    # AuditLog yozish
-    audit_log = AuditLog(
-        action=f"Status changed: {old_status}->{data.status}#",
-        user_id=user.id,
-        task_id=task.id
-    )
-
-    db.add(audit_log)
-
     recipients = []
 
     if data.status == Status.TODO:
-        recipients=[task.assignee_id]
+        recipients = [task.assignee_id]
     elif data.status == Status.IN_PROGRESS:
-        recipients=[task.reporter_id]
-    elif data.status == Status.READY_FOR_TESTING and data.status == Status.DONE:
-        project: Project = get_object_or_404(db, Project, id=task.project_id)
-        members = project.members
-        recipients = [m.id for m in members]
-
+        recipients = [task.reporter_id]
+    elif data.status in (Status.READY_FOR_TESTING, Status.DONE):
+        # butun project a'zolari: bitta INSERT ... SELECT, a'zolar yuklanmaydi
+        recipients = project_member_ids(task.project_id)
 
     # Notification yozish
-    for recipient in recipients:
-        notification = Notification(
-            message=f"Status changed: {old_status}->{data.status}#",
-            recipient_id=recipient,
-            sender_id=user.id,
-            task_id=task.id,
-            project_id=task.project_id
-        )
-        db.add(notification)
-    
-    event_type = WSEventTypes.task_all
+    await create_notifications(
+        db,
+        recipients,
+        message=f"Status changed: {old_status}->{data.status}#",
+        sender_id=user.id,
+        task_id=task.id,
+        project_id=task.project_id,
+    )
 
-    ws_manager: WSManager = request.app.state.ws_manager
+    event_type = WSEventTypes.task_all
 
-    await dispatch_ws_event(
-        ws_manager=ws_manager,
+    enqueue_ws_event(
+        db,
         event_type=event_type,
         project_id=task.project_id,
         payload={
@@ -324,19 +432,111 @@ async def move_task(
     )
 
 
-    db.commit()
+    await db.commit()
+
+    # AuditLog yozish
+    await audit_writer.record(
+        event_type=AuditEventType.status_changed,
+        user_id=user.id,
+        task_id=task.id,
+        project_id=task.project_id,
+        action=f"Status changed: {old_status}->{data.status.value}#",
+        from_status=old_status,
+        to_status=data.status.value,
+    )
 
     return {"detail": "Successfully status changed!","new_status": data.status}
 
 
-@router.get("/{task_key:str}/comments/")
-async def get_task_comments(db: db_dep, user: current_user_dep, task_key: str):
-    task = db.query(Task).filter(Task.key == task_key).first()
+async def _get_comment(db, task_key: str, comment_id: int) -> Comment:
+    comment = await db.scalar(
+        select(Comment)
+        .join(Comment.task)
+        .where(Comment.id == comment_id, Task.key == task_key)
+        .options(*COMMENT_OPTIONS)
+    )
+    if not comment:
+        raise HTTPException(404, "Comment Not Found.")
+    return comment
+
+
+@router.get("/{task_key:str}/comments/", response_model=CommentPageResponse)
+async def get_task_comments(
+    db: async_db_dep,
+    user: current_user_dep,
+    task_key: str,
+    params: Annotated[CommentFilterParams, Query()],
+):
+    task = await get_object_or_404(db, Task, key=task_key)
+    return await paginate_comments(db, task.id, params)
+
+
+@router.post("/{task_key:str}/comments/create/", response_model=CommentResponse)
+async def create_task_comment(
+    db: async_db_dep,
+    user: current_user_dep,
+    task_key: str,
+    data: CommentCreateRequest,
+):
+    task = await get_object_or_404(db, Task, key=task_key)
+
+    is_member = await db.scalar(
+        select(ProjectMember.id).where(
+            ProjectMember.project_id == task.project_id,
+            ProjectMember.user_id == user.id,
+        )
+    )
+    if not is_member:
+        raise HTTPException(403, "Faqat project a'zolari comment yoza oladi.")
+
+    comment = await create_comment(db, task, user.id, data.content)
+    await db.commit()
+
+    return await _get_comment(db, task_key, comment.id)
 
-    if not task:
-        raise HTTPException(404, "Task Not Found.")
 
-    comments = task.comments
+@router.put(
+    "/{task_key:str}/comments/{comment_id:int}/edit/", response_model=CommentResponse
+)
+async def update_task_comment(
+    db: async_db_dep,
+    user: current_user_dep,
+    task_key: str,
+    comment_id: int,
+    data: CommentUpdateRequest,
+):
+    comment = await _get_comment(db, task_key, comment_id)
+
+    if comment.user_id != user.id:
+        raise HTTPException(403, "Faqat o'zingizning commentingizni o'zgartira olasiz.")
+
+    comment.content = data.content
+    await db.commit()
 
-    return comments
+    return await _get_comment(db, task_key, comment_id)
+
+
+@router.delete("/{task_key:str}/comments/{comment_id:int}/delete/")
+async def delete_task_comment(
+    db: async_db_dep, user: current_user_dep, task_key: str, comment_id: int
+):
+    comment = await _get_comment(db, task_key, comment_id)
 
+    if comment.user_id != user.id and user.role != Role.admin:
+        raise HTTPException(403, "Faqat o'zingizning commentingizni o'chira olasiz.")
+
+    await delete_comment(db, comment)
+    await db.commit()
+
+    return Response(status_code=204)
+
+
+@router.get("/{task_key:str}/history/", response_model=AuditLogPageResponse)
+async def get_task_history(
+    db: async_db_dep,
+    user: current_user_dep,
+    task_key: str,
+    params: Annotated[AuditLogFilterParams, Query()],
+):
+    task = await get_object_or_404(db, Task, key=task_key)
+    return await paginate_audit_logs(db, audit_history_query(task_id=task.id), params)
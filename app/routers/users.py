@@ -1,8 +1,9 @@
 from typing import List
 
 from fastapi import APIRouter
+from sqlalchemy import select
 
-from app.dependencies import db_dep
+from app.dependencies import async_db_dep
 from app.models import User
 from app.schemas import UserListResponse
 
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/", response_model=List[UserListResponse])
-async def user_list(db: db_dep):
-    users = db.query(User).all()
+async def user_list(db: async_db_dep):
+    users = (await db.scalars(select(User))).all()
 
     return users
@@ -3,3 +3,5 @@ from .projects import *  # noqa
 from .tasks import *  # noqa
 from .users import * # noqa
 from .notifications import * # noqa
+from .audit import * # noqa
+from .comments import * # noqa
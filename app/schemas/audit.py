@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.enums import AuditEventType, Role, Status
+
+
+class AuditLogUserNested(BaseModel):
+    id: int
+    fullname: str | None
+    role: Role
+
+    model_config = {"from_attributes": True}
+
+
+class AuditLogResponse(BaseModel):
+    id: int
+    event_type: AuditEventType | None
+    action: str
+    from_status: Status | None
+    to_status: Status | None
+    payload: dict | None
+    task_id: int
+    project_id: int | None
+    timestamp: datetime
+    user: AuditLogUserNested
+
+
+class AuditLogFilterParams(BaseModel):
+    event_type: AuditEventType | None = None
+    cursor: str | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+
+
+class AuditLogPageResponse(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: str | None = None
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, EmailStr, Field
+
+from app.enums import Role
+
+
+class CommentUserNested(BaseModel):
+    id: int
+    email: EmailStr
+    role: Role
+    fullname: str | None = None
+    avatar: str | None = None
+
+
+class CommentCreateRequest(BaseModel):
+    content: str = Field(min_length=1, max_length=10000)
+
+
+class CommentUpdateRequest(BaseModel):
+    content: str = Field(min_length=1, max_length=10000)
+
+
+class CommentResponse(BaseModel):
+    id: int
+    task_id: int
+    content: str
+    created_at: datetime
+    updated_at: datetime
+    user: CommentUserNested
+
+
+class CommentFilterParams(BaseModel):
+    cursor: str | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+
+
+class CommentPageResponse(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: str | None = None
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, EmailStr, Field
 
 from app.enums import Role
 
@@ -13,4 +16,22 @@ class NotificationNastedUser(BaseModel):
 class NotificationListReponse(BaseModel):
     id: int
     message: str
-    sender: NotificationNastedUser
\ No newline at end of file
+    is_read: bool
+    created_at: datetime
+    sender: NotificationNastedUser
+
+
+class NotificationFilterParams(BaseModel):
+    unread_only: bool = False
+    cursor: str | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+
+
+class NotificationPageResponse(BaseModel):
+    items: List[NotificationListReponse]
+    next_cursor: str | None = None
+
+
+class NotificationReadRequest(BaseModel):
+    # berilmasa hamma o'qilmaganlar o'qilgan bo'ladi
+    up_to_id: int | None = None
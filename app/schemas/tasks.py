@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Annotated, List, Literal, Union
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from app.enums import Priority, Role, Status
+from app.settings import TASK_BULK_MAX_OPERATIONS
 
 class TaskUserNested(BaseModel):
     id: int
@@ -44,6 +46,67 @@ class TaskListResponse(BaseModel):
     summary: str
     status: Status
     priority: Priority
+    comments_count: int = 0
+
+
+class TaskFilterParams(BaseModel):
+    status: Status | None = None
+    priority: Priority | None = None
+    assignee_id: int | None = None
+    due_from: datetime | None = None
+    due_to: datetime | None = None
+    order_by: Literal["updated_at", "id"] = "updated_at"
+    cursor: str | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+
+
+class TaskPageResponse(BaseModel):
+    items: List[TaskListResponse]
+    next_cursor: str | None = None
+
+
+class TaskSearchParams(BaseModel):
+    q: str = Field(min_length=2, max_length=200)
+    project_key: str | None = None
+    cursor: str | None = None
+    limit: int = Field(default=20, ge=1, le=100)
+
+
+class TaskSearchHit(BaseModel):
+    rank: float
+    task: TaskListResponse
+
+
+class TaskSearchPageResponse(BaseModel):
+    items: List[TaskSearchHit]
+    next_cursor: str | None = None
+
+
+class BoardParams(BaseModel):
+    # har bir ustunda ko'rsatiladigan tasklar soni
+    limit: int = Field(default=20, ge=1, le=100)
+
+
+class BoardTaskResponse(BaseModel):
+    id: int
+    key: str
+    summary: str
+    status: Status
+    priority: Priority
+    assignee: TaskListUserNested | None = None
+    due_date: datetime
+    updated_at: datetime
+
+
+class BoardColumnResponse(BaseModel):
+    status: Status
+    count: int
+    tasks: List[BoardTaskResponse]
+
+
+class BoardResponse(BaseModel):
+    project_key: str
+    columns: List[BoardColumnResponse]
 
 
 class TaskDetailResponse(BaseModel):
@@ -56,6 +119,7 @@ class TaskDetailResponse(BaseModel):
     assignee: TaskListUserNested | None = None
     reporter: TaskListUserNested
     due_date: datetime
+    comments_count: int = 0
 
 
 class TaskUpdateRequest(BaseModel):
@@ -69,3 +133,56 @@ class TaskUpdateRequest(BaseModel):
 
 class TaskMoveRequest(BaseModel):
     status: Status
+
+
+class TaskBulkCreate(TaskCreateRequest):
+    action: Literal["create"]
+
+
+class TaskBulkMove(BaseModel):
+    action: Literal["move"]
+    key: str
+    status: Status
+
+
+class TaskBulkAssign(BaseModel):
+    action: Literal["assign"]
+    key: str
+    user_id: int
+
+
+class TaskBulkDelete(BaseModel):
+    action: Literal["delete"]
+    key: str
+
+
+TaskBulkOperation = Annotated[
+    Union[TaskBulkCreate, TaskBulkMove, TaskBulkAssign, TaskBulkDelete],
+    Field(discriminator="action"),
+]
+
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOperation] = Field(
+        min_length=1, max_length=TASK_BULK_MAX_OPERATIONS
+    )
+
+
+class TaskBulkResponse(BaseModel):
+    created: List[str]
+    moved: List[str]
+    assigned: List[str]
+    deleted: List[str]
+
+
+class TaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int
+    failed: int
+    first_key: str | None = None
+    last_key: str | None = None
+    errors: List[TaskImportError]
@@ -1,11 +1,83 @@
-from .projects import generate_project_key  # noqa
-from .tasks import generated_task_key  # noqa
+from .audit import audit_writer, audit_history_query, paginate_audit_logs  # noqa
+from .bulk import run_bulk_operations  # noqa
+from .board import board_cache, invalidate_board, load_board  # noqa
+from .comments import (  # noqa
+    create_comment,
+    delete_comment,
+    paginate_comments,
+    COMMENT_OPTIONS,
+)
+from .imports import import_format, import_tasks  # noqa
+from .notifications import (  # noqa
+    create_notifications,
+    delete_task_notifications,
+    mark_notifications_read,
+    notification_inbox_query,
+    paginate_notifications,
+    project_member_ids,
+)
+from .outbox import enqueue_ws_event, run_outbox_dispatcher  # noqa
+from .projects import (  # noqa
+    generate_project_key,
+    project_list_query,
+    project_member_list_query,
+    PROJECT_OPTIONS,
+)
+from .retention import archive_expired_rows  # noqa
+from .tasks import (  # noqa
+    allocate_task_keys,
+    generated_task_key,
+    task_list_query,
+    paginate_tasks,
+    search_tasks,
+)
+from .tokens import (  # noqa
+    create_access_token,
+    issue_login_tokens,
+    refresh_login_tokens,
+    revoke_refresh_token,
+    token_store,
+)
 from .users import validate_image, save_avatar_image  # noqa
 
 
 __all__ = [
+    "audit_writer",
+    "audit_history_query",
+    "paginate_audit_logs",
+    "run_bulk_operations",
+    "board_cache",
+    "invalidate_board",
+    "load_board",
+    "create_comment",
+    "delete_comment",
+    "paginate_comments",
+    "COMMENT_OPTIONS",
+    "import_format",
+    "import_tasks",
+    "create_notifications",
+    "delete_task_notifications",
+    "mark_notifications_read",
+    "notification_inbox_query",
+    "paginate_notifications",
+    "project_member_ids",
+    "enqueue_ws_event",
+    "run_outbox_dispatcher",
     "generate_project_key",
+    "project_list_query",
+    "project_member_list_query",
+    "PROJECT_OPTIONS",
+    "archive_expired_rows",
+    "allocate_task_keys",
     "generated_task_key",
+    "task_list_query",
+    "paginate_tasks",
+    "search_tasks",
+    "create_access_token",
+    "issue_login_tokens",
+    "refresh_login_tokens",
+    "revoke_refresh_token",
+    "token_store",
     "validate_image",
     "save_avatar_image",
 ]
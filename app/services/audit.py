@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import AuditLog
+from app.schemas.audit import AuditLogFilterParams, AuditLogResponse
+from app.services.queries import keyset_page, schema_load_options
+from app.settings import AUDIT_BATCH_SIZE, AUDIT_BUFFER_MAX, AUDIT_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+AUDIT_LOG_OPTIONS = schema_load_options(AuditLog, AuditLogResponse)
+
+
+class AuditLogWriter:
+    """
+    Buffers audit events in memory and writes them with one multi-row INSERT
+    per batch, every AUDIT_FLUSH_INTERVAL seconds or as soon as a batch is
+    full. Routers record events after their own commit, so an event is only
+    written for a change that really happened and the request never waits
+    for the audit INSERT.
+
+    When the buffer reaches `buffer_max` (the database has been slow or down
+    for a while) `record` flushes in the request itself, so callers are
+    slowed down instead of losing events. Only if that flush fails too is
+    the oldest event dropped; every drop is logged and counted in
+    `stats()["dropped"]` (/metrics: audit_writer_dropped).
+
+    The buffer lives in process memory: events recorded but not yet flushed
+    are lost if the process crashes or is killed. A graceful shutdown
+    flushes them (see `run`).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        buffer_max: int = AUDIT_BUFFER_MAX,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_max = buffer_max
+        self.buffer: list[dict] = []
+        self.dropped = 0
+        self.sync_flushes = 0
+        self._batch_ready: asyncio.Event | None = None
+
+    async def record(
+        self,
+        event_type: str,
+        user_id: int,
+        task_id: int,
+        project_id: int,
+        action: str,
+        from_status: str | None = None,
+        to_status: str | None = None,
+        payload: dict | None = None,
+    ):
+        if len(self.buffer) >= self.buffer_max:
+            await self._make_room()
+
+        self.buffer.append(
+            {
+                "event_type": event_type,
+                "user_id": user_id,
+                "task_id": task_id,
+                "project_id": project_id,
+                "action": action[:250],
+                "from_status": from_status,
+                "to_status": to_status,
+                "payload": payload,
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+        if len(self.buffer) >= self.batch_size and self._batch_ready is not None:
+            self._batch_ready.set()
+
+    async def _make_room(self):
+        # backpressure: background flush ulgurmayapti, so'rovning o'zi yozadi
+        self.sync_flushes += 1
+        try:
+            await self.flush()
+        except Exception as err:
+            # baza ulanmasa ham (ConnectionRefusedError) so'rov yiqilmasligi kerak
+            logger.warning(f"Audit flush on full buffer failed: {err!r}")
+
+        # baza ishlamasa xotira cheksiz o'smasligi uchun eng eskisi tashlanadi
+        while len(self.buffer) >= self.buffer_max:
+            event = self.buffer.pop(0)
+            self.dropped += 1
+            logger.error(
+                "Audit buffer full, event dropped: "
+                f"{event['event_type']} task={event['task_id']} "
+                f"user={event['user_id']} at {event['timestamp'].isoformat()}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self.buffer),
+            "dropped": self.dropped,
+            "sync_flushes": self.sync_flushes,
+        }
+
+    async def flush(self) -> int:
+        written = 0
+        while self.buffer:
+            batch = self.buffer[: self.batch_size]
+            del self.buffer[: len(batch)]
+            size = len(batch)
+            try:
+                async with AsyncSessionLocal() as db:
+                    try:
+                        # Core insert: ORM bulk insert None qiymatli kalitlarni
+                        # tashlab, batchni qator-qator INSERTlarga bo'lib yuboradi
+                        await db.execute(insert(AuditLog.__table__), batch)
+                        await db.commit()
+                        # yozildi: session yopilayotganda cancel bo'lsa ham
+                        # qayta navbatga qo'yilmaydi
+                        batch.clear()
+                    except IntegrityError:
+                        # masalan task o'chirilgan: qolganlari bittalab yoziladi
+                        await db.rollback()
+                        await self._write_one_by_one(db, batch)
+            except BaseException:
+                # faqat yozilmagan qatorlar navbat boshiga qaytadi, yozilganlari
+                # _write_one_by_one da batchdan olib tashlangan
+                self.buffer[:0] = batch
+                raise
+            written += size
+        return written
+
+    async def _write_one_by_one(self, db: AsyncSession, batch: list[dict]):
+        # qator yozilgan (yoki tashlab yuborilgan) zahoti batchdan chiqadi
+        while batch:
+            try:
+                await db.execute(insert(AuditLog.__table__), [batch[0]])
+                await db.commit()
+            except IntegrityError as err:
+                await db.rollback()
+                logger.warning(f"Audit event skipped: {err.orig}")
+            batch.pop(0)
+
+    async def run(self):
+        self._batch_ready = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_ready.wait(), timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._batch_ready.clear()
+
+                try:
+                    await self.flush()
+                except Exception:
+                    # eventlar bufferda qoladi, keyingi flushda yoziladi
+                    logger.exception("Audit flush failed")
+        finally:
+            # shutdown: qolgan eventlarni yozib qo'yish
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Audit flush on shutdown failed")
+
+
+audit_writer = AuditLogWriter()
+
+
+def audit_history_query(**filters) -> Select:
+    return select(AuditLog).filter_by(**filters).options(*AUDIT_LOG_OPTIONS)
+
+
+async def paginate_audit_logs(
+    db: AsyncSession, query: Select, params: AuditLogFilterParams
+):
+    if params.event_type:
+        query = query.where(AuditLog.event_type == params.event_type)
+
+    logs, next_cursor = await keyset_page(
+        db, query, columns=(AuditLog.id,), limit=params.limit, cursor=params.cursor
+    )
+    return {"items": logs, "next_cursor": next_cursor}
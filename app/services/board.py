@@ -0,0 +1,161 @@
+from sqlalchemy import Select, event, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, object_session
+
+from app.cache import TTLCache
+from app.enums import Status, WSEventTypes
+from app.models import Project, Task
+from app.schemas.tasks import BoardResponse, BoardTaskResponse
+from app.services.outbox import enqueue_ws_event
+from app.services.queries import schema_load_options
+from app.settings import BOARD_CACHE_SIZE, BOARD_CACHE_TTL
+from app.utils import get_object_or_404
+from app.websocket.utils import worker_event_handlers
+
+
+BOARD_TASK_OPTIONS = schema_load_options(Task, BoardTaskResponse)
+
+# (project key, limit) -> BoardResponse, project_id bilan teglangan
+board_cache = TTLCache(maxsize=BOARD_CACHE_SIZE, ttl=BOARD_CACHE_TTL)
+# project_id -> invalidatsiyalar soni: o'qish paytida commit bo'lsa eski
+# natija cachega yozilmaydi. Faqat hozir o'qilayotgan (_board_readers da bor)
+# projectlar uchun saqlanadi, shuning uchun ikkalasi ham cheksiz o'smaydi.
+_board_versions: dict[int, int] = {}
+# project_id -> hozir ishlayotgan load_board soni
+_board_readers: dict[int, int] = {}
+
+
+def invalidate_board(db: AsyncSession | Session, project_id: int):
+    """
+    Drops the project's cached board in every worker when the transaction
+    commits. ORM changes to tasks do this automatically; bulk UPDATE/INSERT
+    statements that bypass the ORM must call it themselves.
+    """
+    db.info.setdefault("changed_boards", set()).add(project_id)
+    _enqueue_changed_boards(db)
+
+
+def _enqueue_changed_boards(db: AsyncSession | Session):
+    # boshqa workerlar uchun outbox orqali ws_events streamiga: har project
+    # uchun tranzaksiyada bittadan event
+    enqueued = db.info.setdefault("enqueued_boards", set())
+    for project_id in db.info.get("changed_boards", set()) - enqueued:
+        enqueue_ws_event(db, WSEventTypes.board_changed, project_id, {})
+        enqueued.add(project_id)
+
+
+def _drop_board(project_id: int, payload: dict | None = None):
+    if project_id in _board_readers:
+        _board_versions[project_id] = _board_versions.get(project_id, 0) + 1
+    board_cache.invalidate_tag(project_id)
+
+
+worker_event_handlers[WSEventTypes.board_changed] = _drop_board
+
+
+@event.listens_for(Task, "after_insert")
+@event.listens_for(Task, "after_update")
+@event.listens_for(Task, "after_delete")
+def _remember_changed_task(mapper, connection, target: Task):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_boards", set()).add(target.project_id)
+
+
+@event.listens_for(Project, "after_delete")
+def _remember_deleted_project(mapper, connection, target: Project):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_boards", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _enqueue_flushed_boards(session: Session, flush_context):
+    # flush ichida session.add mumkin emas; shu yerda qo'shilgan outbox
+    # qatorlari commit'dagi navbatdagi flushda yoziladi
+    _enqueue_changed_boards(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_boards(session: Session):
+    # bu worker darhol, boshqalari ws_events streamidan (_drop_board)
+    session.info.pop("enqueued_boards", None)
+    for project_id in session.info.pop("changed_boards", ()):
+        _drop_board(project_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_boards(session: Session):
+    session.info.pop("changed_boards", None)
+    session.info.pop("enqueued_boards", None)
+
+
+def board_query(project_id: int, limit: int) -> Select:
+    """
+    One statement for the whole board: a GROUP BY counts every status
+    column, and for each column a LATERAL subquery takes its first `limit`
+    task ids straight from the ix_tasks_project_id_status_updated_at_id
+    index, so only the tasks shown on the board are read from the heap.
+    """
+    counts = (
+        select(Task.status, func.count().label("total"))
+        .where(Task.project_id == project_id)
+        .group_by(Task.status)
+        .subquery()
+    )
+    column_task = aliased(Task)
+    top = (
+        select(column_task.id)
+        .where(
+            column_task.project_id == project_id,
+            column_task.status == counts.c.status,
+        )
+        .order_by(column_task.updated_at.desc(), column_task.id.desc())
+        .limit(limit)
+        .lateral()
+    )
+    return (
+        select(Task, counts.c.total)
+        .select_from(counts)
+        .join(top, true())
+        .join(Task, Task.id == top.c.id)
+        .order_by(Task.status, Task.updated_at.desc(), Task.id.desc())
+        .options(*BOARD_TASK_OPTIONS)
+    )
+
+
+async def load_board(db: AsyncSession, project_key: str, limit: int) -> BoardResponse:
+    # project key o'zgarmaydi, shuning uchun cache hitda bazaga umuman borilmaydi
+    cache_key = (project_key, limit)
+    board = board_cache.get(cache_key)
+    if board is not None:
+        return board
+
+    project = await get_object_or_404(db, Project, key=project_key)
+    project_id = project.id
+    version = _board_versions.get(project_id, 0)
+    _board_readers[project_id] = _board_readers.get(project_id, 0) + 1
+    try:
+        board = await _read_board(db, project, limit)
+        if _board_versions.get(project_id, 0) == version:
+            board_cache.set(cache_key, board, tag=project_id)
+    finally:
+        _board_readers[project_id] -= 1
+        if not _board_readers[project_id]:
+            del _board_readers[project_id]
+            _board_versions.pop(project_id, None)
+    return board
+
+
+async def _read_board(db: AsyncSession, project: Project, limit: int) -> BoardResponse:
+    columns = {
+        status: {"status": status, "count": 0, "tasks": []} for status in Status
+    }
+    for task, total in (await db.execute(board_query(project.id, limit))).all():
+        column = columns[Status(task.status)]
+        column["count"] = total
+        column["tasks"].append(
+            BoardTaskResponse.model_validate(task, from_attributes=True)
+        )
+
+    return BoardResponse(project_key=project.key, columns=list(columns.values()))
@@ -0,0 +1,389 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import Principal
+from app.enums import AuditEventType, Role, Status, WSEventTypes
+from app.models import Project, ProjectMember, Task, User
+from app.schemas.tasks import TaskBulkOperation
+from app.services.board import invalidate_board
+from app.services.notifications import (
+    create_notifications,
+    delete_task_notifications,
+)
+from app.services.outbox import enqueue_ws_event
+from app.services.tasks import TaskTransitionValidator, allocate_task_keys
+
+
+# notification matnida ko'rsatiladigan task keylar soni
+MESSAGE_KEYS_LIMIT = 20
+
+
+@dataclass
+class TaskBulkResult:
+    created: list[str] = field(default_factory=list)
+    moved: list[str] = field(default_factory=list)
+    assigned: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    # commitdan keyin await audit_writer.record(**event) bilan yoziladi
+    audit_events: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class _ProjectChanges:
+    created: list[dict] = field(default_factory=list)
+    moved: list[dict] = field(default_factory=list)
+    assigned: list[dict] = field(default_factory=list)
+    deleted: list[dict] = field(default_factory=list)
+    recipients: set[int] = field(default_factory=set)
+    # coalesced notification shu taskga bog'lanadi (o'chirilgan task emas)
+    notification_task_id: int | None = None
+
+
+def _operation_error(op, user: Principal, tasks, projects, assignees, members) -> str | None:
+    if op.action == "create":
+        if user.role != Role.manager:
+            return "Taskni faqat ProjectManger yarata oladi."
+        project = projects.get(op.project_key)
+        if project is None:
+            return f"Project {op.project_key} not found"
+        if user.id not in members[project.id]:
+            return "Task yaratayptgan manager project ga biriktirlmagan."
+        return None
+
+    task = tasks.get(op.key)
+    if task is None:
+        return f"Task {op.key} not found"
+
+    if op.action == "move":
+        if user.role == Role.developer and task.assignee_id != user.id:
+            return "Siz bu taskga biriktirilgan developer emassiz!"
+        if user.role == Role.tester and user.id not in members[task.project_id]:
+            return "Siz bu projectga a'zo emassiz!"
+        if not TaskTransitionValidator.can_move(Status(task.status), op.status, user.role):
+            return "Bu status o'zgarishiga ruxsat yo'q!"
+    elif op.action == "assign":
+        if user.role != Role.manager:
+            return "Sizda ruxsat yo'q"
+        if op.user_id not in assignees:
+            return f"User {op.user_id} not found"
+        if op.user_id not in members[task.project_id]:
+            return "Developer ushbu projectga a'zo emas!"
+        if task.assignee_id:
+            return "Task already has a developer assigned."
+    elif op.action == "delete":
+        if user.role != Role.manager:
+            return "Sizda ruxsat yo'q"
+        if task.reporter_id != user.id:
+            return "Bu taskni siz yaratmagansiz. Uni o'chiraolmaysiz."
+    return None
+
+
+def _key_list(keys: list[str]) -> str:
+    shown = ", ".join(keys[:MESSAGE_KEYS_LIMIT])
+    if len(keys) > MESSAGE_KEYS_LIMIT:
+        shown += f" (+{len(keys) - MESSAGE_KEYS_LIMIT})"
+    return shown
+
+
+def _notification_message(changes: _ProjectChanges) -> str:
+    lines = []
+    if changes.created:
+        keys = [item["task_key"] for item in changes.created]
+        lines.append(f"Yangi tasklar yaratildi: {_key_list(keys)}")
+    if changes.moved:
+        keys = [
+            f"{item['task_key']} {item['from_status']}->{item['to_status']}"
+            for item in changes.moved
+        ]
+        lines.append(f"Status changed: {_key_list(keys)}")
+    if changes.assigned:
+        keys = [
+            f"{item['task_key']} -> {item['developer_name']}"
+            for item in changes.assigned
+        ]
+        lines.append(f"Developer biriktirildi: {_key_list(keys)}")
+    if changes.deleted:
+        keys = [item["task_key"] for item in changes.deleted]
+        lines.append(f"Tasklar o'chirildi: {_key_list(keys)}")
+    return "\n".join(lines)
+
+
+async def run_bulk_operations(
+    db: AsyncSession, user: Principal, operations: list[TaskBulkOperation]
+) -> TaskBulkResult:
+    """
+    Applies many task creates, moves, assigns and deletes at once. Every
+    operation is checked against the same rules as the single-task endpoints
+    in one pass over data loaded with a fixed number of queries; if any
+    operation fails nothing is written and a 400 lists the failures by
+    index. Changes are then written with one statement per project, target
+    status or assignee, each project gets one coalesced notification per
+    recipient and one tasks_bulk_changed WebSocket event. The caller
+    commits and records `audit_events` afterwards.
+    """
+    task_keys = {op.key for op in operations if op.action != "create"}
+    project_keys = {op.project_key for op in operations if op.action == "create"}
+    assignee_ids = {op.user_id for op in operations if op.action == "assign"}
+
+    tasks = {}
+    if task_keys:
+        rows = await db.execute(
+            select(
+                Task.id,
+                Task.key,
+                Task.project_id,
+                Task.status,
+                Task.assignee_id,
+                Task.reporter_id,
+            ).where(Task.key.in_(task_keys))
+        )
+        tasks = {row.key: row for row in rows}
+
+    projects = {}
+    if project_keys:
+        projects = {
+            project.key: project
+            for project in await db.scalars(
+                select(Project).where(Project.key.in_(project_keys))
+            )
+        }
+
+    assignees = {}
+    if assignee_ids:
+        rows = await db.execute(
+            select(User.id, User.fullname).where(User.id.in_(assignee_ids))
+        )
+        assignees = {row.id: row.fullname for row in rows}
+
+    # a'zolik tekshiruvlari va "butun project" recipientlari uchun bitta query
+    members: dict[int, set[int]] = defaultdict(set)
+    project_ids = {task.project_id for task in tasks.values()}
+    project_ids |= {project.id for project in projects.values()}
+    if project_ids:
+        rows = await db.execute(
+            select(ProjectMember.project_id, ProjectMember.user_id).where(
+                ProjectMember.project_id.in_(project_ids)
+            )
+        )
+        for row in rows:
+            members[row.project_id].add(row.user_id)
+
+    errors = []
+    seen_keys = set()
+    for index, op in enumerate(operations):
+        # bitta so'rov ichida natija operatsiyalar tartibiga bog'liq bo'lmasligi uchun
+        if op.action != "create" and op.key in seen_keys:
+            detail = "Task bitta so'rovda faqat bir marta o'zgartiriladi."
+        else:
+            detail = _operation_error(op, user, tasks, projects, assignees, members)
+        if op.action != "create":
+            seen_keys.add(op.key)
+        if detail is not None:
+            errors.append({"index": index, "detail": detail})
+    if errors:
+        raise HTTPException(400, errors)
+
+    result = TaskBulkResult()
+    changes: dict[int, _ProjectChanges] = defaultdict(_ProjectChanges)
+
+    # create: har bir project uchun bitta key bloki, hammasi bitta INSERT
+    creates_by_project = defaultdict(list)
+    for op in operations:
+        if op.action == "create":
+            creates_by_project[op.project_key].append(op)
+
+    task_rows = []
+    # project qatorlari lock qilinadi: deadlock bo'lmasligi uchun id tartibida
+    for project in sorted(
+        (projects[key] for key in creates_by_project), key=lambda p: p.id
+    ):
+        project_ops = creates_by_project[project.key]
+        keys = await allocate_task_keys(db, project, len(project_ops))
+        for key, op in zip(keys, project_ops):
+            task_rows.append(
+                {
+                    "key": key,
+                    "summary": op.summary,
+                    "description": op.description,
+                    "priority": op.priority,
+                    "due_date": op.due_date,
+                    "project_id": project.id,
+                    "status": Status.BACKLOG,
+                    "reporter_id": user.id,
+                }
+            )
+        changes[project.id].recipients.add(project.owner_id)
+
+    if task_rows:
+        # executemany: statement bir marta compile bo'lib cachelanadi; Core
+        # insert None description'li qatorlarni ham bitta VALUES'da yuboradi
+        created = await db.execute(
+            insert(Task.__table__).returning(Task.id, Task.key),
+            task_rows,
+        )
+        created_ids = {row.key: row.id for row in created}
+        for row in task_rows:
+            task_id = created_ids[row["key"]]
+            project_changes = changes[row["project_id"]]
+            project_changes.created.append(
+                {
+                    "task_id": task_id,
+                    "task_key": row["key"],
+                    "summary": row["summary"],
+                    "priority": row["priority"].value,
+                    "status": Status.BACKLOG.value,
+                }
+            )
+            project_changes.notification_task_id = (
+                project_changes.notification_task_id or task_id
+            )
+            result.created.append(row["key"])
+            result.audit_events.append(
+                {
+                    "event_type": AuditEventType.task_created,
+                    "user_id": user.id,
+                    "task_id": task_id,
+                    "project_id": row["project_id"],
+                    "action": f"Task {row['summary']} created",
+                    "to_status": Status.BACKLOG.value,
+                }
+            )
+
+    # move: har bir yangi status uchun bitta UPDATE
+    moves_by_status = defaultdict(list)
+    for op in operations:
+        if op.action != "move":
+            continue
+        task = tasks[op.key]
+        moves_by_status[op.status].append(task.id)
+
+        project_changes = changes[task.project_id]
+        if op.status == Status.TODO:
+            project_changes.recipients.add(task.assignee_id)
+        elif op.status == Status.IN_PROGRESS:
+            project_changes.recipients.add(task.reporter_id)
+        elif op.status in (Status.READY_FOR_TESTING, Status.DONE):
+            project_changes.recipients |= members[task.project_id]
+        project_changes.moved.append(
+            {
+                "task_id": task.id,
+                "task_key": task.key,
+                "from_status": task.status,
+                "to_status": op.status.value,
+            }
+        )
+        project_changes.notification_task_id = (
+            project_changes.notification_task_id or task.id
+        )
+        result.moved.append(task.key)
+        result.audit_events.append(
+            {
+                "event_type": AuditEventType.status_changed,
+                "user_id": user.id,
+                "task_id": task.id,
+                "project_id": task.project_id,
+                "action": f"Status changed: {task.status}->{op.status.value}#",
+                "from_status": task.status,
+                "to_status": op.status.value,
+            }
+        )
+
+    for status, task_ids in moves_by_status.items():
+        await db.execute(
+            update(Task).where(Task.id.in_(sorted(task_ids))).values(status=status)
+        )
+
+    # assign: har bir developer uchun bitta UPDATE
+    assigns_by_user = defaultdict(list)
+    for op in operations:
+        if op.action != "assign":
+            continue
+        task = tasks[op.key]
+        assigns_by_user[op.user_id].append(task.id)
+
+        project_changes = changes[task.project_id]
+        project_changes.recipients.add(op.user_id)
+        project_changes.assigned.append(
+            {
+                "task_id": task.id,
+                "task_key": task.key,
+                "developer_id": op.user_id,
+                "developer_name": assignees[op.user_id],
+            }
+        )
+        project_changes.notification_task_id = (
+            project_changes.notification_task_id or task.id
+        )
+        result.assigned.append(task.key)
+        result.audit_events.append(
+            {
+                "event_type": AuditEventType.developer_assigned,
+                "user_id": user.id,
+                "task_id": task.id,
+                "project_id": task.project_id,
+                "action": f"Developer {assignees[op.user_id]} assigneed to task {task.key}",
+                "from_status": task.status,
+                "to_status": Status.TODO.value,
+                "payload": {"developer_id": op.user_id},
+            }
+        )
+
+    for assignee_id, task_ids in assigns_by_user.items():
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(sorted(task_ids)))
+            .values(assignee_id=assignee_id, status=Status.TODO)
+        )
+
+    # delete: bitta DELETE, comment/notification/auditlog FK CASCADE bilan ketadi;
+    # o'qilmagan notificationlar oldinroq unread counter bilan birga o'chiriladi
+    deleted_ids = []
+    for op in operations:
+        if op.action != "delete":
+            continue
+        task = tasks[op.key]
+        deleted_ids.append(task.id)
+        changes[task.project_id].deleted.append(
+            {"task_id": task.id, "task_key": task.key}
+        )
+        result.deleted.append(task.key)
+
+    if deleted_ids:
+        deleted_ids.sort()
+        await delete_task_notifications(db, deleted_ids)
+        await db.execute(delete(Task).where(Task.id.in_(deleted_ids)))
+
+    for project_id, project_changes in changes.items():
+        # Core statementlar ORM eventlarini chaqirmaydi
+        invalidate_board(db, project_id)
+
+        if project_changes.notification_task_id is not None:
+            await create_notifications(
+                db,
+                sorted(filter(None, project_changes.recipients)),
+                message=_notification_message(project_changes),
+                sender_id=user.id,
+                task_id=project_changes.notification_task_id,
+                project_id=project_id,
+            )
+
+        enqueue_ws_event(
+            db,
+            event_type=WSEventTypes.tasks_bulk_changed,
+            project_id=project_id,
+            payload={
+                "type": WSEventTypes.tasks_bulk_changed,
+                "project_id": project_id,
+                "user_id": user.id,
+                "created": project_changes.created,
+                "moved": project_changes.moved,
+                "assigned": project_changes.assigned,
+                "deleted": project_changes.deleted,
+            },
+        )
+
+    return result
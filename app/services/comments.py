@@ -0,0 +1,78 @@
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums import WSEventTypes
+from app.models import Comment, Task
+from app.schemas.comments import CommentFilterParams, CommentResponse
+from app.services.outbox import enqueue_ws_event
+from app.services.queries import keyset_page, schema_load_options
+
+
+COMMENT_OPTIONS = schema_load_options(Comment, CommentResponse)
+
+
+def comment_list_query(task_id: int) -> Select:
+    return select(Comment).where(Comment.task_id == task_id).options(*COMMENT_OPTIONS)
+
+
+async def paginate_comments(
+    db: AsyncSession, task_id: int, params: CommentFilterParams
+):
+    # thread eskidan yangiga o'qiladi, (task_id, id) indexidan
+    comments, next_cursor = await keyset_page(
+        db,
+        comment_list_query(task_id),
+        columns=(Comment.id,),
+        limit=params.limit,
+        cursor=params.cursor,
+        descending=False,
+    )
+    return {"items": comments, "next_cursor": next_cursor}
+
+
+async def _change_comments_count(db: AsyncSession, task_id: int, delta: int):
+    await db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            comments_count=Task.comments_count + delta,
+            # comment task'ning o'zini o'zgartirmaydi (board tartibi saqlanadi)
+            updated_at=Task.updated_at,
+        )
+    )
+
+
+async def create_comment(
+    db: AsyncSession, task: Task, user_id: int, content: str
+) -> Comment:
+    """
+    Adds a comment, bumps the task's comments_count and queues a
+    comment_created WebSocket event for the project, all in the caller's
+    transaction. The caller commits.
+    """
+    comment = Comment(task_id=task.id, user_id=user_id, content=content)
+    db.add(comment)
+    await db.flush()
+    await _change_comments_count(db, task.id, 1)
+
+    enqueue_ws_event(
+        db,
+        event_type=WSEventTypes.comment_created,
+        project_id=task.project_id,
+        payload={
+            "type": WSEventTypes.comment_created,
+            "comment_id": comment.id,
+            "task_id": task.id,
+            "task_key": task.key,
+            "project_id": task.project_id,
+            "user_id": user_id,
+            # uzun commentlar to'liq holda clientlar API orqali oladi
+            "content": content[:200],
+        },
+    )
+    return comment
+
+
+async def delete_comment(db: AsyncSession, comment: Comment):
+    await db.delete(comment)
+    await _change_comments_count(db, comment.task_id, -1)
@@ -0,0 +1,221 @@
+import csv
+import json
+import os
+from typing import Iterator, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.enums import AuditEventType, Status, WSEventTypes
+from app.models import Project, Task
+from app.schemas.tasks import TaskCreateRequest
+from app.services.audit import audit_writer
+from app.services.board import invalidate_board
+from app.services.notifications import create_notifications
+from app.services.outbox import enqueue_ws_event
+from app.services.tasks import allocate_task_keys
+from app.settings import IMPORT_BATCH_SIZE, IMPORT_MAX_ERRORS
+
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+CSV_REQUIRED_COLUMNS = {"summary", "priority", "due_date"}
+
+# (qator raqami, qator yoki None, xato yoki None)
+ParsedRow = tuple[int, dict | None, str | None]
+
+
+def import_format(filename: str | None) -> str | None:
+    return IMPORT_FORMATS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def _csv_rows(stream: TextIO) -> Iterator[ParsedRow]:
+    reader = csv.DictReader(stream)
+    missing = CSV_REQUIRED_COLUMNS - set(reader.fieldnames or ())
+    if missing:
+        yield 1, None, f"CSV headerda ustunlar yo'q: {', '.join(sorted(missing))}"
+        return
+
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, "Qatorda headerdagidan ko'p ustun bor"
+            continue
+        # bo'sh katakcha qiymat berilmagan deb hisoblanadi
+        yield reader.line_num, {k: v for k, v in row.items() if v}, None
+
+
+def _ndjson_rows(stream: TextIO) -> Iterator[ParsedRow]:
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as err:
+            yield line, None, f"JSON xato: {err}"
+            continue
+        if not isinstance(row, dict):
+            yield line, None, "Qator JSON object bo'lishi kerak"
+            continue
+        yield line, row, None
+
+
+def _validation_message(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in err.errors()
+    )
+
+
+async def _insert_batch(
+    db: AsyncSession, project: Project, reporter_id: int, batch: list[TaskCreateRequest]
+) -> list[tuple[int, str]]:
+    # bitta key bloki, tasklar multi-row INSERT bilan
+    keys = await allocate_task_keys(db, project, len(batch))
+    task_rows = [
+        {
+            "key": key,
+            "summary": data.summary,
+            "description": data.description,
+            "priority": data.priority,
+            "due_date": data.due_date,
+            "project_id": project.id,
+            "status": Status.BACKLOG,
+            "reporter_id": reporter_id,
+        }
+        for key, data in zip(keys, batch)
+    ]
+    # executemany: statement bir marta compile bo'lib cachelanadi, SQLAlchemy
+    # qatorlarni o'zi multi-row VALUES qilib yuboradi (insertmanyvalues).
+    # Core insert: ORM None qiymatli kalitlarni tashlab batchni bo'lib yuboradi
+    created = await db.execute(
+        insert(Task.__table__).returning(Task.id, Task.key),
+        task_rows,
+    )
+    task_ids = {row.key: row.id for row in created}
+
+    # Core INSERT ORM eventlarini chaqirmaydi
+    invalidate_board(db, project.id)
+    enqueue_ws_event(
+        db,
+        event_type=WSEventTypes.tasks_imported,
+        project_id=project.id,
+        payload={
+            "type": WSEventTypes.tasks_imported,
+            "project_id": project.id,
+            "user_id": reporter_id,
+            "count": len(keys),
+            "first_key": keys[0],
+            "last_key": keys[-1],
+        },
+    )
+    await db.commit()
+
+    # AuditLog boshqa task yaratishlar kabi commitdan keyin audit_writer orqali
+    for row in task_rows:
+        await audit_writer.record(
+            event_type=AuditEventType.task_created,
+            user_id=reporter_id,
+            task_id=task_ids[row["key"]],
+            project_id=project.id,
+            action=f"Task {row['summary']} created",
+            to_status=Status.BACKLOG.value,
+            payload={"source": "import"},
+        )
+
+    return [(task_ids[key], key) for key in keys]
+
+
+async def import_tasks(
+    db: AsyncSession,
+    project: Project,
+    reporter_id: int,
+    stream: TextIO,
+    file_format: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> dict:
+    """
+    Imports tasks into `project` from a CSV (header row with summary,
+    priority, due_date and optional description / project_key columns) or
+    NDJSON stream. The stream is read row by row and every row is validated
+    with TaskCreateRequest; valid rows are inserted `batch_size` at a time,
+    each batch with one block of keys and committed on its own, so the
+    project's task_seq row is never locked for the whole import and memory
+    stays bounded by one batch. Reading, parsing and validating a batch runs
+    in the threadpool, so a large file does not block the event loop. Invalid
+    rows are skipped and reported by line number (the first
+    IMPORT_MAX_ERRORS of them).
+    """
+    parse = _csv_rows if file_format == "csv" else _ndjson_rows
+    report = {
+        "imported": 0,
+        "failed": 0,
+        "first_key": None,
+        "last_key": None,
+        "errors": [],
+    }
+    first_task_id = None
+    project_key = project.key
+    rows = parse(stream)
+    line = 0
+
+    def fail(line: int, detail: str):
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line, "detail": detail})
+
+    def read_batch() -> list[TaskCreateRequest]:
+        # threadda ishlaydi (ORM obyektlariga tegmaydi); rows generatori
+        # keyingi chaqiruvda to'xtagan joyidan davom etadi
+        nonlocal line
+        batch = []
+        try:
+            for line, row, error in rows:
+                if error is None:
+                    try:
+                        data = TaskCreateRequest.model_validate(
+                            {"project_key": project_key, **row}
+                        )
+                    except ValidationError as err:
+                        error = _validation_message(err)
+                    else:
+                        if data.project_key != project_key:
+                            error = f"project_key {project_key} bo'lishi kerak"
+                if error is not None:
+                    fail(line, error)
+                    continue
+
+                batch.append(data)
+                if len(batch) >= batch_size:
+                    break
+        except (UnicodeDecodeError, csv.Error) as err:
+            # faylning qolgan qismini ishonchli o'qib bo'lmaydi
+            fail(line + 1, f"Fayl o'qilmadi: {err}")
+        return batch
+
+    while True:
+        batch = await run_in_threadpool(read_batch)
+        if batch:
+            created = await _insert_batch(db, project, reporter_id, batch)
+            first_task_id = first_task_id or created[0][0]
+            report["imported"] += len(created)
+            report["first_key"] = report["first_key"] or created[0][1]
+            report["last_key"] = created[-1][1]
+        if len(batch) < batch_size:
+            break
+
+    if first_task_id is not None:
+        await create_notifications(
+            db,
+            [project.owner_id],
+            message=(
+                f"{report['imported']} ta task import qilindi: "
+                f"{report['first_key']}..{report['last_key']}"
+            ),
+            sender_id=reporter_id,
+            task_id=first_task_id,
+            project_id=project.id,
+        )
+        await db.commit()
+
+    return report
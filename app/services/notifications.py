@@ -0,0 +1,167 @@
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import Select, delete, false, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Notification, ProjectMember, Task, User
+from app.schemas.notifications import NotificationFilterParams, NotificationListReponse
+from app.services.queries import keyset_page, schema_load_options
+
+
+NOTIFICATION_LIST_OPTIONS = schema_load_options(Notification, NotificationListReponse)
+
+
+def project_member_ids(project_id: int) -> Select:
+    return select(ProjectMember.user_id).where(ProjectMember.project_id == project_id)
+
+
+def notification_inbox_query(user_id: int, unread_only: bool = False) -> Select:
+    query = (
+        select(Notification)
+        .where(Notification.recipient_id == user_id)
+        .options(*NOTIFICATION_LIST_OPTIONS)
+    )
+    if unread_only:
+        query = query.where(Notification.is_read == false())
+    return query
+
+
+async def paginate_notifications(
+    db: AsyncSession, query: Select, params: NotificationFilterParams
+):
+    # eng yangilari birinchi, (recipient_id, id) indexidan sahifalab o'qiladi
+    notifications, next_cursor = await keyset_page(
+        db, query, columns=(Notification.id,), limit=params.limit, cursor=params.cursor
+    )
+    return {"items": notifications, "next_cursor": next_cursor}
+
+
+async def _change_unread_count(db: AsyncSession, deltas: dict[int, int]):
+    # bir xil o'zgarishdagi userlar bitta UPDATE bilan yangilanadi
+    by_delta: dict[int, list[int]] = {}
+    for user_id, delta in deltas.items():
+        by_delta.setdefault(delta, []).append(user_id)
+
+    for delta, user_ids in by_delta.items():
+        await db.execute(
+            update(User)
+            .where(User.id.in_(sorted(user_ids)))
+            .values(
+                unread_notifications_count=func.greatest(
+                    User.unread_notifications_count + delta, 0
+                ),
+                # counter o'zgarishi user profilini yangilash emas
+                updated_at=User.updated_at,
+            )
+        )
+
+
+async def create_notifications(
+    db: AsyncSession,
+    recipients: Select | Iterable[int],
+    message: str,
+    sender_id: int,
+    task_id: int,
+    project_id: int,
+) -> list[int]:
+    """
+    Writes one notification per recipient with a single INSERT ... RETURNING.
+    `recipients` is either a list of user ids (multi-row VALUES) or a SELECT of
+    user ids, which is inlined as INSERT ... SELECT so the recipients are never
+    loaded into Python. Recipients' unread counters are bumped in the same
+    transaction. Returns the ids of the new notifications.
+    """
+    columns = ["recipient_id", "message", "sender_id", "task_id", "project_id"]
+
+    if isinstance(recipients, Select):
+        recipient_rows = recipients.subquery()
+        statement = insert(Notification).from_select(
+            columns,
+            select(
+                recipient_rows.c[0],
+                literal(message),
+                literal(sender_id),
+                literal(task_id),
+                literal(project_id),
+            ),
+        )
+    else:
+        recipient_ids = [recipient for recipient in recipients if recipient]
+        if not recipient_ids:
+            return []
+
+        statement = insert(Notification).values(
+            [
+                {
+                    "recipient_id": recipient,
+                    "message": message,
+                    "sender_id": sender_id,
+                    "task_id": task_id,
+                    "project_id": project_id,
+                }
+                for recipient in recipient_ids
+            ]
+        )
+
+    rows = (
+        await db.execute(
+            statement.returning(Notification.id, Notification.recipient_id)
+        )
+    ).all()
+    await _change_unread_count(db, Counter(row.recipient_id for row in rows))
+
+    return [row.id for row in rows]
+
+
+async def delete_task_notifications(db: AsyncSession, task_ids: list[int]):
+    """
+    Call before deleting tasks. The FK cascade removes their notifications
+    but not the recipients' unread counters, so the unread ones are deleted
+    here with one DELETE ... RETURNING grouped per recipient and the
+    counters lowered in the same transaction. The task rows are locked
+    first, so no new notification for them can be inserted in between.
+    """
+    await db.execute(select(Task.id).where(Task.id.in_(task_ids)).with_for_update())
+
+    deleted = (
+        delete(Notification)
+        .where(Notification.task_id.in_(task_ids), Notification.is_read == false())
+        .returning(Notification.recipient_id)
+        .cte("deleted")
+    )
+    rows = await db.execute(
+        select(deleted.c.recipient_id, func.count()).group_by(deleted.c.recipient_id)
+    )
+    await _change_unread_count(
+        db, {recipient_id: -count for recipient_id, count in rows}
+    )
+
+
+async def mark_notifications_read(
+    db: AsyncSession,
+    user_id: int,
+    notification_id: int | None = None,
+    up_to_id: int | None = None,
+) -> int:
+    """
+    Marks the user's unread notifications as read with one UPDATE: a single
+    one, everything up to `up_to_id`, or all of them. Returns how many rows
+    changed and lowers the unread counter by the same amount.
+    """
+    statement = update(Notification).where(
+        Notification.recipient_id == user_id, Notification.is_read == false()
+    )
+    if notification_id is not None:
+        statement = statement.where(Notification.id == notification_id)
+    if up_to_id is not None:
+        statement = statement.where(Notification.id <= up_to_id)
+
+    changed = len(
+        (await db.scalars(statement.values(is_read=True).returning(Notification.id)))
+        .all()
+    )
+    if changed:
+        await _change_unread_count(db, {user_id: -changed})
+
+    return changed
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import AsyncSessionLocal
+from app.models import OutboxEvent
+from app.settings import OUTBOX_BATCH_SIZE, OUTBOX_MAX_BACKOFF, OUTBOX_POLL_INTERVAL
+from app.websocket.utils import publish_ws_events
+
+logger = logging.getLogger(__name__)
+
+# dispatcher ishlayotgan event loop'da yaratiladi
+_wakeup: asyncio.Event | None = None
+
+
+def enqueue_ws_event(db: AsyncSession, event_type: str, project_id: int, payload: dict):
+    """
+    Adds a WebSocket event to the current transaction. It is published only
+    after the transaction commits, and never if it rolls back.
+    """
+    db.add(OutboxEvent(event_type=event_type, project_id=project_id, payload=payload))
+    db.info["outbox_pending"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session):
+    if session.info.pop("outbox_pending", False) and _wakeup is not None:
+        _wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session: Session):
+    session.info.pop("outbox_pending", None)
+
+
+async def drain_outbox(db: AsyncSession, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Publishes up to `batch_size` committed events grouped per project and
+    deletes them. SKIP LOCKED lets every worker drain the table at once
+    without publishing the same row twice.
+    """
+    rows = (
+        await db.scalars(
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+
+    if not rows:
+        await db.rollback()
+        return 0
+
+    batches: dict[int, list[dict]] = defaultdict(list)
+    for row in rows:
+        batches[row.project_id].append(
+            {"event_type": row.event_type, "payload": row.payload}
+        )
+
+    await publish_ws_events(batches)
+
+    await db.execute(
+        delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows]))
+    )
+    await db.commit()
+    return len(rows)
+
+
+async def run_outbox_dispatcher():
+    global _wakeup
+    _wakeup = asyncio.Event()
+    backoff = OUTBOX_POLL_INTERVAL
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                published = await drain_outbox(db)
+        except Exception:
+            # Postgres to'xtaganda asyncpg ConnectionRefusedError (OSError)
+            # beradi, u SQLAlchemyError emas: dispatcher hech qachon to'xtamaydi.
+            # Eventlar jadvalda qoladi, keyingi urinishda yuboriladi.
+            logger.exception(f"Outbox dispatch failed, retrying in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, OUTBOX_MAX_BACKOFF)
+            continue
+        backoff = OUTBOX_POLL_INTERVAL
+
+        if published >= OUTBOX_BATCH_SIZE:
+            continue
+
+        # commit signalini yoki boshqa workerlar qoldirgan eventlarni kutish
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
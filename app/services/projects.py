@@ -1,14 +1,56 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Project
+from app.models import Project, ProjectKeyCounter, ProjectMember
+from app.schemas.projects import ProjectMemmberResponse, ProjectResponse
+from app.services.queries import schema_load_options
 
 
-def generate_project_key(db: Session, name: str) -> str:
-    generated_name = name.upper()[:3]
+PROJECT_OPTIONS = schema_load_options(Project, ProjectResponse)
+PROJECT_MEMBER_OPTIONS = schema_load_options(ProjectMember, ProjectMemmberResponse)
 
-    how_many_in_db = db.query(Project).filter(Project.key == generated_name).count()
 
-    if how_many_in_db > 0:
-        generated_name += str(how_many_in_db + 1)
+def project_list_query() -> Select:
+    return select(Project).options(*PROJECT_OPTIONS)
 
-    return generated_name
+
+def project_member_list_query(project_id: int) -> Select:
+    return (
+        select(ProjectMember)
+        .where(ProjectMember.project_id == project_id)
+        .options(*PROJECT_MEMBER_OPTIONS)
+    )
+
+
+async def _next_prefix_value(db: AsyncSession, prefix: str) -> int:
+    statement = (
+        insert(ProjectKeyCounter)
+        .values(prefix=prefix, last_value=1)
+        .on_conflict_do_update(
+            index_elements=[ProjectKeyCounter.prefix],
+            set_={"last_value": ProjectKeyCounter.last_value + 1},
+        )
+        .returning(ProjectKeyCounter.last_value)
+    )
+    return await db.scalar(statement)
+
+
+async def generate_project_key(db: AsyncSession, name: str) -> str:
+    """
+    Hands out ABC, ABC2, ABC3, ... from a per-prefix counter. The upsert locks
+    the counter row until commit, so parallel creates with the same prefix get
+    different values. Keys that are already taken (legacy keys, or "AB1" + 2
+    clashing with "AB" + 12) are skipped.
+    """
+    prefix = name.upper()[:3]
+
+    while True:
+        value = await _next_prefix_value(db, prefix)
+        generated_name = prefix if value == 1 else f"{prefix}{value}"
+
+        is_taken = await db.scalar(
+            select(Project.id).where(Project.key == generated_name)
+        )
+        if not is_taken:
+            return generated_name
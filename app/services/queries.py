@@ -0,0 +1,106 @@
+import json
+import base64
+from datetime import datetime
+from types import UnionType
+from typing import Union, get_args, get_origin
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def _nested_schema(annotation) -> type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    if get_origin(annotation) in (Union, UnionType, list):
+        for arg in get_args(annotation):
+            schema = _nested_schema(arg)
+            if schema:
+                return schema
+
+    return None
+
+
+def schema_load_options(model, schema: type[BaseModel]) -> list:
+    """
+    Builds loader options for exactly the relationships a response schema
+    serializes, so listing N rows costs a fixed number of queries instead of
+    one lazy SELECT per row and relationship.
+
+    Many-to-one relationships are joined into the main query, collections are
+    loaded with one extra SELECT ... IN per relationship.
+    """
+    relationships = inspect(model).relationships
+    options = []
+
+    for name, field in schema.model_fields.items():
+        relationship = relationships.get(name)
+        nested = _nested_schema(field.annotation)
+
+        if relationship is None or nested is None:
+            continue
+
+        attribute = getattr(model, name)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+
+        nested_options = schema_load_options(relationship.mapper.class_, nested)
+        if nested_options:
+            loader = loader.options(*nested_options)
+
+        options.append(loader)
+
+    return options
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, columns: tuple) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        decoded = []
+        for column, value in zip(columns, values, strict=True):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        return decoded
+    except (ValueError, TypeError) as err:
+        raise HTTPException(400, "Invalid cursor") from err
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    columns: tuple,
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = True,
+) -> tuple[list, str | None]:
+    """
+    Returns one page of `query` ordered by `columns` plus the cursor of the
+    next page. The page starts right after the cursor row, so with an index on
+    `columns` every page costs the same no matter how deep the client scrolls.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if descending:
+            query = query.where(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.where(tuple_(*columns) > tuple_(*values))
+
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    rows = (await db.scalars(query.order_by(*order_by).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*(getattr(rows[-1], c.key) for c in columns))
+
+    return rows, next_cursor
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.settings import (
+    AUDITLOG_RETENTION_DAYS,
+    NOTIFICATION_RETENTION_DAYS,
+    RETENTION_BATCH_SIZE,
+)
+
+
+# O'qilmagan notificationlar ko'chirilmaydi: unread counter va inbox ularga tayanadi
+ARCHIVE_NOTIFICATIONS_SQL = text(
+    """
+    WITH moved AS (
+        DELETE FROM notifications
+        WHERE id IN (
+            SELECT id FROM notifications
+            WHERE created_at < :cutoff AND is_read = true
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, message, recipient_id, sender_id, task_id, project_id,
+                  created_at
+    )
+    INSERT INTO notifications_archive (id, message, recipient_id, sender_id,
+                                       task_id, project_id, created_at)
+    SELECT id, message, recipient_id, sender_id, task_id, project_id, created_at
+    FROM moved
+    """
+)
+
+ARCHIVE_AUDITLOGS_SQL = text(
+    """
+    WITH moved AS (
+        DELETE FROM auditlogs
+        WHERE id IN (
+            SELECT id FROM auditlogs
+            WHERE timestamp < :cutoff
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, action, event_type, from_status, to_status, payload,
+                  timestamp, user_id, task_id, project_id
+    )
+    INSERT INTO auditlogs_archive (id, action, event_type, from_status, to_status,
+                                   payload, timestamp, user_id, task_id, project_id)
+    SELECT id, action, event_type, from_status, to_status, payload, timestamp,
+           user_id, task_id, project_id
+    FROM moved
+    """
+)
+
+
+def _archive(db: Session, statement, cutoff: datetime, batch_size: int) -> int:
+    # har bir batch alohida commit: lock va WAL qisqa, hot jadval bloklanmaydi
+    moved = 0
+    while True:
+        result = db.execute(statement, {"cutoff": cutoff, "batch_size": batch_size})
+        db.commit()
+        moved += result.rowcount
+        if result.rowcount < batch_size:
+            return moved
+
+
+def archive_expired_rows(
+    db: Session,
+    notification_days: int = NOTIFICATION_RETENTION_DAYS,
+    auditlog_days: int = AUDITLOG_RETENTION_DAYS,
+    batch_size: int = RETENTION_BATCH_SIZE,
+) -> dict:
+    """
+    Moves read notifications and audit logs older than their retention window
+    into the archive tables in batches, so the hot tables and their indexes
+    only hold recent rows no matter how long the app has been running.
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        "notifications": _archive(
+            db,
+            ARCHIVE_NOTIFICATIONS_SQL,
+            now - timedelta(days=notification_days),
+            batch_size,
+        ),
+        "auditlogs": _archive(
+            db, ARCHIVE_AUDITLOGS_SQL, now - timedelta(days=auditlog_days), batch_size
+        ),
+    }
@@ -1,15 +1,149 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, Select, Update, func, select, tuple_, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Project, Task
+from app.models import SEARCH_CONFIG, Comment, Project, Task
 from app.enums import Role, Status
+from app.schemas.tasks import TaskFilterParams, TaskListResponse, TaskSearchParams
+from app.services.queries import (
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    schema_load_options,
+)
 
 
-def generated_task_key(db: Session, project: Project) -> str:
-    tasks_count = db.query(Task).filter(Task.project_id == project.id).count()
+TASK_LIST_OPTIONS = schema_load_options(Task, TaskListResponse)
 
-    generated_name = project.key + "-" + str(tasks_count + 1)
 
-    return generated_name
+def task_list_query() -> Select:
+    return select(Task).options(*TASK_LIST_OPTIONS)
+
+
+def filter_tasks(query: Select, params: TaskFilterParams) -> Select:
+    if params.status:
+        query = query.where(Task.status == params.status)
+    if params.priority:
+        query = query.where(Task.priority == params.priority)
+    if params.assignee_id:
+        query = query.where(Task.assignee_id == params.assignee_id)
+    if params.due_from:
+        query = query.where(Task.due_date >= params.due_from)
+    if params.due_to:
+        query = query.where(Task.due_date <= params.due_to)
+    return query
+
+
+async def paginate_tasks(db: AsyncSession, query: Select, params: TaskFilterParams):
+    if params.order_by == "id":
+        columns = (Task.id,)
+    else:
+        columns = (Task.updated_at, Task.id)
+
+    tasks, next_cursor = await keyset_page(
+        db,
+        filter_tasks(query, params),
+        columns=columns,
+        limit=params.limit,
+        cursor=params.cursor,
+    )
+    return {"items": tasks, "next_cursor": next_cursor}
+
+
+def _search_hits(params: TaskSearchParams, project_id: int | None):
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, params.q)
+
+    task_hits = select(
+        Task.id.label("task_id"),
+        func.ts_rank(Task.search_vector, tsquery, type_=Float).label("rank"),
+    ).where(Task.search_vector.bool_op("@@")(tsquery))
+
+    comment_hits = select(
+        Comment.task_id,
+        func.ts_rank(Comment.search_vector, tsquery, type_=Float),
+    ).where(Comment.search_vector.bool_op("@@")(tsquery))
+
+    if project_id is not None:
+        task_hits = task_hits.where(Task.project_id == project_id)
+        comment_hits = comment_hits.join(Task, Task.id == Comment.task_id).where(
+            Task.project_id == project_id
+        )
+
+    # task bir nechta joyda topilsa eng yaxshi moslik hisoblanadi
+    hits = union_all(task_hits, comment_hits).subquery()
+    return (
+        select(hits.c.task_id, func.max(hits.c.rank).label("rank"))
+        .group_by(hits.c.task_id)
+        .subquery()
+    )
+
+
+async def search_tasks(
+    db: AsyncSession, params: TaskSearchParams, project_id: int | None = None
+):
+    """
+    Full-text search over task summaries, descriptions and comments using
+    the GIN-indexed search_vector columns. `q` uses web search syntax
+    ("exact phrase", or, -exclude). Results are ordered by rank, best
+    first, and paginated with a (rank, id) cursor.
+    """
+    ranked = _search_hits(params, project_id)
+    columns = (ranked.c.rank, ranked.c.task_id)
+
+    # avval faqat (rank, task_id) sahifasi, keyin shu tasklargina yuklanadi
+    page = select(*columns)
+    if params.cursor:
+        values = decode_cursor(params.cursor, columns)
+        page = page.where(tuple_(*columns) < tuple_(*values))
+    page = (
+        page.order_by(ranked.c.rank.desc(), ranked.c.task_id.desc())
+        .limit(params.limit + 1)
+        .subquery()
+    )
+
+    rows = (
+        await db.execute(
+            select(Task, page.c.rank)
+            .join(page, page.c.task_id == Task.id)
+            .order_by(page.c.rank.desc(), Task.id.desc())
+            .options(*TASK_LIST_OPTIONS)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].Task.id)
+
+    return {
+        "items": [{"rank": row.rank, "task": row.Task} for row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def reserve_task_seq(project_id: int, count: int = 1) -> Update:
+    """
+    Atomically moves the project's counter forward by `count` and returns the
+    new value. The row lock is held until commit, so parallel creates in the
+    same project get distinct numbers and deleted keys are never reused.
+    """
+    return (
+        update(Project)
+        .where(Project.id == project_id)
+        .values(task_seq=Project.task_seq + count)
+        .returning(Project.task_seq)
+    )
+
+
+async def allocate_task_keys(
+    db: AsyncSession, project: Project, count: int = 1
+) -> list[str]:
+    last_seq = await db.scalar(reserve_task_seq(project.id, count))
+    return [f"{project.key}-{seq}" for seq in range(last_seq - count + 1, last_seq + 1)]
+
+
+async def generated_task_key(db: AsyncSession, project: Project) -> str:
+    keys = await allocate_task_keys(db, project)
+    return keys[0]
 
 
 class TaskTransitionValidator:
@@ -0,0 +1,187 @@
+import time
+import logging
+from uuid import uuid4
+
+from fastapi import HTTPException
+from jose import JWTError, jwt
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums import TokenType
+from app.models import User
+from app.schemas.auth import TokenResponse
+from app.settings import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    REFRESH_TOKEN_EXPIRE_MINUTES,
+    SECRET_KEY,
+    TOKEN_STORE_BACKEND,
+)
+from app.utils import create_jwt_token
+from app.websocket.utils import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTokenStore:
+    """
+    Keeps the current refresh token id (jti) of every login session
+    ("family") in process memory. Only correct with a single worker;
+    used for local runs and scripts.
+    """
+
+    def __init__(self):
+        # family -> (jti, expires_at)
+        self._families: dict[str, tuple[str, float]] = {}
+        self._next_sweep = 1024
+
+    async def start(self, family: str, jti: str, ttl: int):
+        self._families[family] = (jti, time.monotonic() + ttl)
+        if len(self._families) >= self._next_sweep:
+            self._sweep()
+
+    async def rotate(self, family: str, jti: str, new_jti: str, ttl: int) -> bool:
+        current = self._families.get(family)
+        if current is None or current[1] <= time.monotonic():
+            self._families.pop(family, None)
+            return False
+        if current[0] != jti:
+            # eski (allaqachon almashtirilgan) token qayta ishlatildi:
+            # token o'g'irlangan bo'lishi mumkin, butun sessiya bekor qilinadi
+            del self._families[family]
+            return False
+        self._families[family] = (new_jti, time.monotonic() + ttl)
+        return True
+
+    async def revoke(self, family: str):
+        self._families.pop(family, None)
+
+    def _sweep(self):
+        now = time.monotonic()
+        for family, (_, expires_at) in list(self._families.items()):
+            if expires_at <= now:
+                del self._families[family]
+        self._next_sweep = max(1024, len(self._families) * 2)
+
+
+class RedisTokenStore:
+    """
+    Same contract as MemoryTokenStore, shared by all workers: one key per
+    login session holding its current jti, expiring with the refresh token.
+    """
+
+    key_prefix = "refresh_family:"
+
+    async def start(self, family: str, jti: str, ttl: int):
+        await get_redis().set(self.key_prefix + family, jti, ex=ttl)
+
+    async def rotate(self, family: str, jti: str, new_jti: str, ttl: int) -> bool:
+        key = self.key_prefix + family
+        async with get_redis().pipeline() as pipe:
+            await pipe.watch(key)
+            current = await pipe.get(key)
+            pipe.multi()
+            if current != jti:
+                pipe.delete(key)
+            else:
+                pipe.set(key, new_jti, ex=ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                # parallel refresh shu tokenni allaqachon almashtirdi
+                return False
+        return current is not None and current == jti
+
+    async def revoke(self, family: str):
+        await get_redis().delete(self.key_prefix + family)
+
+
+token_store = RedisTokenStore() if TOKEN_STORE_BACKEND == "redis" else MemoryTokenStore()
+
+
+def create_access_token(user: User) -> str:
+    # routerlar uchun kerakli hamma narsa tokenda: oddiy so'rovda bazaga borilmaydi
+    return create_jwt_token(
+        {
+            "type": TokenType.access.value,
+            "user_id": user.id,
+            "email": user.email,
+            "fullname": user.fullname,
+            "role": user.role,
+            "is_active": user.is_active,
+        },
+        expires_delta=ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+
+
+async def _issue_tokens(user: User, family: str, previous_jti: str | None = None):
+    jti = uuid4().hex
+    ttl = REFRESH_TOKEN_EXPIRE_MINUTES * 60
+    try:
+        if previous_jti is None:
+            await token_store.start(family, jti, ttl)
+        elif not await token_store.rotate(family, previous_jti, jti, ttl):
+            raise HTTPException(401, "Refresh token has been revoked")
+    except RedisError as err:
+        logger.warning(f"Token store unavailable: {err}")
+        raise HTTPException(503, "Token store unavailable") from err
+
+    refresh_token = create_jwt_token(
+        {
+            "type": TokenType.refresh.value,
+            "user_id": user.id,
+            "jti": jti,
+            "fam": family,
+        },
+        expires_delta=REFRESH_TOKEN_EXPIRE_MINUTES,
+    )
+    return TokenResponse(
+        access_token=create_access_token(user),
+        refresh_token=refresh_token,
+        token_type="Bearer",
+    )
+
+
+async def issue_login_tokens(user: User) -> TokenResponse:
+    """Starts a new login session (refresh token family) for the user."""
+    return await _issue_tokens(user, family=uuid4().hex)
+
+
+def decode_refresh_token(refresh_token: str) -> dict:
+    try:
+        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError as err:
+        raise HTTPException(401, "Refresh token has expired") from err
+    except JWTError as err:
+        raise HTTPException(401, "Invalid refresh token") from err
+
+    if payload.get("type") != TokenType.refresh.value or not payload.get("fam"):
+        raise HTTPException(401, "Invalid refresh token")
+    return payload
+
+
+async def refresh_login_tokens(db: AsyncSession, refresh_token: str) -> TokenResponse:
+    """
+    Exchanges a refresh token for a new access/refresh pair. Each refresh
+    token is accepted once; presenting an already rotated one revokes the
+    whole session. The user is re-read here, so role changes and
+    deactivation take effect at the next refresh at the latest.
+    """
+    payload = decode_refresh_token(refresh_token)
+
+    user = await db.scalar(select(User).where(User.id == payload.get("user_id")))
+    if user is None or not user.is_active:
+        await revoke_refresh_token(refresh_token)
+        raise HTTPException(401, "Inactive user")
+
+    return await _issue_tokens(user, family=payload["fam"], previous_jti=payload.get("jti"))
+
+
+async def revoke_refresh_token(refresh_token: str):
+    payload = decode_refresh_token(refresh_token)
+    try:
+        await token_store.revoke(payload["fam"])
+    except RedisError as err:
+        logger.warning(f"Token store unavailable: {err}")
+        raise HTTPException(503, "Token store unavailable") from err
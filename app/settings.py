@@ -12,12 +12,55 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
+# db engine / connection pool config
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))  # ms
+
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = 43200  # 24 hours
+ACCESS_TOKEN_EXPIRE_MINUTES = 15  # qisqa: userdagi o'zgarish ko'pi bilan shuncha kechikadi
 REFRESH_TOKEN_EXPIRE_MINUTES = 43200  # 30 days
+ADMIN_SESSION_EXPIRE_MINUTES = 43200  # 30 days, admin cookie refresh qilinmaydi
 ADMIN_REMEMBER_ME_EXPIRE_MINUTES = 10080  # 7 days
+# refresh tokenlar ro'yxati: "redis" yoki bitta process uchun "memory"
+TOKEN_STORE_BACKEND = os.getenv("TOKEN_STORE_BACKEND", "redis")
+
+# password hashing (argon2); parametr o'zgarsa loginda rehash bo'ladi
+ARGON2_TIME_COST = 3
+ARGON2_MEMORY_COST = 65536  # KiB
+ARGON2_PARALLELISM = 4
+PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)  # bir vaqtdagi hashlar
+PASSWORD_HASH_QUEUE = 8  # har bir worker uchun navbatda kutadiganlar
+PASSWORD_HASH_TIMEOUT = 5  # seconds, navbat to'la bo'lsa 503
+
+# /metrics va /monitoring/* uchun Prometheus scrape tokeni (Bearer);
+# berilmasa bu endpointlarni faqat admin access token bilan o'qish mumkin
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# authenticated user (principal) cache
+PRINCIPAL_CACHE_SIZE = 10000  # tokenlar soni
+PRINCIPAL_CACHE_TTL = 60  # seconds, boshqa workerdagi o'zgarish shuncha kechikadi
+
+# /project/{key}/board/ cache
+BOARD_CACHE_SIZE = 1000  # (project, limit) juftliklari
+BOARD_CACHE_TTL = 30  # seconds
+
+# deprecated ro'yxat endpointlari (/tasks/all/, /notifications/unread) eski
+# list formatida, lekin shundan ko'p qator qaytarmaydi
+LEGACY_LIST_LIMIT = 1000
+
+# /tasks/bulk/ da bitta so'rovdagi operatsiyalar limiti
+TASK_BULK_MAX_OPERATIONS = 500
+
+# task import (CSV / NDJSON)
+IMPORT_BATCH_SIZE = 1000  # bitta INSERT va tranzaksiyadagi tasklar
+IMPORT_MAX_ERRORS = 1000  # javobda qaytariladigan qator xatolari limiti
 
 
 MEDIA_DIR = "media"
@@ -42,6 +85,33 @@ REDIS_URL = "redis://localhost:6379"
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://localhost:6379/1"
 
+# retention: eski qatorlar archive jadvallariga ko'chiriladi
+NOTIFICATION_RETENTION_DAYS = 90  # faqat o'qilgan notificationlar
+AUDITLOG_RETENTION_DAYS = 365
+RETENTION_BATCH_SIZE = 5000  # bitta tranzaksiyada ko'chiriladigan qatorlar
+
+# websocket events redis stream config
+WS_STREAM_BATCH_SIZE = 100  # bitta XREADGROUP/XACK dagi eventlar soni
+WS_STREAM_MAXLEN = 10000  # stream taxminan shu uzunlikda kesiladi
+WS_STREAM_BLOCK_MS = 5000  # yangi event kutish vaqti (XREADGROUP BLOCK)
+WS_GROUP_IDLE_TIMEOUT_MS = 60000  # shuncha o'qimagan worker group'i o'chiriladi
+WS_GROUP_SWEEP_INTERVAL = 60  # seconds, tashlab ketilgan group'larni tozalash
+
+# transactional outbox config
+OUTBOX_BATCH_SIZE = 500  # bitta tranzaksiyada yuboriladigan eventlar soni
+OUTBOX_POLL_INTERVAL = 1  # seconds, commit signali bo'lmasa tekshirish oralig'i
+OUTBOX_MAX_BACKOFF = 30  # seconds, baza/redis ishlamasa urinishlar oralig'i limiti
+
+# audit log writer config
+AUDIT_BATCH_SIZE = 200  # bitta INSERT dagi audit eventlar soni
+AUDIT_FLUSH_INTERVAL = 1  # seconds
+AUDIT_BUFFER_MAX = 10000  # baza ishlamasa xotirada saqlanadigan eventlar limiti
+
+# websocket send queue config
+WS_SEND_QUEUE_SIZE = 100  # har bir connection uchun navbatdagi xabarlar limiti
+WS_SEND_TIMEOUT = 10  # seconds, bitta send_json uchun
+WS_OVERFLOW_POLICY = "drop_oldest"  # drop_oldest | disconnect
+
 FRONTEND_URL = "http://localhost:8000"
 
 # email settings
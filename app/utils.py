@@ -1,12 +1,41 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
 from fastapi import HTTPException
 from passlib.context import CryptContext
-
-from app.settings import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
-
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.enums import TokenType
+from app.settings import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_TIMEOUT,
+    PASSWORD_HASH_WORKERS,
+    SECRET_KEY,
+)
+
+# parametrlar o'zgarsa eski hashlar login paytida qayta hash qilinadi
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+# argon2 C kodi GIL ni qo'yib yuboradi, shuning uchun threadlar yetarli
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="argon2"
+)
+# ishlayotgan + navbatdagi hashlar limiti (back-pressure)
+_password_slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS * PASSWORD_HASH_QUEUE)
 
 
 def hashed_password(password: str):
@@ -17,6 +46,40 @@ def verify_password(plain_password: str, hashed_password) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_password_job(func, *args):
+    """
+    Runs an Argon2 call on the password pool so the event loop keeps serving
+    other requests and websockets. When too many calls are already waiting
+    the caller gets 503 instead of growing the queue without bound.
+    """
+    try:
+        await asyncio.wait_for(_password_slots.acquire(), PASSWORD_HASH_TIMEOUT)
+    except asyncio.TimeoutError as err:
+        raise HTTPException(503, "Server is busy, try again later.") from err
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Returns (is_valid, new_hash). new_hash is set when the stored hash was made
+    with outdated CryptContext parameters and should replace it.
+    """
+    return await _run_password_job(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_jwt_token(data: dict, expires_delta: timedelta | None = None):
     """
     Creates a new JWT token for logging-in user
@@ -30,13 +93,33 @@ def create_jwt_token(data: dict, expires_delta: timedelta | None = None):
         else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
-    expire_time = datetime.now(timezone.utc) + delta
-    to_encode.update({"exp": expire_time})
+    now = datetime.now(timezone.utc)
+    to_encode.update({"iat": now, "exp": now + delta})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
 
 
+# "type" claimisiz eski access tokenlar 30 kun (eski ACCESS_TOKEN_EXPIRE_MINUTES)
+# yashagan va 2026-10-18 dan keyin berilmaydi. Shu sanagacha hammasining muddati
+# tugaydi; 2026-11-17 dan keyin fallbackni (shu konstanta bilan) olib tashlash.
+LEGACY_ACCESS_TOKEN_DEADLINE = datetime(2026, 11, 17, tzinfo=timezone.utc)
+
+
+def is_access_token(payload: dict) -> bool:
+    """
+    True for a decoded JWT that may be used as an API access token: an
+    expiring token of type "access", or an old untyped token whose `exp`
+    falls before LEGACY_ACCESS_TOKEN_DEADLINE. Activation links (no `exp`),
+    refresh tokens and anything else are rejected.
+    """
+    if not payload.get("exp"):
+        return False
+    if "type" in payload:
+        return payload["type"] == TokenType.access.value
+    return payload["exp"] <= LEGACY_ACCESS_TOKEN_DEADLINE.timestamp()
+
+
 def generate_activation_token(user_id: int):
     return jwt.encode({"user_id": user_id}, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -45,8 +128,10 @@ def decode_user_from_jwt(token: str):
     return jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
 
 
-def get_object_or_404(db, model, **filters):
-    obj = db.query(model).filter_by(**filters).first()
+async def get_object_or_404(db: AsyncSession, model, *options, **filters):
+    obj = await db.scalar(
+        select(model).filter_by(**filters).options(*options).limit(1)
+    )
     if not obj:
         raise HTTPException(404, f"{model.__name__}")
     return obj
\ No newline at end of file
@@ -8,6 +8,7 @@ from app.settings import (
     SECRET_KEY,
     ALGORITHM
 )
+from app.utils import is_access_token
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ async def get_current_user_ws(websocket: WebSocket) -> dict[str, Any]:
     
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+        if not is_access_token(payload):
+            raise ValueError("not an access token")
         user_id = payload.get("user_id")
         role = payload.get("role")
         return {"user_id": user_id, "role": role}
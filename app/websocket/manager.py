@@ -1,58 +1,243 @@
 import asyncio
+import logging
+import itertools
 from collections import defaultdict
+from contextlib import suppress
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
 
-from app.enums import WSEventTypes, Role
+from app.enums import WSEventTypes, WSOverflowPolicy, Role
+from app.settings import WS_OVERFLOW_POLICY, WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_connection_ids = itertools.count(1)
+
+
+class ClientConnection:
+    """
+    One websocket with its own bounded outbound queue. `send` only enqueues,
+    a writer task drains the queue, so a slow client never blocks the caller.
+    When the queue is full the overflow policy either drops the oldest message
+    or closes the connection of the slow consumer.
+    """
+    def __init__(
+            self,
+            websocket: WebSocket,
+            user_id: int,
+            queue_size: int = WS_SEND_QUEUE_SIZE,
+            overflow_policy: str = WS_OVERFLOW_POLICY,
+            send_timeout: float = WS_SEND_TIMEOUT,
+    ):
+        self.id = next(_connection_ids)
+        self.user_id = user_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=queue_size)
+        self.overflow_policy = WSOverflowPolicy(overflow_policy)
+        self.send_timeout = send_timeout
+        self.dropped = 0
+        self.closed = False
+        self.writer: asyncio.Task | None = None
+        self.closer: asyncio.Task | None = None
+        # projectlar bazadan yuklanayotganda kelgan a'zolik o'zgarishlari:
+        # {project_id: True (qo'shildi) | False (chiqarildi)}, yuklangach None
+        self.project_changes: dict[int, bool] | None = {}
+
+    def start(self):
+        self.writer = asyncio.create_task(self._write())
+
+    def send(self, message: dict):
+        if self.closed:
+            return
+
+        try:
+            self.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow_policy == WSOverflowPolicy.disconnect:
+            logger.warning("Slow websocket consumer, closing connection")
+            self.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+
+        self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        self.dropped += 1
+
+    async def _write(self):
+        while True:
+            message = await self.queue.get()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_json(message), timeout=self.send_timeout
+                )
+            except Exception as err:
+                logger.warning(f"Websocket send failed: {err!r}")
+                self.close(code=status.WS_1011_INTERNAL_ERROR)
+                return
+
+    def close(self, code: int = status.WS_1000_NORMAL_CLOSURE):
+        if self.closed:
+            return
+        self.closed = True
+        self.closer = asyncio.create_task(self._close(code))
+
+    async def _close(self, code: int):
+        if self.writer is not None and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.writer
+        # socket allaqachon yopilgan bo'lishi mumkin
+        with suppress(Exception):
+            await self.websocket.close(code=code)
+
+    async def stop(self):
+        """Stops the writer without touching the socket (client already left)."""
+        self.closed = True
+        if self.writer is not None:
+            self.writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.writer
 
 
 class WSManager:
     """
-    - Local connections = {user_id: Websocket}
+    - Connections = {connection_id: ClientConnection}
+    - User connections = {user_id: {connection_id}} (bir nechta tab/qurilma)
     - Project members = {project_id: {user_id: role}}
+    - User projects = {user_id: {project_id}}
     - Lock = asyncio.Lock()
     """
     def __init__(self):
-        self.local_connections: dict[int, WebSocket] ={}
+        self.connections: dict[int, ClientConnection] = {}
+        self.user_connections: dict[int, set[int]] = defaultdict(set)
         self.project_members: dict[int, dict[int, str]] = defaultdict(dict)
+        self.user_projects: dict[int, set[int]] = defaultdict(set)
         self.lock = asyncio.Lock()
 
-    async def connect(
-            self, websocket: WebSocket, user_id: int, role: str, projects: list[int]
-    ):
+    async def connect(self, websocket: WebSocket, user_id: int) -> ClientConnection:
+        """
+        Registers the connection before its projects are loaded, so
+        member_added / member_removed events that arrive while the router
+        queries the database are not lost; `load_projects` merges both.
+        """
         await websocket.accept()
 
+        connection = ClientConnection(websocket, user_id)
+        connection.start()
+
+        async with self.lock:
+            self.connections[connection.id] = connection
+            self.user_connections[user_id].add(connection.id)
+
+        return connection
+
+
+    async def load_projects(
+            self, connection: ClientConnection, role: str, projects: list[int]
+    ) -> list[int]:
+        user_id = connection.user_id
         async with self.lock:
-            self.local_connections[user_id] = websocket
+            changes = connection.project_changes or {}
+            connection.project_changes = None
             for project_id in projects:
+                # yuklash paytida chiqarilgan bo'lsa, eski natija qaytarmaydi
+                if changes.get(project_id) is False:
+                    continue
                 self.project_members[project_id][user_id] = role
-    
+                self.user_projects[user_id].add(project_id)
+            return sorted(self.user_projects.get(user_id, ()))
+
 
     async def disconnect(
-            self, user_id: int
+            self, connection: ClientConnection
     ):
         async with self.lock:
-            self.local_connections.pop(user_id)
-            for project in self.project_members.values():
-                project.pop(user_id, None)
-    
+            self.connections.pop(connection.id, None)
+
+            user_id = connection.user_id
+            user_connections = self.user_connections.get(user_id)
+            if user_connections is not None:
+                user_connections.discard(connection.id)
+                # oxirgi connection yopilgandagina project indekslaridan o'chiriladi
+                if not user_connections:
+                    del self.user_connections[user_id]
+                    for project_id in self.user_projects.pop(user_id, ()):
+                        members = self.project_members.get(project_id)
+                        if members is not None:
+                            members.pop(user_id, None)
+                            if not members:
+                                del self.project_members[project_id]
+
+        await connection.stop()
+
+
+    async def subscribe(self, user_id: int, project_id: int, role: str):
+        """
+        Adds a project to the live subscriptions of a user connected to this
+        worker, e.g. after an invite. Users without connections are skipped,
+        their projects are loaded from the database when they connect.
+        """
+        async with self.lock:
+            if user_id not in self.user_connections:
+                return
+            self._remember_change(user_id, project_id, True)
+            self.project_members[project_id][user_id] = role
+            self.user_projects[user_id].add(project_id)
+
+
+    async def unsubscribe(self, user_id: int, project_id: int):
+        async with self.lock:
+            self._remember_change(user_id, project_id, False)
+            projects = self.user_projects.get(user_id)
+            if projects is not None:
+                projects.discard(project_id)
+
+            members = self.project_members.get(project_id)
+            if members is not None:
+                members.pop(user_id, None)
+                if not members:
+                    del self.project_members[project_id]
+
+
+    def _remember_change(self, user_id: int, project_id: int, added: bool):
+        for connection_id in self.user_connections.get(user_id, ()):
+            changes = self.connections[connection_id].project_changes
+            if changes is not None:
+                changes[project_id] = added
+
 
-    async def send_to_roles(
+    def send_to_user(self, user_id: int, message: dict):
+        for connection_id in self.user_connections.get(user_id, ()):
+            self.connections[connection_id].send(message)
+
+
+    def send_to_roles(
             self, project_id: int, message: dict, allowed_roles: list[str]
     ):
-        members = self.project_members.get(project_id)
+        members = self.project_members.get(project_id, {})
         for user_id, role in members.items():
-            if user_id in self.local_connections and role in allowed_roles:
-                await self.local_connections[user_id].send_json(message)
-    
+            if role in allowed_roles:
+                self.send_to_user(user_id, message)
+
 
-    async def send_to_all_project_members(
+    def send_to_all_project_members(
             self, project_id: int, message: dict
     ):
-        members = self.project_members.get(project_id)
+        members = self.project_members.get(project_id, {})
         for user_id in members.keys():
-            if user_id in self.local_connections.keys():
-                await self.local_connections[user_id].send_json(message)
+            self.send_to_user(user_id, message)
+
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self.connections),
+            "users": len(self.user_connections),
+            "projects": len(self.project_members),
+            "queued": sum(c.queue.qsize() for c in self.connections.values()),
+            "dropped": sum(c.dropped for c in self.connections.values()),
+        }
 
 
 async def dispatch_ws_event(
@@ -61,18 +246,30 @@ async def dispatch_ws_event(
         project_id: int,
         payload: dict
 ):
-    
+    # faqat navbatga qo'yiladi, haqiqiy yuborish har bir connection writer'ida
     if event_type == WSEventTypes.task_created:
-        await ws_manager.send_to_roles(
+        ws_manager.send_to_roles(
             project_id, payload, {Role.developer, Role.tester}
             )
     elif event_type == WSEventTypes.task_status_change:
-        await ws_manager.send_to_roles(project_id, payload, {Role.manager, Role.developer})
+        ws_manager.send_to_roles(project_id, payload, {Role.manager, Role.developer})
     elif event_type == WSEventTypes.task_move_ready:
-        await ws_manager.send_to_roles(project_id, payload, {Role.tester})
+        ws_manager.send_to_roles(project_id, payload, {Role.tester})
     elif event_type == WSEventTypes.task_rejected:
-        await ws_manager.send_to_roles(project_id, payload, {Role.developer})
+        ws_manager.send_to_roles(project_id, payload, {Role.developer})
     elif event_type == WSEventTypes.task_created_high:
-        await ws_manager.send_to_all_project_members(project_id, payload)
+        ws_manager.send_to_all_project_members(project_id, payload)
     elif event_type == WSEventTypes.task_all:
-        await ws_manager.send_to_all_project_members(project_id, payload)
\ No newline at end of file
+        ws_manager.send_to_all_project_members(project_id, payload)
+    elif event_type == WSEventTypes.comment_created:
+        ws_manager.send_to_all_project_members(project_id, payload)
+    elif event_type == WSEventTypes.tasks_bulk_changed:
+        ws_manager.send_to_all_project_members(project_id, payload)
+    elif event_type == WSEventTypes.tasks_imported:
+        ws_manager.send_to_all_project_members(project_id, payload)
+    elif event_type == WSEventTypes.member_added:
+        await ws_manager.subscribe(payload["user_id"], project_id, payload["role"])
+        ws_manager.send_to_user(payload["user_id"], payload)
+    elif event_type == WSEventTypes.member_removed:
+        ws_manager.send_to_user(payload["user_id"], payload)
+        await ws_manager.unsubscribe(payload["user_id"], project_id)
@@ -1,9 +1,9 @@
 from sqlalchemy import select
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.dependencies import get_db
+from app.database import AsyncSessionLocal
 from app.websocket.manager import WSManager
-from app.models import User, Project, ProjectMember
+from app.models import Project, ProjectMember
 from app.websocket.dependencies import ws_current_user_dep
 
 
@@ -18,33 +18,24 @@ async def websocket_endpoint(websocket: WebSocket, user_data: ws_current_user_de
     user_id = user_data.get("user_id")
     role = user_data.get("role")
 
-    db = next(get_db())
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        projects = (
-            db.execute(
-                select(Project.id)
-                .select_from(Project)
-                .join(Project.members)
-                .where(ProjectMember.user_id==user.id)
-            )
-            .scalars()
-            .all()
-        )
-    finally:
-        db.close()
-    
     ws_manager: WSManager = websocket.app.state.ws_manager
-    await ws_manager.connect(
-        websocket=websocket, 
-        user_id=user_id, 
-        role=role, 
-        projects=projects
-        )
-    
+    # avval ro'yxatdan o'tiladi, keyin projectlar yuklanadi: oradagi
+    # member_added/member_removed eventlari yo'qolmaydi
+    connection = await ws_manager.connect(websocket=websocket, user_id=user_id)
 
     try:
-        await websocket.send_json(
+        async with AsyncSessionLocal() as db:
+            projects = (
+                await db.scalars(
+                    select(Project.id)
+                    .select_from(Project)
+                    .join(Project.members)
+                    .where(ProjectMember.user_id==user_id)
+                )
+            ).all()
+        projects = await ws_manager.load_projects(connection, role, projects)
+
+        connection.send(
             {
                 "type": "connected",
                 "user_id": user_id,
@@ -55,4 +46,7 @@ async def websocket_endpoint(websocket: WebSocket, user_data: ws_current_user_de
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        await ws_manager.disconnect(user_id)
\ No newline at end of file
+        pass
+    finally:
+        # slow consumer sifatida server tomonidan yopilganda ham tozalanadi
+        await ws_manager.disconnect(connection)
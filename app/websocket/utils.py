@@ -1,84 +1,199 @@
-# import os
-# import json
-# import redis.asyncio as aioredis
-# from redis.exceptions import ResponseError
-
-# from app.settings import REDIS_URL
-# from app.enums import WSEventTypes, Role
-# from app.websocket.manager import WSManager
-
-
-# REDIS_STREAM_KEY = "ws_events"
-# CONSUMER_GROUP = "ws_group"
-# CONSUMER_NAME = f"worker_{os.getpid()}"
-
-
-# async def get_redis():
-#     return await aioredis.from_url(REDIS_URL, decode_responses=True)
-
-
-# async def publish_event(event: dict):
-#     redis = await get_redis()
-#     await redis.xadd(REDIS_STREAM_KEY, {"data": json.dumps(event)})
-
-
-# async def handle_event(ws_manager: WSManager, data: dict):
-#     project_id = data["project_id"]
-#     message = data["message"]
-#     allowed_roles = data["allowed_roles"]
-
-#     if "*" in allowed_roles:
-#         await ws_manager.send_to_all_project_members(project_id, message)
-#     else:
-#         await ws_manager.send_to_roles(project_id, message, allowed_roles)
-
-
-# async def dispatch_ws_event(event_type: str, project_id: int, payload: dict):
-#     if event_type == WSEventTypes.task_created:
-#         allowed_roles = [Role.developer, Role.tester]
-#     elif event_type == WSEventTypes.task_status_change:
-#         allowed_roles = [Role.manager]
-#     elif event_type == WSEventTypes.task_move_ready:
-#         allowed_roles = [Role.tester]
-#     elif event_type == WSEventTypes.task_rejected:
-#         allowed_roles = [Role.developer]
-#     elif event_type == WSEventTypes.task_created_high:
-#         allowed_roles = ["*"]
-#     else:
-#         return
-
-#     await publish_event(
-#         {
-#             "project_id": project_id,
-#             "allowed_roles": allowed_roles,
-#             "message": payload,
-#         }
-#     )
-
-
-# async def consume_events(ws_manager: WSManager):
-#     redis = await get_redis()
-
-#     # Create group if not exists
-#     try:
-#         await redis.xgroup_create(
-#             REDIS_STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True
-#         )
-#     except ResponseError:
-#         pass  # group already exists
-
-#     while True:
-#         entries = await redis.xreadgroup(
-#             groupname=CONSUMER_GROUP,
-#             consumername=CONSUMER_NAME,
-#             streams={REDIS_STREAM_KEY: ">"},
-#             count=10,
-#             block=5000,  # ms
-#         )
-
-#         if entries:
-#             for _, messages in entries:
-#                 for msg_id, msg_data in messages:
-#                     data = json.loads(msg_data["data"])
-#                     await handle_event(ws_manager, data)
-#                     await redis.xack(REDIS_STREAM_KEY, CONSUMER_GROUP, msg_id)
+import os
+import json
+import time
+import socket
+import asyncio
+import logging
+from typing import Callable
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError, ResponseError
+
+from app.settings import (
+    REDIS_URL,
+    WS_GROUP_IDLE_TIMEOUT_MS,
+    WS_GROUP_SWEEP_INTERVAL,
+    WS_STREAM_BATCH_SIZE,
+    WS_STREAM_BLOCK_MS,
+    WS_STREAM_MAXLEN,
+)
+from app.websocket.manager import WSManager, dispatch_ws_event
+
+logger = logging.getLogger(__name__)
+
+
+REDIS_STREAM_KEY = "ws_events"
+# Har bir worker o'z consumer group'iga ega: group ichida xabarlar consumerlar
+# orasida bo'linadi, bizga esa har bir event hamma workerga yetishi kerak.
+# Crash bo'lgan worker group'ini finally o'chira olmaydi, uni boshqa
+# workerlardagi sweep_stale_groups tozalaydi.
+CONSUMER_GROUP_PREFIX = "ws_group_"
+CONSUMER_GROUP = f"{CONSUMER_GROUP_PREFIX}{socket.gethostname()}_{os.getpid()}"
+CONSUMER_NAME = f"worker_{os.getpid()}"
+# o'qish xato bersa qayta urinishdan oldingi pauza (sekund)
+READ_RETRY_DELAY = 1
+
+# event_type -> handler(project_id, payload): clientlarga yuborilmaydigan,
+# har bir worker o'zi bajaradigan eventlar (masalan board cache invalidatsiyasi)
+worker_event_handlers: dict[str, Callable[[int, dict], None]] = {}
+
+_redis: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+    return _redis
+
+
+async def close_redis():
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def publish_ws_events(batches: dict[int, list[dict]]):
+    """
+    Puts one stream message per project, holding that project's events in
+    order, and sends all of them in a single pipeline round trip. Every
+    worker's consumer delivers them to its own local connections.
+    RedisError is raised so the outbox keeps the events for a retry.
+    """
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for project_id, events in batches.items():
+            message = {"project_id": project_id, "events": events}
+            pipe.xadd(
+                REDIS_STREAM_KEY,
+                {"data": json.dumps(message, default=str)},
+                maxlen=WS_STREAM_MAXLEN,
+                approximate=True,
+            )
+        await pipe.execute()
+
+
+async def handle_event(ws_manager: WSManager, data: dict):
+    for event in data["events"]:
+        handler = worker_event_handlers.get(event["event_type"])
+        if handler is not None:
+            handler(data["project_id"], event["payload"])
+            continue
+        await dispatch_ws_event(
+            ws_manager=ws_manager,
+            event_type=event["event_type"],
+            project_id=data["project_id"],
+            payload=event["payload"],
+        )
+
+
+async def _create_group(redis: aioredis.Redis, group: str):
+    try:
+        # "$": worker faqat o'zi ishga tushgandan keyingi eventlarni oladi
+        await redis.xgroup_create(REDIS_STREAM_KEY, group, id="$", mkstream=True)
+    except ResponseError:
+        pass  # group already exists
+
+
+async def sweep_stale_groups(
+    redis: aioredis.Redis,
+    own_group: str = CONSUMER_GROUP,
+    idle_ms: int = WS_GROUP_IDLE_TIMEOUT_MS,
+) -> list[str]:
+    """
+    Destroys worker consumer groups whose consumers have all been idle for
+    longer than `idle_ms`. A live worker calls XREADGROUP at least every
+    WS_STREAM_BLOCK_MS, so only groups of crashed or killed workers get that
+    old; without the sweep they would stay in Redis forever. A group without
+    consumers is removed too; if it belonged to a worker that had only just
+    created it, that worker gets NOGROUP and recreates it.
+    """
+    try:
+        groups = await redis.xinfo_groups(REDIS_STREAM_KEY)
+    except ResponseError:
+        return []  # stream hali yaratilmagan ("no such key")
+
+    removed = []
+    for group in groups:
+        name = group["name"]
+        if name == own_group or not name.startswith(CONSUMER_GROUP_PREFIX):
+            continue
+
+        try:
+            consumers = await redis.xinfo_consumers(REDIS_STREAM_KEY, name)
+        except ResponseError:
+            continue  # boshqa worker allaqachon o'chirgan
+        if any(consumer["idle"] < idle_ms for consumer in consumers):
+            continue
+
+        try:
+            await redis.xgroup_destroy(REDIS_STREAM_KEY, name)
+        except ResponseError:
+            continue  # boshqa worker allaqachon o'chirgan
+        logger.info(f"Removed stale ws consumer group {name}")
+        removed.append(name)
+    return removed
+
+
+async def consume_events(
+    ws_manager: WSManager,
+    redis: aioredis.Redis | None = None,
+    group: str = CONSUMER_GROUP,
+):
+    redis = redis or get_redis()
+    group_ready = False
+    next_sweep = 0.0
+
+    try:
+        while True:
+            try:
+                if not group_ready:
+                    await _create_group(redis, group)
+                    group_ready = True
+
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + WS_GROUP_SWEEP_INTERVAL
+                    await sweep_stale_groups(redis, group)
+
+                entries = await redis.xreadgroup(
+                    groupname=group,
+                    consumername=CONSUMER_NAME,
+                    streams={REDIS_STREAM_KEY: ">"},
+                    count=WS_STREAM_BATCH_SIZE,
+                    block=WS_STREAM_BLOCK_MS,
+                )
+            except ResponseError as err:
+                # group qayta yaratiladi; NOGROUP (sweep o'chirgan) darhol,
+                # boshqa xatolarda (masalan WRONGTYPE) pauzadan keyin
+                group_ready = False
+                if "NOGROUP" in str(err):
+                    continue
+                logger.warning(f"Redis stream read failed: {err}")
+                await asyncio.sleep(READ_RETRY_DELAY)
+                continue
+            except RedisError as err:
+                # Redis ishga tushmagan yoki uzilgan: keyinroq qayta urinamiz
+                logger.warning(f"Redis stream read failed: {err}")
+                await asyncio.sleep(READ_RETRY_DELAY)
+                continue
+
+            msg_ids = []
+            for _, messages in entries or []:
+                for msg_id, msg_data in messages:
+                    try:
+                        await handle_event(ws_manager, json.loads(msg_data["data"]))
+                    except Exception:
+                        logger.exception(f"Failed to handle ws event {msg_id}")
+                    msg_ids.append(msg_id)
+
+            # butun batch bitta XACK bilan tasdiqlanadi
+            if msg_ids:
+                try:
+                    await redis.xack(REDIS_STREAM_KEY, group, *msg_ids)
+                except RedisError as err:
+                    logger.warning(f"Redis stream ack failed: {err}")
+    finally:
+        try:
+            await redis.xgroup_destroy(REDIS_STREAM_KEY, group)
+        except RedisError:
+            pass
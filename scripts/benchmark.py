@@ -0,0 +1,1012 @@
+import os
+import sys
+import time
+import asyncio
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import typer
+
+
+apps = typer.Typer()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_report(title: str, latencies: list[float], elapsed: float, errors: int = 0):
+    typer.echo(title)
+    typer.echo(f"  requests : {len(latencies)} (errors: {errors})")
+    typer.echo(f"  req/sec  : {len(latencies) / elapsed:.1f}")
+    typer.echo(f"  mean     : {statistics.mean(latencies) * 1000:.2f} ms")
+    typer.echo(f"  p50      : {percentile(latencies, 50) * 1000:.2f} ms")
+    typer.echo(f"  p99      : {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+async def _hit_endpoint(
+    url: str, requests: int, concurrency: int, headers: dict
+) -> tuple[list[float], float, int]:
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, elapsed, errors
+
+
+@apps.command()
+def tasks_all(
+    base_url: str = "http://127.0.0.1:8000",
+    requests: int = 2000,
+    concurrency: int = 50,
+    token: str = "",
+):
+    """
+    Measures req/sec and p99 latency of GET /tasks/all/ under concurrency.
+    Run it against the sync (before) and async (after) builds to compare.
+    """
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies, elapsed, errors = asyncio.run(
+        _hit_endpoint(f"{base_url}/tasks/all/", requests, concurrency, headers)
+    )
+    print_report(
+        f"GET /tasks/all/ concurrency={concurrency}", latencies, elapsed, errors
+    )
+
+
+@apps.command()
+def count_queries(
+    path: str = "/tasks/",
+    token: str = "",
+    sizes: str = "1,50",
+    max_statements: int = 0,
+):
+    """
+    Runs the request in-process against the configured database once per
+    `limit` in --sizes and counts the SQL statements each run issues. Exits
+    non-zero when the count changes with the number of rows returned (an
+    N+1 regression), when the sizes return the same number of rows (nothing
+    to compare, seed more rows), or when --max-statements is exceeded.
+    """
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.database import async_engine
+    from app.main import app
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def get(size: int):
+        response = TestClient(app).get(path, params={"limit": size}, headers=headers)
+        # har bir so'rov o'z event loopida: ulanishlar keyingisiga o'tmaydi
+        async_engine.sync_engine.dispose(close=False)
+        return response
+
+    # birinchi ulanishdagi dialect so'rovlari hisobga kirmasin
+    get(1)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+
+    results = []
+    for size in [int(size) for size in sizes.split(",")]:
+        statements.clear()
+        response = get(size)
+        if response.status_code != 200:
+            typer.echo(f"GET {path} -> {response.status_code}: {response.text}")
+            raise typer.Exit(code=1)
+
+        body = response.json()
+        if isinstance(body, dict) and "items" in body:
+            body = body["items"]
+        rows = len(body) if isinstance(body, list) else 1
+        typer.echo(f"GET {path}?limit={size}: {rows} rows, {len(statements)} statements")
+        results.append((rows, len(statements)))
+
+    row_counts = [rows for rows, _ in results]
+    counts = [statements for _, statements in results]
+    if len(set(row_counts)) != len(row_counts):
+        typer.echo("  sizes returned the same number of rows, nothing to compare")
+        raise typer.Exit(code=1)
+    if len(set(counts)) > 1:
+        typer.echo("  statement count grows with rows (N+1)!")
+        raise typer.Exit(code=1)
+    if max_statements and counts[0] > max_statements:
+        typer.echo(f"  more than {max_statements} statements!")
+        raise typer.Exit(code=1)
+
+
+SEED_SQL = [
+    """
+    INSERT INTO users (email, hashed_password, fullname, role, is_active, is_deleted,
+                       created_at, updated_at)
+    SELECT 'seed' || n || '@example.com', 'x', 'Seed User ' || n,
+           (ARRAY['owner', 'manager', 'developer', 'tester'])[1 + n % 4],
+           true, false, now(), now()
+    FROM generate_series(1, :users) n
+    ON CONFLICT (email) DO NOTHING
+    """,
+    """
+    INSERT INTO projects (name, key, owner_id, is_active, is_private,
+                          created_at, updated_at)
+    SELECT 'Seed project ' || n, 'S' || n,
+           (SELECT min(id) FROM users WHERE email LIKE 'seed%@example.com'),
+           true, false, now(), now()
+    FROM generate_series(1, :projects) n
+    ON CONFLICT (key) DO NOTHING
+    """,
+    """
+    INSERT INTO project_members (project_id, user_id, joined_at)
+    SELECT p.id, u.id, now()
+    FROM projects p
+    JOIN users u ON u.email LIKE 'seed%@example.com' AND (u.id + p.id) % 5 = 0
+    WHERE p.name LIKE 'Seed project %'
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    WITH seed_users AS (
+        SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'seed%@example.com'
+    ),
+    -- qidiruv benchmarki uchun turli chastotali so'zlar
+    seed_words AS (
+        SELECT ARRAY['login', 'payment', 'report', 'dashboard', 'export', 'import',
+                     'search', 'notification', 'profile', 'avatar', 'invite',
+                     'board', 'comment', 'sprint', 'release', 'backup',
+                     'migration', 'cache', 'webhook', 'email', 'upload',
+                     'permission', 'timezone'] AS subjects,
+               ARRAY['crashes', 'slow', 'broken', 'missing', 'timeout',
+                     'duplicate', 'flaky', 'error', 'refactor', 'cleanup',
+                     'redesign', 'upgrade', 'validation', 'translation',
+                     'accessibility', 'pagination', 'sorting', 'filter',
+                     'retry'] AS problems
+    )
+    INSERT INTO tasks (project_id, key, summary, description, status, priority,
+                       assignee_id, reporter_id, due_date, created_at, updated_at)
+    SELECT p.id, p.key || '-' || n,
+           'Seed task ' || n || ': ' || sw.subjects[1 + n % 23] || ' '
+               || sw.problems[1 + (n / 23) % 19],
+           'Seeded description ' || md5(n::text) || ' '
+               || sw.problems[1 + (n * 7) % 19]
+               || CASE WHEN n % 10007 = 0 THEN ' deadlock' ELSE '' END,
+           (ARRAY['BACKLOG', 'TODO', 'IN_PROGRESS', 'READY_FOR_TESTING', 'DONE'])
+               [1 + n % 5],
+           (ARRAY['low', 'medium', 'high'])[1 + n % 3],
+           su.ids[1 + (n * 7) % array_length(su.ids, 1)],
+           su.ids[1 + (n * 13) % array_length(su.ids, 1)],
+           now() + (n % 60) * interval '1 day',
+           now() - n * interval '1 minute',
+           now() - n * interval '1 minute'
+    FROM projects p
+    CROSS JOIN generate_series(1, :tasks) n
+    CROSS JOIN seed_users su
+    CROSS JOIN seed_words sw
+    WHERE p.name LIKE 'Seed project %'
+    ON CONFLICT (key) DO NOTHING
+    """,
+    """
+    INSERT INTO notifications (message, is_read, recipient_id, sender_id, task_id,
+                               project_id, created_at, updated_at)
+    SELECT 'Seed notification', t.id % 10 <> 0, t.assignee_id, t.reporter_id,
+           t.id, t.project_id, now(), now()
+    FROM tasks t
+    JOIN projects p ON p.id = t.project_id
+    WHERE p.name LIKE 'Seed project %'
+      AND NOT EXISTS (SELECT 1 FROM notifications n WHERE n.task_id = t.id)
+    """,
+    """
+    INSERT INTO comments (task_id, user_id, content, created_at, updated_at)
+    SELECT t.id, t.reporter_id,
+           'Seed comment: reproduced on ' || t.key
+               || CASE WHEN t.id % 3 = 0 THEN ' after the webhook retry' ELSE '' END,
+           now(), now()
+    FROM tasks t
+    JOIN projects p ON p.id = t.project_id
+    WHERE p.name LIKE 'Seed project %' AND t.id % 4 = 0
+      AND NOT EXISTS (SELECT 1 FROM comments c WHERE c.task_id = t.id)
+    """,
+    """
+    UPDATE tasks SET comments_count = c.count
+    FROM (SELECT task_id, count(*) AS count FROM comments GROUP BY task_id) c
+    WHERE tasks.id = c.task_id AND tasks.comments_count <> c.count
+    """,
+    """
+    UPDATE projects SET task_seq = GREATEST(task_seq, :tasks)
+    WHERE name LIKE 'Seed project %'
+    """,
+    """
+    UPDATE users SET unread_notifications_count = (
+        SELECT count(*) FROM notifications n
+        WHERE n.recipient_id = users.id AND n.is_read = false
+    )
+    WHERE email LIKE 'seed%@example.com'
+    """,
+]
+
+
+SEED_COUNT_SQL = """
+    SELECT count(DISTINCT p.id), count(t.id)
+    FROM projects p
+    LEFT JOIN tasks t ON t.project_id = p.id
+    WHERE p.name LIKE 'Seed project %'
+"""
+
+
+@apps.command()
+def seed(users: int = 200, projects: int = 50, tasks: int = 2000):
+    """
+    Fills the configured Postgres database with seed users, projects, members,
+    tasks (per project), comments and notifications using set-based
+    INSERT ... SELECT. Exits non-zero if fewer projects or tasks than asked
+    for end up in the database (e.g. keys taken by non-seed rows).
+    """
+    from sqlalchemy import text
+
+    from app.database import SessionLocal
+
+    params = {"users": users, "projects": projects, "tasks": tasks}
+    with SessionLocal() as db:
+        # million qatorli seed DB_STATEMENT_TIMEOUT dan uzoq davom etadi
+        db.execute(text("SET LOCAL statement_timeout = 0"))
+        for statement in SEED_SQL:
+            db.execute(text(statement), params)
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        # ON CONFLICT DO NOTHING xatoni yashiradi: natija sanab tekshiriladi
+        seeded_projects, seeded_tasks = db.execute(text(SEED_COUNT_SQL)).one()
+
+    typer.echo(f"Seeded {seeded_projects} projects, {seeded_tasks} tasks.")
+    if seeded_projects < projects or seeded_tasks < projects * tasks:
+        typer.echo(f"  expected at least {projects} projects x {tasks} tasks!")
+        raise typer.Exit(code=1)
+
+
+HOT_TABLES = {"tasks", "projects", "project_members", "notifications", "auditlogs"}
+
+
+def _seq_scans(plan: dict, tables: set[str]) -> list[str]:
+    found = []
+    if (
+        plan.get("Node Type") == "Seq Scan"
+        and plan.get("Relation Name") in tables
+        and "Filter" in plan
+    ):
+        found.append(f"{plan['Relation Name']} (filter: {plan['Filter']})")
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child, tables))
+    return found
+
+
+def _hot_queries(db) -> dict:
+    from sqlalchemy import false, select
+
+    from app.models import AuditLog, Notification, Project, ProjectMember, Task
+    from app.services import (
+        audit_history_query,
+        project_member_list_query,
+        task_list_query,
+    )
+
+    task = db.scalar(select(Task).order_by(Task.id.desc()).limit(1))
+    project = db.get(Project, task.project_id)
+    member = db.scalar(
+        select(ProjectMember).where(ProjectMember.project_id == project.id).limit(1)
+    )
+    page = (Task.updated_at.desc(), Task.id.desc())
+
+    return {
+        "task by key": select(Task).where(Task.key == task.key),
+        "project by key": select(Project).where(Project.key == project.key),
+        "project tasks page": task_list_query()
+        .where(Task.project_id == project.id)
+        .order_by(*page)
+        .limit(51),
+        "project tasks by status": task_list_query()
+        .where(Task.project_id == project.id, Task.status == task.status)
+        .order_by(*page)
+        .limit(51),
+        "assignee tasks": task_list_query()
+        .where(Task.assignee_id == task.assignee_id)
+        .order_by(*page)
+        .limit(51),
+        "project members": project_member_list_query(project.id),
+        "membership check": select(ProjectMember).where(
+            ProjectMember.project_id == project.id,
+            ProjectMember.user_id == member.user_id,
+        ),
+        "user projects": select(Project.id)
+        .join(Project.members)
+        .where(ProjectMember.user_id == member.user_id),
+        "unread notifications": select(Notification).where(
+            Notification.recipient_id == task.assignee_id,
+            Notification.is_read == false(),
+        ),
+        "task history": audit_history_query(task_id=task.id)
+        .order_by(AuditLog.id.desc())
+        .limit(51),
+        "project history": audit_history_query(project_id=project.id)
+        .order_by(AuditLog.id.desc())
+        .limit(51),
+    }
+
+
+@apps.command()
+def explain_queries(min_rows: int = 1000):
+    """
+    EXPLAINs the hot router queries against a seeded database (see `seed`) and
+    exits non-zero if any of them filters a hot table with a sequential scan.
+    Tables smaller than --min-rows are skipped, Postgres rightly scans those;
+    if every hot table is that small the check exits non-zero too.
+    """
+    from sqlalchemy import bindparam, text
+
+    from app.database import SessionLocal, engine
+
+    failed = False
+    with SessionLocal() as db:
+        tables = set(
+            db.scalars(
+                text(
+                    "SELECT relname FROM pg_class "
+                    "WHERE relname IN :tables AND reltuples >= :min_rows"
+                ).bindparams(bindparam("tables", expanding=True)),
+                {"tables": list(HOT_TABLES), "min_rows": min_rows},
+            )
+        )
+        if not tables:
+            # kichik bazada hamma narsa "ok" chiqadi, tekshiruv hech narsa demaydi
+            typer.echo(f"No hot table has {min_rows} rows, run `seed` first.")
+            raise typer.Exit(code=1)
+
+        for name, query in _hot_queries(db).items():
+            sql = query.compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+            seq_scans = _seq_scans(plan, tables)
+            failed = failed or bool(seq_scans)
+            status = "SEQ SCAN " + ", ".join(seq_scans) if seq_scans else "ok"
+            typer.echo(f"{name:<25} {status}")
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+async def _create_tasks_concurrently(project_key: str, count: int) -> list[str]:
+    from datetime import datetime, timezone
+
+    from app.database import AsyncSessionLocal
+    from app.enums import Priority, Status
+    from app.models import Project, Task
+    from app.services import generated_task_key
+    from app.utils import get_object_or_404
+
+    async def create_one():
+        async with AsyncSessionLocal() as db:
+            project = await get_object_or_404(db, Project, key=project_key)
+            task = Task(
+                key=await generated_task_key(db, project),
+                summary="Concurrency check",
+                priority=Priority.LOW,
+                status=Status.BACKLOG,
+                due_date=datetime.now(timezone.utc),
+                project_id=project.id,
+                reporter_id=project.owner_id,
+            )
+            db.add(task)
+            await db.commit()
+            return task.key
+
+    return await asyncio.gather(*(create_one() for _ in range(count)))
+
+
+@apps.command()
+def concurrent_task_keys(project_key: str, count: int = 300):
+    """
+    Creates `count` tasks in one project in parallel sessions and checks every
+    generated key is unique. Uses the configured database; tasks are kept.
+    """
+    start = time.perf_counter()
+    keys = asyncio.run(_create_tasks_concurrently(project_key, count))
+    elapsed = time.perf_counter() - start
+
+    typer.echo(f"{len(keys)} tasks in {elapsed:.2f}s, {len(set(keys))} unique keys")
+    if len(set(keys)) != len(keys):
+        raise typer.Exit(code=1)
+
+
+async def _login_burst(
+    base_url: str, email: str, password: str, requests: int, concurrency: int
+) -> tuple[list[float], float, int, list[float]]:
+    latencies: list[float] = []
+    pings: list[float] = []
+    errors = 0
+    remaining = requests
+    done = asyncio.Event()
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.post(
+                "/auth/login/", data={"username": email, "password": password}
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    async def ping(client: httpx.AsyncClient):
+        # login paytida event loop boshqa so'rovlarga javob beryaptimi
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/")
+            pings.append(time.perf_counter() - start)
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        pinger = asyncio.create_task(ping(client))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await pinger
+
+    return latencies, elapsed, errors, pings
+
+
+@apps.command()
+def login(
+    email: str,
+    password: str,
+    base_url: str = "http://127.0.0.1:8000",
+    requests: int = 200,
+    concurrency: int = 20,
+):
+    """
+    Fires a burst of POST /auth/login/ against a running server and, at the
+    same time, pings GET / to show whether Argon2 work blocks the event loop.
+    """
+    latencies, elapsed, errors, pings = asyncio.run(
+        _login_burst(base_url, email, password, requests, concurrency)
+    )
+    print_report(
+        f"POST /auth/login/ concurrency={concurrency}", latencies, elapsed, errors
+    )
+    if pings:
+        typer.echo(
+            f"  GET / during burst: p50 {percentile(pings, 50) * 1000:.2f} ms, "
+            f"p99 {percentile(pings, 99) * 1000:.2f} ms"
+        )
+
+
+FANOUT_SETUP_SQL = [
+    """
+    INSERT INTO users (email, hashed_password, fullname, role, is_active, is_deleted,
+                       created_at, updated_at)
+    SELECT 'fanout' || n || '@example.com', 'x', 'Fanout User ' || n, 'developer',
+           true, false, now(), now()
+    FROM generate_series(1, :members) n
+    ON CONFLICT (email) DO NOTHING
+    """,
+    """
+    INSERT INTO projects (name, key, owner_id, is_active, is_private,
+                          created_at, updated_at)
+    SELECT 'Fanout project', :key, min(id), true, false, now(), now()
+    FROM users WHERE email LIKE 'fanout%@example.com'
+    """,
+    """
+    INSERT INTO project_members (project_id, user_id, joined_at)
+    SELECT p.id, u.id, now()
+    FROM projects p
+    JOIN users u ON u.email LIKE 'fanout%@example.com'
+         AND substring(u.email FROM '[0-9]+')::int <= :members
+    WHERE p.key = :key
+    """,
+    """
+    INSERT INTO tasks (project_id, key, summary, status, priority, reporter_id,
+                       due_date, created_at, updated_at)
+    SELECT id, key || '-1', 'Fanout task', 'READY_FOR_TESTING', 'low', owner_id,
+           now(), now(), now()
+    FROM projects WHERE key = :key
+    """,
+]
+
+
+async def _notification_fanout(members: int, repeats: int) -> dict:
+    from sqlalchemy import event, select, text
+
+    from app.database import AsyncSessionLocal, async_engine
+    from app.models import Notification, ProjectMember, Task
+    from app.services import create_notifications, project_member_ids
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    async def orm_loop(db, task):
+        rows = await db.scalars(
+            select(ProjectMember.user_id).where(
+                ProjectMember.project_id == task.project_id
+            )
+        )
+        for recipient in rows:
+            db.add(
+                Notification(
+                    message="Fanout",
+                    recipient_id=recipient,
+                    sender_id=task.reporter_id,
+                    task_id=task.id,
+                    project_id=task.project_id,
+                )
+            )
+        await db.flush()
+
+    async def bulk(db, task):
+        await create_notifications(
+            db,
+            project_member_ids(task.project_id),
+            message="Fanout",
+            sender_id=task.reporter_id,
+            task_id=task.id,
+            project_id=task.project_id,
+        )
+
+    results = {}
+    # hamma narsa bitta tranzaksiyada, oxirida rollback: bazada iz qolmaydi
+    params = {"members": members, "key": f"FANOUT{members}"}
+    async with AsyncSessionLocal() as db:
+        for statement in FANOUT_SETUP_SQL:
+            await db.execute(text(statement), params)
+        task = await db.scalar(select(Task).where(Task.key == f"FANOUT{members}-1"))
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            for name, write in (("orm loop", orm_loop), ("bulk insert", bulk)):
+                statements = 0
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    savepoint = await db.begin_nested()
+                    await write(db, task)
+                    await savepoint.rollback()
+                    db.expunge_all()
+                elapsed = time.perf_counter() - start
+                # SAVEPOINT / ROLLBACK TO SAVEPOINT hisobga olinmaydi
+                results[name] = (elapsed / repeats, statements / repeats - 2)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+            await db.rollback()
+
+    return results
+
+
+@apps.command()
+def notification_fanout(sizes: str = "10,100,1000", repeats: int = 20):
+    """
+    Measures the notification cost of one project-wide status change for
+    projects with the given member counts: the old per-recipient ORM loop
+    against create_notifications (one INSERT ... SELECT ... RETURNING).
+    Runs inside a transaction that is rolled back.
+    """
+
+    async def run():
+        # bitta event loop: async engine connectionlari loopga bog'langan
+        return [
+            (members, await _notification_fanout(members, repeats))
+            for members in (int(size) for size in sizes.split(","))
+        ]
+
+    for members, results in asyncio.run(run()):
+        typer.echo(f"{members} members")
+        for name, (seconds, statements) in results.items():
+            typer.echo(
+                f"  {name:<12}: {seconds * 1000:8.2f} ms/move, "
+                f"{statements:.0f} statements"
+            )
+
+
+async def _open_ws_connections(
+    base_url: str, token: str, count: int, concurrency: int, monitoring_token: str
+) -> tuple[dict, dict, dict]:
+    from websockets.asyncio.client import connect
+
+    ws_url = base_url.replace("http", "ws", 1) + f"/ws/connect?token={token}"
+    semaphore = asyncio.Semaphore(concurrency)
+    connections = []
+
+    async def open_one():
+        async with semaphore:
+            websocket = await connect(ws_url)
+            await websocket.recv()  # "connected" xabari
+            connections.append(websocket)
+
+    # /monitoring/* METRICS_TOKEN yoki admin token so'raydi
+    headers = {"Authorization": f"Bearer {monitoring_token or token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers) as client:
+        before = (await client.get("/monitoring/ws/")).raise_for_status().json()
+        await asyncio.gather(*(open_one() for _ in range(count)))
+        opened = (await client.get("/monitoring/ws/")).json()
+
+        await asyncio.gather(*(websocket.close() for websocket in connections))
+        # server disconnect'ni o'zi qayta ishlaguncha kutamiz
+        for _ in range(50):
+            closed = (await client.get("/monitoring/ws/")).json()
+            if closed["connections"] <= before["connections"]:
+                break
+            await asyncio.sleep(0.1)
+
+    return before, opened, closed
+
+
+@apps.command()
+def ws_connections(
+    token: str,
+    base_url: str = "http://127.0.0.1:8000",
+    count: int = 2000,
+    concurrency: int = 100,
+    max_kib_per_connection: float = 0,
+    monitoring_token: str = typer.Option("", envvar="METRICS_TOKEN"),
+):
+    """
+    Opens `count` WebSocket connections for one user (like many tabs) against a
+    running server and reports how much server memory each connection costs,
+    from /monitoring/ws/ (read with --monitoring-token, or `token` if it is
+    an admin's). Needs `ulimit -n` above `count` on both sides.
+    Exits non-zero if not every connection was registered, if the server still
+    holds connections after the clients closed them, or if a connection costs
+    more than --max-kib-per-connection.
+    """
+    start = time.perf_counter()
+    before, after, closed = asyncio.run(
+        _open_ws_connections(base_url, token, count, concurrency, monitoring_token)
+    )
+    elapsed = time.perf_counter() - start
+
+    opened = after["connections"] - before["connections"]
+    rss_growth = (after["max_rss_kb"] - before["max_rss_kb"]) * 1024
+    per_connection = rss_growth / opened / 1024 if opened else 0
+    typer.echo(f"{opened} connections opened in {elapsed:.2f}s")
+    typer.echo(f"  server connections : {after['connections']}")
+    typer.echo(f"  after close        : {closed['connections']}")
+    typer.echo(f"  server rss growth  : {rss_growth / 1024 / 1024:.1f} MiB")
+    if opened:
+        typer.echo(f"  per connection     : {per_connection:.1f} KiB")
+
+    failed = False
+    if opened != count:
+        typer.echo(f"  expected {count} new connections!")
+        failed = True
+    if closed["connections"] > before["connections"]:
+        typer.echo("  server kept connections after the clients closed them!")
+        failed = True
+    if max_kib_per_connection and per_connection > max_kib_per_connection:
+        typer.echo(f"  more than {max_kib_per_connection} KiB per connection!")
+        failed = True
+    if failed:
+        raise typer.Exit(code=1)
+
+
+async def _board_timings(project_key: str, limit: int, repeats: int) -> dict:
+    from app.database import AsyncSessionLocal
+    from app.services import board_cache, load_board
+
+    timings = {"uncached": [], "cached": []}
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeats):
+            board_cache.clear()
+            start = time.perf_counter()
+            board = await load_board(db, project_key, limit)
+            timings["uncached"].append(time.perf_counter() - start)
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await load_board(db, project_key, limit)
+            timings["cached"].append(time.perf_counter() - start)
+
+    counts = {column.status.value: column.count for column in board.columns}
+    return {"timings": timings, "counts": counts}
+
+
+@apps.command()
+def board(project_key: str, limit: int = 20, repeats: int = 50):
+    """
+    Times building /project/{key}/board/ (project lookup + one grouped query)
+    without the cache and when served from it. Run `seed` first for a large
+    project.
+    """
+    result = asyncio.run(_board_timings(project_key, limit, repeats))
+    typer.echo(f"{project_key}: {result['counts']}")
+    for name, values in result["timings"].items():
+        typer.echo(
+            f"  {name:<9}: p50 {percentile(values, 50) * 1000:.3f} ms, "
+            f"p99 {percentile(values, 99) * 1000:.3f} ms"
+        )
+
+
+async def _search_timings(
+    terms: list[str], project_key: str | None, limit: int, repeats: int
+) -> dict:
+    from app.database import AsyncSessionLocal
+    from app.models import Project
+    from app.schemas import TaskSearchParams
+    from app.services import search_tasks
+    from app.utils import get_object_or_404
+
+    results = {}
+    async with AsyncSessionLocal() as db:
+        project_id = None
+        if project_key:
+            project_id = (await get_object_or_404(db, Project, key=project_key)).id
+
+        for term in terms:
+            params = TaskSearchParams(q=term, limit=limit)
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                page = await search_tasks(db, params, project_id)
+                timings.append(time.perf_counter() - start)
+            results[term] = (timings, len(page["items"]))
+    return results
+
+
+@apps.command()
+def search(
+    terms: str = "deadlock,timezone crashes,webhook retry,\"login timeout\",login",
+    project_key: str = "",
+    limit: int = 20,
+    repeats: int = 20,
+):
+    """
+    Times /tasks/search/ queries (first page, ranked) for comma separated
+    `terms`, optionally scoped to one project. Seed a large table first,
+    e.g. `seed --projects 50 --tasks 20000` for a million tasks.
+    """
+    results = asyncio.run(
+        _search_timings(terms.split(","), project_key or None, limit, repeats)
+    )
+    scope = project_key or "all projects"
+    typer.echo(f"search in {scope}")
+    for term, (timings, rows) in results.items():
+        typer.echo(
+            f"  {term:<20}: p50 {percentile(timings, 50) * 1000:7.2f} ms, "
+            f"p99 {percentile(timings, 99) * 1000:7.2f} ms, {rows} rows"
+        )
+
+
+async def _asgi_overhead(requests: int) -> dict[str, float]:
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    from app.middleware import MetricsMiddleware, RequestMetrics
+
+    class PassThroughMiddleware(BaseHTTPMiddleware):
+        # olib tashlangan middlewarelar kabi, print'siz
+        async def dispatch(self, request, call_next):
+            return await call_next(request)
+
+    async def item(request):
+        return PlainTextResponse("ok")
+
+    def build(*middleware):
+        return Starlette(routes=[Route("/items/{id}", item)], middleware=middleware)
+
+    variants = {
+        "no middleware": build(),
+        "MetricsMiddleware": build(Middleware(MetricsMiddleware, metrics=RequestMetrics())),
+        "BaseHTTPMiddleware": build(Middleware(PassThroughMiddleware)),
+        "BaseHTTPMiddleware x2": build(
+            Middleware(PassThroughMiddleware), Middleware(PassThroughMiddleware)
+        ),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    results = {}
+    for name, asgi_app in variants.items():
+        for i in range(requests // 10 + requests):  # birinchi 10% warmup
+            if i == requests // 10:
+                start = time.perf_counter()
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": f"/items/{i}",
+                "raw_path": f"/items/{i}".encode(),
+                "root_path": "",
+                "query_string": b"",
+                "headers": [],
+                "client": ("127.0.0.1", 1234),
+                "server": ("127.0.0.1", 8000),
+            }
+            await asgi_app(scope, receive, send)
+        results[name] = (time.perf_counter() - start) / requests
+    return results
+
+
+@apps.command()
+def middleware_overhead(requests: int = 20000):
+    """
+    Calls a one-route Starlette app in-process (no server, no network) with
+    and without middleware and prints the cost each middleware adds per
+    request.
+    """
+    results = asyncio.run(_asgi_overhead(requests))
+    baseline = results["no middleware"]
+    for name, seconds in results.items():
+        typer.echo(
+            f"  {name:<22}: {seconds * 1e6:7.1f} us/request "
+            f"(+{(seconds - baseline) * 1e6:.1f} us)"
+        )
+
+
+async def _bulk_timings(project_key: str, count: int, repeats: int) -> dict:
+    from dataclasses import replace
+    from datetime import datetime, timezone
+
+    from sqlalchemy import event, select
+
+    from app.database import AsyncSessionLocal, async_engine
+    from app.dependencies import Principal
+    from app.enums import Priority, Role, Status, WSEventTypes
+    from app.models import Project, ProjectMember, Task, User
+    from app.schemas.tasks import TaskBulkCreate
+    from app.services import (
+        create_notifications,
+        enqueue_ws_event,
+        generated_task_key,
+        run_bulk_operations,
+    )
+    from app.utils import get_object_or_404
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    due_date = datetime.now(timezone.utc)
+    operations = [
+        TaskBulkCreate(
+            action="create",
+            project_key=project_key,
+            summary=f"Bulk task {i}",
+            priority=Priority.LOW,
+            due_date=due_date,
+        )
+        for i in range(count)
+    ]
+
+    results = {}
+    # hamma narsa bitta tranzaksiyada, oxirida rollback: bazada iz qolmaydi
+    async with AsyncSessionLocal() as db:
+        project = await get_object_or_404(db, Project, key=project_key)
+        owner = await db.get(User, project.owner_id)
+        manager = replace(Principal.from_user(owner), role=Role.manager)
+        is_member = await db.scalar(
+            select(ProjectMember.id).where(
+                ProjectMember.project_id == project.id,
+                ProjectMember.user_id == owner.id,
+            )
+        )
+        if not is_member:
+            db.add(ProjectMember(project_id=project.id, user_id=owner.id))
+            await db.flush()
+
+        async def one_by_one():
+            # /tasks/create/ dagi yozuvlar, har bir task uchun alohida
+            for op in operations:
+                project = await get_object_or_404(db, Project, key=op.project_key)
+                await db.scalar(
+                    select(ProjectMember).where(
+                        ProjectMember.project_id == project.id,
+                        ProjectMember.user_id == manager.id,
+                    )
+                )
+                task = Task(
+                    key=await generated_task_key(db, project),
+                    summary=op.summary,
+                    priority=op.priority,
+                    due_date=op.due_date,
+                    project_id=project.id,
+                    status=Status.BACKLOG,
+                    reporter_id=manager.id,
+                )
+                db.add(task)
+                await db.flush()
+                await create_notifications(
+                    db,
+                    [project.owner_id],
+                    message=f"Yangi task yaratildi: {task.summary}",
+                    sender_id=manager.id,
+                    task_id=task.id,
+                    project_id=project.id,
+                )
+                enqueue_ws_event(
+                    db,
+                    event_type=WSEventTypes.task_created,
+                    project_id=project.id,
+                    payload={"type": WSEventTypes.task_created, "task_id": task.id},
+                )
+            await db.flush()
+
+        async def bulk():
+            await run_bulk_operations(db, manager, operations)
+            await db.flush()
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            for name, write in (("one by one", one_by_one), ("bulk", bulk)):
+                statements = 0
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    savepoint = await db.begin_nested()
+                    await write()
+                    await savepoint.rollback()
+                elapsed = time.perf_counter() - start
+                # SAVEPOINT / ROLLBACK TO SAVEPOINT hisobga olinmaydi
+                results[name] = (elapsed / repeats, statements / repeats - 2)
+        finally:
+            event.remove(
+                async_engine.sync_engine, "before_cursor_execute", count_statement
+            )
+            await db.rollback()
+
+    return results
+
+
+@apps.command()
+def bulk(project_key: str, count: int = 100, repeats: int = 10):
+    """
+    Creates `count` tasks in one project the way /tasks/create/ does it, one
+    task at a time, and with one /tasks/bulk/ request's service call, and
+    compares time and statements. Runs inside a transaction that is rolled
+    back.
+    """
+    results = asyncio.run(_bulk_timings(project_key, count, repeats))
+    typer.echo(f"{count} creates in {project_key}")
+    for name, (seconds, statements) in results.items():
+        typer.echo(
+            f"  {name:<10}: {seconds * 1000:8.2f} ms/request, "
+            f"{statements:.0f} statements"
+        )
+
+
+if __name__ == "__main__":
+    apps()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import typer
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Project
+from app.services import audit_writer, import_format, import_tasks
+from app.settings import IMPORT_BATCH_SIZE
+
+
+apps = typer.Typer()
+
+
+async def _import_file(
+    path: Path, project_key: str, reporter_id: int, file_format: str, batch_size: int
+) -> dict | None:
+    async with AsyncSessionLocal() as db:
+        project = await db.scalar(select(Project).where(Project.key == project_key))
+        if project is None:
+            return None
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            report = await import_tasks(
+                db,
+                project,
+                reporter_id or project.owner_id,
+                stream,
+                file_format,
+                batch_size,
+            )
+    # CLI da audit_writer.run() yo'q: bufferda qolganlari shu yerda yoziladi
+    await audit_writer.flush()
+    return report
+
+
+@apps.command()
+def import_tasks_file(
+    path: Path,
+    project_key: str,
+    reporter_id: int = typer.Option(0, help="Default: project owner"),
+    file_format: str = typer.Option("", "--format", help="csv | ndjson"),
+    batch_size: int = IMPORT_BATCH_SIZE,
+):
+    """
+    Imports tasks from a CSV or NDJSON file into a project. The file is
+    streamed; rows that fail validation are skipped and listed at the end.
+    """
+    file_format = file_format or import_format(path.name)
+    if file_format not in ("csv", "ndjson"):
+        typer.echo("Fayl formati csv yoki ndjson bo'lishi kerak.")
+        raise typer.Exit(code=1)
+
+    start = time.perf_counter()
+    report = asyncio.run(
+        _import_file(path, project_key, reporter_id, file_format, batch_size)
+    )
+    elapsed = time.perf_counter() - start
+
+    if report is None:
+        typer.echo(f"{project_key} project topilmadi.")
+        raise typer.Exit(code=1)
+
+    typer.echo(
+        f"{report['imported']} ta task import qilindi "
+        f"({report['first_key']}..{report['last_key']}) {elapsed:.2f}s, "
+        f"{report['failed']} ta qator xato."
+    )
+    for error in report["errors"]:
+        typer.echo(f"  line {error['line']}: {error['detail']}", err=True)
+    if report["failed"]:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    typer.run(import_tasks_file)
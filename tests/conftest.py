@@ -0,0 +1,111 @@
+import os
+
+import psycopg2
+import pytest
+
+# app modullari DB nomini import paytida o'qiydi: testlar alohida bazada
+TEST_DB_NAME = os.getenv("TEST_DB_NAME", f"{os.getenv('DB_NAME', 'agile')}_test")
+os.environ["DB_NAME"] = TEST_DB_NAME
+os.environ["TOKEN_STORE_BACKEND"] = "memory"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select, text  # noqa: E402
+
+from app import database  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.dependencies import claims_changed_at, principal_cache  # noqa: E402
+from app.models import Project, ProjectMember, User  # noqa: E402
+from app.services import board_cache, create_access_token  # noqa: E402
+
+
+def _recreate_database():
+    conn = psycopg2.connect(
+        dbname="postgres",
+        user=database.DB_USER,
+        password=database.DB_PASSWORD,
+        host=database.DB_HOST,
+        port=database.DB_PORT,
+        connect_timeout=3,
+    )
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{TEST_DB_NAME}" WITH (FORCE)')
+        cursor.execute(f'CREATE DATABASE "{TEST_DB_NAME}"')
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def database_schema():
+    try:
+        _recreate_database()
+    except psycopg2.OperationalError as err:
+        pytest.skip(f"PostgreSQL is not available: {err}")
+
+    Base.metadata.create_all(database.engine)
+    yield
+    database.engine.dispose()
+
+
+@pytest.fixture
+def db(database_schema):
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with database.engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    principal_cache.clear()
+    claims_changed_at.clear()
+    board_cache.clear()
+
+    with database.SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+    # asyncpg connectionlari TestClient loop'iga bog'langan, keyingi test yangisini ochadi
+    database.async_engine.sync_engine.dispose(close=False)
+
+
+@pytest.fixture
+def make_user(db):
+    def make(role: str) -> User:
+        count = db.scalar(select(User.id).order_by(User.id.desc()).limit(1)) or 0
+        user = User(
+            email=f"{role}{count + 1}@example.com",
+            hashed_password="-",
+            fullname=f"{role.title()} {count + 1}",
+            role=role,
+            is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def make_project(db):
+    def make(key: str, owner: User, members: list[User] = ()) -> Project:
+        project = Project(
+            name=key, key=key, owner_id=owner.id, is_private=False, is_active=True
+        )
+        db.add(project)
+        db.flush()
+        db.add_all(
+            ProjectMember(project_id=project.id, user_id=member.id)
+            for member in members
+        )
+        db.commit()
+        return project
+
+    return make
+
+
+def auth(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user)}"}
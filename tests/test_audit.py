@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database
+from app.models import AuditLog, Task
+from app.services import audit
+from app.services.audit import AuditLogWriter
+
+
+@pytest.fixture
+def task(db, make_user, make_project):
+    manager = make_user("manager")
+    project = make_project("P", make_user("owner"), [manager])
+    task = Task(
+        project_id=project.id,
+        key="P-1",
+        summary="Task",
+        status="backlog",
+        priority="low",
+        reporter_id=manager.id,
+        due_date=datetime(2030, 1, 1, tzinfo=UTC),
+    )
+    db.add(task)
+    db.commit()
+    return task
+
+
+def run(coro):
+    try:
+        return asyncio.run(coro)
+    finally:
+        # pool ulanishlari shu event loopga bog'langan
+        database.async_engine.sync_engine.dispose(close=False)
+
+
+async def record(writer: AuditLogWriter, task: Task, action: str, task_id=None):
+    await writer.record(
+        event_type="task_updated",
+        user_id=task.reporter_id,
+        task_id=task_id or task.id,
+        project_id=task.project_id,
+        action=action,
+    )
+
+
+def written_actions(db) -> list[str]:
+    return list(db.scalars(select(AuditLog.action).order_by(AuditLog.id)))
+
+
+def test_partial_write_requeues_only_unwritten_rows(db, task, monkeypatch):
+    writer = AuditLogWriter()
+    execute = AsyncSession.execute
+
+    async def flaky_execute(self, statement, params=None, *args, **kwargs):
+        # bittalab yozishda uchinchi qatorda ulanish uziladi
+        if isinstance(params, list) and [row["action"] for row in params] == ["c"]:
+            raise OperationalError("INSERT", {}, ConnectionError("lost"))
+        return await execute(self, statement, params, *args, **kwargs)
+
+    async def scenario():
+        await record(writer, task, "a")
+        await record(writer, task, "deleted task", task_id=999)
+        await record(writer, task, "c")
+        monkeypatch.setattr(AsyncSession, "execute", flaky_execute)
+        with pytest.raises(OperationalError):
+            await writer.flush()
+        assert [row["action"] for row in writer.buffer] == ["c"]
+
+        monkeypatch.setattr(AsyncSession, "execute", execute)
+        assert await writer.flush() == 1
+
+    run(scenario())
+    assert written_actions(db) == ["a", "c"]
+    assert writer.buffer == []
+
+
+def test_flush_cancelled_after_commit_does_not_requeue(db, task, monkeypatch):
+    writer = AuditLogWriter()
+    close = AsyncSession.close
+
+    async def close_then_cancel(self):
+        # shutdown: commit bo'ldi, session yopilayotganda task cancel qilinadi
+        await close(self)
+        raise asyncio.CancelledError
+
+    async def scenario():
+        await record(writer, task, "a")
+        monkeypatch.setattr(AsyncSession, "close", close_then_cancel)
+        with pytest.raises(asyncio.CancelledError):
+            await writer.flush()
+
+    run(scenario())
+    assert written_actions(db) == ["a"]
+    assert writer.buffer == []
+
+
+def test_full_buffer_flushes_in_request(db, task):
+    writer = AuditLogWriter(buffer_max=2)
+
+    async def scenario():
+        for action in "abc":
+            await record(writer, task, action)
+
+    run(scenario())
+    assert written_actions(db) == ["a", "b"]
+    assert [row["action"] for row in writer.buffer] == ["c"]
+    assert writer.stats() == {"buffered": 1, "dropped": 0, "sync_flushes": 1}
+
+
+def test_full_buffer_drops_oldest_when_database_is_down(db, task, monkeypatch):
+    writer = AuditLogWriter(buffer_max=2)
+
+    async def failing_flush():
+        raise OperationalError("INSERT", {}, ConnectionError("down"))
+
+    monkeypatch.setattr(writer, "flush", failing_flush)
+
+    async def scenario():
+        for action in "abc":
+            await record(writer, task, action)
+
+    run(scenario())
+    assert [row["action"] for row in writer.buffer] == ["b", "c"]
+    assert writer.stats() == {"buffered": 2, "dropped": 1, "sync_flushes": 1}
+    assert db.scalar(select(func.count()).select_from(AuditLog)) == 0
+
+
+def test_writer_survives_unreachable_database(db, task, monkeypatch, caplog):
+    writer = AuditLogWriter(flush_interval=0.01, buffer_max=2)
+    # hech narsa tinglamaydigan port: asyncpg ConnectionRefusedError beradi
+    unreachable = create_async_engine("postgresql+asyncpg://x:x@127.0.0.1:1/x")
+    monkeypatch.setattr(
+        audit, "AsyncSessionLocal", async_sessionmaker(bind=unreachable)
+    )
+
+    async def scenario():
+        # to'la bufferda so'rov xato olmaydi, eng eskisi tashlanadi
+        for action in "abc":
+            await record(writer, task, action)
+
+        runner = asyncio.create_task(writer.run())
+        try:
+            await asyncio.sleep(0.2)
+            assert not runner.done()
+
+            # baza qaytgach bufferdagi eventlar yoziladi
+            monkeypatch.setattr(audit, "AsyncSessionLocal", database.AsyncSessionLocal)
+            async with asyncio.timeout(5):
+                while len(written_actions(db)) < 2:
+                    await asyncio.sleep(0.02)
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+            await unreachable.dispose()
+
+    with caplog.at_level(logging.ERROR, logger=audit.logger.name):
+        run(scenario())
+
+    assert written_actions(db) == ["b", "c"]
+    assert writer.stats()["dropped"] == 1
+    failures = [r for r in caplog.records if r.message == "Audit flush failed"]
+    assert failures
+    assert isinstance(failures[0].exc_info[1], OSError)
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from jose import jwt
+from starlette.requests import Request
+from starlette.websockets import WebSocketDisconnect
+
+from app import utils
+from app.admin.auth import StarletteAuthProvider
+from app.settings import ALGORITHM, SECRET_KEY
+from app.utils import generate_activation_token
+from tests.conftest import auth
+
+
+def admin_cookie_token(user) -> str:
+    # StarletteAuthProvider.login bilan bir xil format
+    return jwt.encode(
+        {"sub": user.email, "exp": datetime.now(UTC) + timedelta(days=30)},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+def admin_request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/admin/",
+            "headers": [(b"cookie", f"access_token={token}".encode())],
+        }
+    )
+
+
+def test_admin_cookie_token_is_not_a_bearer_token(client, make_user):
+    admin = make_user("admin")
+    token = admin_cookie_token(admin)
+
+    principal = asyncio.run(
+        StarletteAuthProvider().is_authenticated(admin_request(token))
+    )
+    assert principal is not None and principal.id == admin.id
+
+    # admin sessiyasi cachelangan bo'lsa ham API uni qabul qilmaydi
+    response = client.get(
+        "/notifications/unread/count", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401, response.text
+
+    response = client.get("/notifications/unread/count", headers=auth(admin))
+    assert response.status_code == 200, response.text
+
+
+def test_activation_token_is_not_an_access_token(client, make_user):
+    user = make_user("developer")
+    token = generate_activation_token(user.id)
+
+    response = client.get(
+        "/notifications/unread/count", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401, response.text
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/ws/connect?token={token}") as websocket:
+            websocket.receive_json()
+
+
+def test_untyped_tokens_only_until_legacy_deadline(client, make_user, monkeypatch):
+    user = make_user("developer")
+    now = datetime.now(UTC)
+    # user-019 dan oldingi format: type va profil claimlari yo'q
+    token = jwt.encode(
+        {"user_id": user.id, "role": user.role, "exp": now + timedelta(hours=1)},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    monkeypatch.setattr(utils, "LEGACY_ACCESS_TOKEN_DEADLINE", now + timedelta(days=1))
+    response = client.get("/notifications/unread/count", headers=headers)
+    assert response.status_code == 200, response.text
+
+    monkeypatch.setattr(utils, "LEGACY_ACCESS_TOKEN_DEADLINE", now)
+    response = client.get("/notifications/unread/count", headers=headers)
+    assert response.status_code == 401, response.text
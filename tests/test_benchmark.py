@@ -0,0 +1,33 @@
+from sqlalchemy import select
+from typer.testing import CliRunner
+
+from app import database
+from app.models import Task
+from scripts.benchmark import apps
+
+runner = CliRunner()
+
+
+def test_seed_checks_what_it_wrote(db):
+    result = runner.invoke(
+        apps, ["seed", "--users", "20", "--projects", "2", "--tasks", "30"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Seeded 2 projects, 60 tasks." in result.output
+
+
+def test_explain_queries_fails_on_an_empty_database(db):
+    result = runner.invoke(apps, ["explain-queries"])
+    assert result.exit_code == 1
+    assert "run `seed` first" in result.output
+
+
+def test_concurrent_task_keys_are_unique_and_gapless(db, make_user, make_project):
+    make_project("P", make_user("owner"))
+
+    result = runner.invoke(apps, ["concurrent-task-keys", "P", "--count", "40"])
+    database.async_engine.sync_engine.dispose(close=False)
+
+    assert result.exit_code == 0, result.output
+    keys = db.scalars(select(Task.key)).all()
+    assert sorted(keys) == sorted(f"P-{n}" for n in range(1, 41))
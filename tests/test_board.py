@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime
+
+import fakeredis
+from sqlalchemy import select, update
+
+from app import database
+from app.enums import WSEventTypes
+from app.models import OutboxEvent, Project, Task
+from app.services import board, board_cache
+from app.services.outbox import drain_outbox
+from app.websocket import utils
+from tests.test_ws_streams import RecordingManager, WorkerRedis, wait_for
+
+
+def test_board_read_racing_a_commit_is_not_cached(
+    db, make_user, make_project, monkeypatch
+):
+    project = make_project("P", make_user("owner"))
+    read_board = board._read_board
+
+    async def read_with_commit(session, target, limit):
+        result = await read_board(session, target, limit)
+        # o'qish tugashidan oldin boshqa so'rov board'ni o'zgartiradi
+        async with database.AsyncSessionLocal() as other:
+            board.invalidate_board(other, project.id)
+            await other.execute(
+                update(Project).where(Project.id == project.id).values(name="x")
+            )
+            await other.commit()
+        assert board._board_versions == {project.id: 1}
+        return result
+
+    async def scenario():
+        async with database.AsyncSessionLocal() as session:
+            monkeypatch.setattr(board, "_read_board", read_with_commit)
+            await board.load_board(session, "P", 10)
+            assert board_cache.get(("P", 10)) is None
+
+            monkeypatch.setattr(board, "_read_board", read_board)
+            loaded = await board.load_board(session, "P", 10)
+            assert board_cache.get(("P", 10)) == loaded
+
+            # hech kim o'qimayotganda invalidatsiya versiya saqlamaydi
+            board.invalidate_board(session, project.id)
+            await session.commit()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        database.async_engine.sync_engine.dispose(close=False)
+
+    assert board_cache.get(("P", 10)) is None
+    assert board._board_versions == {}
+    assert board._board_readers == {}
+
+
+def test_commit_drops_board_in_other_workers(db, make_user, make_project, monkeypatch):
+    owner = make_user("owner")
+    project = make_project("P", owner)
+    db.add(
+        Task(
+            project_id=project.id,
+            key="P-1",
+            summary="Task",
+            status="backlog",
+            priority="low",
+            reporter_id=owner.id,
+            due_date=datetime(2030, 1, 1, tzinfo=UTC),
+        )
+    )
+    db.commit()
+    assert db.scalars(select(OutboxEvent.event_type)).all() == [
+        WSEventTypes.board_changed
+    ]
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        monkeypatch.setattr(utils, "_redis", redis)
+        monkeypatch.setattr(utils, "WS_STREAM_BLOCK_MS", 5)
+
+        # boshqa worker: commitni ko'rmagan, board hali uning cacheida
+        manager = RecordingManager()
+        board_cache.set(("P", 10), object(), tag=project.id)
+        consumer = asyncio.create_task(
+            utils.consume_events(
+                manager, WorkerRedis(server=server, decode_responses=True), "ws_group_b"
+            )
+        )
+
+        async def group_ready():
+            with suppress(Exception):
+                return len(await redis.xinfo_groups(utils.REDIS_STREAM_KEY)) == 1
+            return False
+
+        async def board_dropped():
+            return board_cache.get(("P", 10)) is None
+
+        try:
+            await wait_for(group_ready)
+            async with database.AsyncSessionLocal() as session:
+                assert await drain_outbox(session) == 1
+            await wait_for(board_dropped)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+        # clientlarga hech narsa yuborilmaydi
+        assert manager.sent == []
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        database.async_engine.sync_engine.dispose(close=False)
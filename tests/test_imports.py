@@ -0,0 +1,64 @@
+import asyncio
+import io
+
+from sqlalchemy import select
+
+from app import database
+from app.models import AuditLog, Project, Task
+from app.services import audit_writer, import_tasks
+from tests.conftest import auth
+
+
+CSV = (
+    "summary,priority,due_date\n"
+    "First,low,2030-01-01T00:00:00Z\n"
+    "Bad,urgent,2030-01-01T00:00:00Z\n"
+    "Second,high,2030-01-01T00:00:00Z\n"
+    "Third,medium,2030-01-01T00:00:00Z\n"
+    "Fourth,low,2030-01-01T00:00:00Z\n"
+)
+
+
+def test_import_batches_and_audits_through_writer(db, make_user, make_project):
+    owner, manager = make_user("owner"), make_user("manager")
+    project = make_project("P", owner, [manager])
+
+    async def scenario():
+        async with database.AsyncSessionLocal() as session:
+            target = await session.get(Project, project.id)
+            report = await import_tasks(
+                session, target, manager.id, io.StringIO(CSV), "csv", batch_size=2
+            )
+        await audit_writer.flush()
+        return report
+
+    try:
+        report = asyncio.run(scenario())
+    finally:
+        database.async_engine.sync_engine.dispose(close=False)
+
+    assert report["imported"] == 4
+    assert report["failed"] == 1
+    assert report["errors"][0]["line"] == 3
+    assert (report["first_key"], report["last_key"]) == ("P-1", "P-4")
+
+    tasks = db.scalars(select(Task).order_by(Task.id)).all()
+    assert [task.summary for task in tasks] == ["First", "Second", "Third", "Fourth"]
+    logs = db.scalars(select(AuditLog).order_by(AuditLog.id)).all()
+    assert [log.task_id for log in logs] == [task.id for task in tasks]
+    assert all(log.payload == {"source": "import"} for log in logs)
+
+
+def test_import_endpoint(client, make_user, make_project):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+
+    response = client.post(
+        "/tasks/import/P/",
+        files={"file": ("tasks.csv", CSV.encode(), "text/csv")},
+        headers=auth(manager),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 4
+    assert response.json()["failed"] == 1
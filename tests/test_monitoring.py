@@ -0,0 +1,20 @@
+import pytest
+
+from app import dependencies
+from tests.conftest import auth
+
+PATHS = ["/metrics", "/monitoring/cache/", "/monitoring/db-pool/", "/monitoring/ws/"]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_monitoring_needs_admin_or_metrics_token(client, make_user, monkeypatch, path):
+    monkeypatch.setattr(dependencies, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=auth(make_user("developer"))).status_code == 403
+    assert client.get(path, headers=auth(make_user("admin"))).status_code == 200
+
+    headers = {"Authorization": "Bearer scrape-secret"}
+    assert client.get(path, headers=headers).status_code == 200
+    headers = {"Authorization": "Bearer wrong-secret"}
+    assert client.get(path, headers=headers).status_code == 401
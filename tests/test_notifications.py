@@ -0,0 +1,28 @@
+from tests.conftest import auth
+from tests.test_tasks import create_task
+
+
+def test_unread_keeps_list_shape_next_to_paginated_inbox(
+    client, make_user, make_project
+):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+    for _ in range(3):
+        create_task(client, manager)
+
+    response = client.get("/notifications/unread", headers=auth(owner))
+    assert response.status_code == 200, response.text
+    assert response.headers["Deprecation"] == "true"
+    unread = response.json()
+    assert len(unread) == 3
+    assert not any(notification["is_read"] for notification in unread)
+
+    response = client.get(
+        "/notifications/",
+        params={"unread_only": True, "limit": 2},
+        headers=auth(owner),
+    )
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert [n["id"] for n in page["items"]] == [n["id"] for n in unread[:2]]
+    assert page["next_cursor"]
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+import fakeredis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.models import OutboxEvent
+from app.services import outbox
+from app.websocket import utils
+
+
+def test_dispatcher_survives_database_outage(db, monkeypatch, caplog):
+    monkeypatch.setattr(outbox, "OUTBOX_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_BACKOFF", 0.05)
+    monkeypatch.setattr(utils, "_redis", fakeredis.FakeAsyncRedis())
+    db.add(OutboxEvent(event_type="task_all", project_id=1, payload={}))
+    db.commit()
+
+    # hech narsa tinglamaydigan port: asyncpg ConnectionRefusedError beradi
+    unreachable = create_async_engine("postgresql+asyncpg://x:x@127.0.0.1:1/x")
+    monkeypatch.setattr(
+        outbox, "AsyncSessionLocal", async_sessionmaker(bind=unreachable)
+    )
+
+    async def scenario():
+        dispatcher = asyncio.create_task(outbox.run_outbox_dispatcher())
+        await asyncio.sleep(0.3)
+        assert not dispatcher.done()
+
+        # baza qaytgach qolgan eventlar yuboriladi
+        monkeypatch.setattr(outbox, "AsyncSessionLocal", database.AsyncSessionLocal)
+        try:
+            async with asyncio.timeout(5):
+                while True:
+                    async with database.AsyncSessionLocal() as session:
+                        left = await session.scalar(
+                            select(func.count()).select_from(OutboxEvent)
+                        )
+                    if not left:
+                        break
+                    await asyncio.sleep(0.02)
+        finally:
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+            await unreachable.dispose()
+
+    with caplog.at_level(logging.ERROR, logger=outbox.logger.name):
+        try:
+            asyncio.run(scenario())
+        finally:
+            database.async_engine.sync_engine.dispose(close=False)
+
+    failures = [r for r in caplog.records if "Outbox dispatch failed" in r.message]
+    assert len(failures) >= 2
+    assert isinstance(failures[0].exc_info[1], OSError)
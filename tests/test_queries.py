@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import database
+from tests.conftest import auth
+from tests.test_tasks import create_task
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = database.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+def listing_statements(client, path: str, headers: dict) -> tuple[int, int]:
+    with count_statements() as statements:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(response.json()["items"]), len(statements)
+
+
+def test_listings_do_not_query_per_row(client, make_user, make_project):
+    owner, manager, developer = (
+        make_user("owner"),
+        make_user("manager"),
+        make_user("developer"),
+    )
+    make_project("P", owner, [manager, developer])
+    paths = ["/tasks/", "/notifications/"]
+
+    def add_assigned_tasks(count: int):
+        for _ in range(count):
+            key = create_task(client, manager)
+            response = client.post(
+                f"/tasks/{key}/add/developer",
+                json={"user_id": developer.id},
+                headers=auth(manager),
+            )
+            assert response.status_code == 200, response.text
+
+    add_assigned_tasks(2)
+    few = [listing_statements(client, path, auth(developer)) for path in paths]
+    add_assigned_tasks(4)
+    many = [listing_statements(client, path, auth(developer)) for path in paths]
+
+    for path, (few_rows, few_count), (many_rows, many_count) in zip(paths, few, many):
+        assert few_rows < many_rows, path
+        assert few_count == many_count, path
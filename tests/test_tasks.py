@@ -0,0 +1,156 @@
+from sqlalchemy import func, select
+
+from app.routers import projects
+from app.models import Notification, User
+from tests.conftest import auth
+
+
+def create_task(client, manager, project_key="P"):
+    response = client.post(
+        "/tasks/create/",
+        json={
+            "project_key": project_key,
+            "summary": "Task",
+            "priority": "low",
+            "due_date": "2030-01-01T00:00:00Z",
+        },
+        headers=auth(manager),
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["key"]
+
+
+def unread_counts(db, *users):
+    db.expire_all()
+    return [db.get(User, user.id).unread_notifications_count for user in users]
+
+
+def test_delete_task_lowers_unread_counters(client, db, make_user, make_project):
+    owner, manager, developer = (
+        make_user("owner"), make_user("manager"), make_user("developer")
+    )
+    make_project("P", owner, [manager, developer])
+
+    key = create_task(client, manager)
+    response = client.post(
+        f"/tasks/{key}/add/developer",
+        json={"user_id": developer.id},
+        headers=auth(manager),
+    )
+    assert response.status_code == 200, response.text
+    assert unread_counts(db, owner, developer) == [1, 1]
+
+    response = client.delete(f"/tasks/{key}/delete/", headers=auth(manager))
+
+    assert response.status_code == 204
+    assert unread_counts(db, owner, developer) == [0, 0]
+    assert db.scalar(select(func.count()).select_from(Notification)) == 0
+
+
+def test_bulk_delete_lowers_unread_counters(client, db, make_user, make_project):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+
+    first, second, kept = (create_task(client, manager) for _ in range(3))
+    # bittasi o'qilgan: counterda yo'q, u ham FK CASCADE bilan o'chadi
+    db.execute(
+        Notification.__table__.update()
+        .where(Notification.id == 1)
+        .values(is_read=True)
+    )
+    db.execute(User.__table__.update().values(unread_notifications_count=2))
+    db.commit()
+
+    response = client.post(
+        "/tasks/bulk/",
+        json={
+            "operations": [
+                {"action": "delete", "key": first},
+                {"action": "delete", "key": second},
+            ]
+        },
+        headers=auth(manager),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["deleted"] == [first, second]
+    assert unread_counts(db, owner) == [1]
+    assert db.scalars(select(Notification.message)).all() == [
+        "Yangi task yaratildi: Task"
+    ]
+    assert client.get(f"/tasks/{kept}/", headers=auth(manager)).status_code == 200
+
+
+def test_bulk_errors_name_the_missing_object(client, make_user, make_project):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+    key = create_task(client, manager)
+
+    response = client.post(
+        "/tasks/bulk/",
+        json={
+            "operations": [
+                {
+                    "action": "create",
+                    "project_key": "NOPE",
+                    "summary": "Task",
+                    "priority": "low",
+                    "due_date": "2030-01-01T00:00:00Z",
+                },
+                {"action": "delete", "key": "P-999"},
+                {"action": "assign", "key": key, "user_id": 999},
+            ]
+        },
+        headers=auth(manager),
+    )
+
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == [
+        {"index": 0, "detail": "Project NOPE not found"},
+        {"index": 1, "detail": "Task P-999 not found"},
+        {"index": 2, "detail": "User 999 not found"},
+    ]
+
+
+def test_all_tasks_keeps_list_shape_next_to_paginated_route(
+    client, make_user, make_project
+):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+    keys = [create_task(client, manager) for _ in range(3)]
+
+    response = client.get("/tasks/all/")
+    assert response.status_code == 200, response.text
+    assert response.headers["Deprecation"] == "true"
+    assert [task["key"] for task in response.json()] == keys[::-1]
+
+    response = client.get("/tasks/", params={"limit": 2})
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert [task["key"] for task in page["items"]] == keys[:0:-1]
+    assert page["next_cursor"]
+
+
+def test_project_tasks_keep_list_shape_next_to_paginated_route(
+    client, make_user, make_project, monkeypatch
+):
+    owner, manager = make_user("owner"), make_user("manager")
+    make_project("P", owner, [manager])
+    keys = [create_task(client, manager) for _ in range(3)]
+    monkeypatch.setattr(projects, "LEGACY_LIST_LIMIT", 2)
+
+    response = client.get("/project/P/tasks/", headers=auth(manager))
+    assert response.status_code == 200, response.text
+    assert response.headers["Deprecation"] == "true"
+    assert (
+        response.headers["Link"] == '</project/P/tasks/page/>; rel="successor-version"'
+    )
+    assert [task["key"] for task in response.json()] == keys[:0:-1]
+
+    response = client.get(
+        "/project/P/tasks/page/", params={"limit": 2}, headers=auth(manager)
+    )
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert [task["key"] for task in page["items"]] == keys[:0:-1]
+    assert page["next_cursor"]
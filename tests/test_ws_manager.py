@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from app.enums import WSEventTypes
+from app.services import create_access_token
+from app.websocket.manager import WSManager, dispatch_ws_event
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message: dict):
+        self.sent.append(message)
+
+    async def close(self, code: int):
+        pass
+
+
+async def member_event(manager, event_type, project_id, user_id=1):
+    await dispatch_ws_event(
+        manager,
+        event_type,
+        project_id,
+        {"type": event_type, "user_id": user_id, "role": "developer"},
+    )
+
+
+def test_membership_events_during_project_load_are_kept():
+    async def scenario():
+        manager = WSManager()
+        connection = await manager.connect(FakeWebSocket(), user_id=1)
+
+        # router bazadan projectlarni o'qiyotganda kelgan eventlar
+        await member_event(manager, WSEventTypes.member_added, 2)
+        await member_event(manager, WSEventTypes.member_removed, 3)
+
+        # eski snapshot: 3 hali bor, 2 hali yo'q
+        projects = await manager.load_projects(connection, "developer", [1, 3])
+
+        assert projects == [1, 2]
+        assert manager.project_members == {1: {1: "developer"}, 2: {1: "developer"}}
+
+        # yuklangandan keyingi eventlar odatdagidek ishlaydi
+        await member_event(manager, WSEventTypes.member_removed, 1)
+        assert manager.user_projects[1] == {2}
+
+        await manager.disconnect(connection)
+        assert manager.project_members == {}
+
+    asyncio.run(scenario())
+
+
+def test_connect_sends_loaded_projects(client, make_user, make_project):
+    owner, developer = make_user("owner"), make_user("developer")
+    project = make_project("P", owner, [developer])
+    token = create_access_token(developer)
+
+    with client.websocket_connect(f"/ws/connect?token={token}") as websocket:
+        message = websocket.receive_json()
+
+    assert message["type"] == "connected"
+    assert message["projects"] == [project.id]
+
+
+def test_user_with_several_tabs(client, make_user, make_project):
+    owner, developer = make_user("owner"), make_user("developer")
+    project = make_project("P", owner, [developer])
+    url = f"/ws/connect?token={create_access_token(developer)}"
+    manager = client.app.state.ws_manager
+
+    with client.websocket_connect(url) as first:
+        first.receive_json()
+        with client.websocket_connect(url) as second:
+            second.receive_json()
+            assert manager.stats()["connections"] == 2
+
+            message = {"type": "ping"}
+            client.portal.call(manager.send_to_all_project_members, project.id, message)
+            assert first.receive_json() == message
+            assert second.receive_json() == message
+
+        # ikkinchi tab yopilgach birinchisi obunada qoladi
+        for _ in range(50):
+            if manager.stats()["connections"] == 1:
+                break
+            time.sleep(0.01)
+        assert manager.stats()["connections"] == 1
+        assert manager.user_projects[developer.id] == {project.id}
+        client.portal.call(manager.send_to_all_project_members, project.id, message)
+        assert first.receive_json() == message
@@ -0,0 +1,175 @@
+import asyncio
+from contextlib import suppress
+
+import fakeredis
+from redis.exceptions import ResponseError
+
+from app.enums import WSEventTypes
+from app.websocket.utils import (
+    REDIS_STREAM_KEY,
+    consume_events,
+    publish_ws_events,
+    sweep_stale_groups,
+)
+from app.websocket import utils
+
+
+class WorkerRedis(fakeredis.FakeAsyncRedis):
+    async def xreadgroup(self, *args, **kwargs):
+        # fakeredis bo'sh o'qishda event loopga navbat bermaydi
+        await asyncio.sleep(0.01)
+        return await super().xreadgroup(*args, **kwargs)
+
+
+class RecordingManager:
+    def __init__(self):
+        self.sent = []
+
+    def send_to_all_project_members(self, project_id: int, payload: dict):
+        self.sent.append((project_id, payload))
+
+
+async def wait_for(condition, timeout: float = 5):
+    async with asyncio.timeout(timeout):
+        while not await condition():
+            await asyncio.sleep(0.01)
+
+
+def test_every_worker_receives_every_event(monkeypatch):
+    async def scenario():
+        server = fakeredis.FakeServer()
+        redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        monkeypatch.setattr(utils, "_redis", redis)
+        # fakeredis BLOCK paytida butun threadni to'xtatib turadi
+        monkeypatch.setattr(utils, "WS_STREAM_BLOCK_MS", 5)
+
+        # har bir worker o'z ulanishi va group'i bilan
+        workers = {group: RecordingManager() for group in ("ws_group_a", "ws_group_b")}
+        tasks = [
+            asyncio.create_task(
+                consume_events(
+                    manager,
+                    WorkerRedis(server=server, decode_responses=True),
+                    group,
+                )
+            )
+            for group, manager in workers.items()
+        ]
+
+        async def groups_ready():
+            with suppress(Exception):
+                return len(await redis.xinfo_groups(REDIS_STREAM_KEY)) == 2
+            return False
+
+        await wait_for(groups_ready)
+
+        events = [
+            {
+                "event_type": WSEventTypes.tasks_bulk_changed,
+                "payload": {"type": WSEventTypes.tasks_bulk_changed, "n": n},
+            }
+            for n in range(3)
+        ]
+        await publish_ws_events({7: events})
+
+        async def delivered():
+            return all(len(manager.sent) == 3 for manager in workers.values())
+
+        try:
+            await wait_for(delivered)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for manager in workers.values():
+            assert manager.sent == [(7, event["payload"]) for event in events]
+        # to'xtagan workerlar group'ini o'zi o'chiradi
+        assert await redis.xinfo_groups(REDIS_STREAM_KEY) == []
+
+    asyncio.run(scenario())
+
+
+def test_sweep_removes_only_idle_worker_groups():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        for group in ("ws_group_dead", "ws_group_live", "ws_group_own", "other"):
+            await redis.xgroup_create(REDIS_STREAM_KEY, group, id="$", mkstream=True)
+
+        async def read(group: str):
+            await redis.xreadgroup(
+                groupname=group,
+                consumername="worker",
+                streams={REDIS_STREAM_KEY: ">"},
+                count=1,
+            )
+
+        await read("ws_group_dead")
+        await read("other")
+        await asyncio.sleep(0.2)
+        await read("ws_group_live")
+
+        removed = await sweep_stale_groups(redis, "ws_group_own", idle_ms=100)
+
+        assert removed == ["ws_group_dead"]
+        groups = {group["name"] for group in await redis.xinfo_groups(REDIS_STREAM_KEY)}
+        assert groups == {"ws_group_live", "ws_group_own", "other"}
+
+    asyncio.run(scenario())
+
+
+class FailingRedis(WorkerRedis):
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    async def xreadgroup(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            await asyncio.sleep(0.01)
+            raise ResponseError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return await super().xreadgroup(*args, **kwargs)
+
+
+def test_consumer_survives_stream_errors(monkeypatch):
+    async def scenario():
+        server = fakeredis.FakeServer()
+        redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        monkeypatch.setattr(utils, "_redis", redis)
+        monkeypatch.setattr(utils, "WS_STREAM_BLOCK_MS", 5)
+        monkeypatch.setattr(utils, "READ_RETRY_DELAY", 0.01)
+
+        manager = RecordingManager()
+        worker = FailingRedis(failures=3, server=server, decode_responses=True)
+        task = asyncio.create_task(consume_events(manager, worker, "ws_group_a"))
+
+        async def recovered():
+            return not worker.failures
+
+        try:
+            await wait_for(recovered)
+            await asyncio.sleep(0.05)
+            assert not task.done()
+
+            event = {"event_type": WSEventTypes.task_all, "payload": {"n": 1}}
+            await publish_ws_events({7: [event]})
+
+            async def delivered():
+                return manager.sent == [(7, event["payload"])]
+
+            await wait_for(delivered)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_sweep_before_stream_exists():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        assert await sweep_stale_groups(redis, "ws_group_own", idle_ms=100) == []
+
+    asyncio.run(scenario())